@@ -756,6 +756,13 @@ def setup_qwt5_build(configuration, options, package):
     extra_sources += glob.glob(os.path.join(os.pardir, 'support', '*.cpp'))
     extra_headers += glob.glob(os.path.join(os.pardir, 'support', '*.h'))
 
+    # the QObjects in the support headers are for Qt-4 only
+    if configuration.qt_version >= 0x040000:
+        for header in glob.glob(os.path.join(os.pardir, 'support', '*.h')):
+            text = open(header).read()
+            if re.compile(r'^\s*Q_OBJECT', re.M).search(text):
+                extra_moc_headers.append(header)
+
     # do we compile and link the sources of Qwt into PyQwt?
     if sys.platform == 'win32':
         qwt = 'qwt5'
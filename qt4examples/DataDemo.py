@@ -89,7 +89,7 @@ class DataPlot(Qwt.QwtPlot):
         self.curveR.setData(self.x, self.y)
         self.curveL.setData(self.x, self.z)
 
-        self.replot()
+        self.requestReplot()
         self.phase += pi*0.02
 
     # timerEvent()
@@ -100,6 +100,9 @@ Y2 = Right  = QwtPlot.yRight
 X1 = Bottom = QwtPlot.xBottom
 X2 = Top    = QwtPlot.xTop
 
+# QwtPlotCurve aliases
+Decimated = QwtPlotDecimatedCurve
+
 # QwtScaleEngine aliases
 Lin = QwtLinearScaleEngine
 Log = QwtLog10ScaleEngine
@@ -259,7 +262,7 @@ class Plot(QwtPlot):
     # plotAxis()
 
     def plotCurve(self, curve):
-        c = QwtPlotCurve(curve.name)
+        c = curve.type(curve.name)
         c.setAxis(curve.xAxis, curve.yAxis)
         
         if curve.pen:
@@ -270,9 +273,48 @@ class Plot(QwtPlot):
             c.setSymbol(curve.symbol)
         c.setData(curve.x, curve.y)
         c.attach(self)
+        curve.item = c
+        curve.data = None
         self.clearZoomStack()
 
     # plotCurve()
+
+    def append(self, curve, x, y):
+        """Append samples to a plotted curve and draw only the new samples.
+
+        Parameters:
+
+        - `curve`: a `Curve` plotted by this plot
+        - `x`: sequence of numbers
+        - `y`: sequence of numbers
+
+        The plot replots completely only when the new samples fall outside
+        the scales of autoscaled axes.
+
+        The samples live only in a `QwtRingBufferData` shared with the
+        plotted curve, whose capacity doubles when it is full, so that
+        appending takes amortized constant time per sample.  The attributes
+        `x` and `y` of `curve` keep the samples passed to its constructor.
+        """
+        if curve.item is None or curve.item.plot() is not self:
+            raise ValueError('append() requires a Curve plotted by this Plot')
+        if len(x) != len(y):
+            raise ValueError('x and y must have the same length')
+
+        start = curve.item.dataSize()
+        capacity = max(1024, 2 * (start + len(x)))
+        if curve.data is None:
+            curve.data = QwtRingBufferData(capacity)
+            curve.data.append(curve.x, curve.y)
+            curve.item.setData(curve.data)
+        elif start + len(x) > curve.data.capacity():
+            curve.data.setCapacity(capacity)
+        curve.data.append(x, y)
+        if not curve.item.drawAppended(start):
+            for zoomer in self.zoomers:
+                zoomer.setZoomBase()
+
+    # append()
     
     def clearZoomStack(self):
         """Force autoscaling and clear the zoom stack
@@ -472,11 +514,16 @@ class Curve:
     - `Axis`: attaches an axis to the curve.
     - `Pen`: sets the pen to connect the data points.
     - `Symbol`: sets the symbol to draw the data points.
+    - `QwtPlotCurve`: sets the curve type (Decimated draws at most
+      4 points per pixel column, which speeds up huge curves).
     - `str`, `QString`, or `QwtText`: sets the curve title.
     """
     def __init__(self, x, y, *rest):
         self.x = x
         self.y = y
+        self.item = None
+        self.data = None
+        self.type = QwtPlotCurve
         self.xAxis, self.yAxis = X1, Y1
         self.pen = None
         self.symbol = None
@@ -492,6 +539,8 @@ class Curve:
                 self.pen = item
             elif isinstance(item, Symbol):
                 self.symbol = item
+            elif item in [QwtPlotCurve, Decimated]:
+                self.type = item
             elif (isinstance(item, str) or isinstance(item, QString)):
                 self.name = item
             else:
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2003-2010 Gerard Vermeulen
+#
+# This file is part of PyQwt.
+#
+# PyQwt is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# PyQwt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# In addition, as a special exception, Gerard Vermeulen gives permission
+# to link PyQwt dynamically with non-free versions of Qt and PyQt,
+# and to distribute PyQwt in this form, provided that equally powerful
+# versions of Qt and PyQt have been released under the terms of the GNU
+# General Public License.
+#
+# If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+# PyQwt becomes a free plug-in for a non-free program.
+
+"""
+Renders plots described by JSON files to SVG, PDF or PNG files without
+showing a window.  Run as::
+
+    python -m PyQt4.Qwt5.render [options] spec.json [spec.json ...]
+
+A JSON file holds a plot specification or a list of plot specifications.
+An example of a plot specification is::
+
+    {
+     "output": "bode.svg",
+     "size": [800, 600],
+     "title": "Bode plot",
+     "legend": true,
+     "axes": {
+       "xBottom": {"title": "frequency", "log": true},
+       "yLeft": {"title": "amplitude", "range": [-40, 10]},
+       "yRight": {"title": "phase"}
+       },
+     "curves": [
+       {"x": "f.npy", "y": "amplitude.npy", "title": "amplitude",
+        "color": "yellow", "width": 2},
+       {"x": "f.npy", "y": "phase.npy", "title": "phase",
+        "color": "cyan", "axes": ["xBottom", "yRight"]}
+       ]
+    }
+
+The keys are:
+
+- `output`: the file name; its extension selects the format, unless the
+  optional key `format` is one of "svg", "pdf" or "png".
+- `size`: the width and the height in pixels or points (default 800x600).
+- `title`: the title of the plot.
+- `background`: the color of the canvas (default "white").
+- `legend`: true inserts a legend to the right of the canvas.
+- `axes`: maps the names of the axes of `QwtPlot` to an optional `title`,
+  an optional `range` and an optional `log` flag.  The axes in the map are
+  enabled, the others keep their default.
+- `curves`: a list of curves, where `y` is a `.npy` file of a 1-D array,
+  `x` is an optional `.npy` file of a 1-D array (default: the indices of
+  `y`), `title`, `color`, `width`, `style` (a name of
+  `QwtPlotCurve.CurveStyle`), `axes` (a pair of axis names) are optional,
+  and `decimated` true makes a `QwtPlotDecimatedCurve`.
+
+The names of the `.npy` files and the output file are relative to the
+directory of the JSON file.
+
+The plots are rendered by a pool of processes started from a clean
+interpreter, which create their own `QApplication`.  Python versions
+without `multiprocessing.get_context()` fork the processes and refuse to do
+so, when this process has a `QApplication`, because the forked processes
+would share its connection to the display.  Qt builds on the Qt Platform
+Abstraction honour the platform given by the `--platform` option, for
+instance "minimal"; by default the processes use the platform of the build.
+X11 builds of Qt need a display, for instance a virtual frame buffer
+started with `Xvfb :1 &` and `DISPLAY=:1`.
+
+The rendering time of each plot is printed after the plot has been saved.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from optparse import OptionParser
+
+import numpy as np
+from PyQt4.Qt import *
+from PyQt4.Qwt5 import *
+
+
+# the names of the QwtPlot.Axis values
+Axes = {
+    'yLeft': QwtPlot.yLeft,
+    'yRight': QwtPlot.yRight,
+    'xBottom': QwtPlot.xBottom,
+    'xTop': QwtPlot.xTop,
+    }
+
+# the output formats and their file name extensions
+Formats = {
+    '.svg': 'svg',
+    '.pdf': 'pdf',
+    '.png': 'png',
+    }
+
+# the QApplication of a worker process
+application = None
+
+
+def initialize(platform=None):
+    """Create the `QApplication` of this process, when it does not exist.
+
+    Sets `QT_QPA_PLATFORM` to `platform`, unless it is None or
+    `QT_QPA_PLATFORM` has been set before.
+    """
+    global application
+    if QApplication.instance() is None:
+        if platform:
+            os.environ.setdefault('QT_QPA_PLATFORM', platform)
+        application = QApplication(['PyQt4.Qwt5.render'])
+
+# initialize()
+
+
+def makePlot(spec, directory=os.curdir):
+    """Return a `QwtPlot` made from the plot specification `spec`.
+    """
+    plot = QwtPlot()
+    plot.setCanvasBackground(QColor(spec.get('background', 'white')))
+    plot.plotLayout().setAlignCanvasToScales(True)
+    if 'title' in spec:
+        plot.setTitle(spec['title'])
+    if spec.get('legend'):
+        plot.insertLegend(QwtLegend(), QwtPlot.RightLegend)
+
+    for name, axis in spec.get('axes', {}).items():
+        axisId = Axes[name]
+        plot.enableAxis(axisId)
+        if 'title' in axis:
+            plot.setAxisTitle(axisId, axis['title'])
+        if axis.get('log'):
+            plot.setAxisScaleEngine(axisId, QwtLog10ScaleEngine())
+        if 'range' in axis:
+            plot.setAxisScale(axisId, *axis['range'])
+
+    for curve in spec.get('curves', []):
+        y = np.load(os.path.join(directory, curve['y']))
+        if 'x' in curve:
+            x = np.load(os.path.join(directory, curve['x']))
+        else:
+            x = np.arange(len(y), dtype=np.float64)
+        if curve.get('decimated'):
+            item = QwtPlotDecimatedCurve(curve.get('title', ''))
+        else:
+            item = QwtPlotCurve(curve.get('title', ''))
+        item.setPen(QPen(QColor(curve.get('color', 'black')),
+                         curve.get('width', 0)))
+        if 'style' in curve:
+            item.setStyle(getattr(QwtPlotCurve, curve['style']))
+        xAxis, yAxis = curve.get('axes', ('xBottom', 'yLeft'))
+        item.setAxis(Axes[xAxis], Axes[yAxis])
+        plot.enableAxis(Axes[xAxis])
+        plot.enableAxis(Axes[yAxis])
+        item.setData(x, y)
+        item.attach(plot)
+
+    plot.replot()
+
+    return plot
+
+# makePlot()
+
+
+def savePlot(plot, output, fileFormat, size):
+    """Print `plot` with `QwtPlot.print_()` to the file `output`.
+    """
+    width, height = size
+    if fileFormat == 'svg':
+        generator = QSvgGenerator()
+        generator.setFileName(output)
+        generator.setSize(QSize(width, height))
+        plot.print_(generator)
+    elif fileFormat == 'pdf':
+        printer = QPrinter()
+        printer.setOutputFormat(QPrinter.PdfFormat)
+        printer.setOutputFileName(output)
+        printer.setFullPage(True)
+        printer.setPaperSize(QSizeF(width, height), QPrinter.Point)
+        printer.setCreator('PyQt4.Qwt5.render')
+        plot.print_(printer)
+    elif fileFormat == 'png':
+        image = QImage(width, height, QImage.Format_ARGB32)
+        image.fill(QColor('white').rgb())
+        plot.print_(image)
+        if not image.save(output, 'PNG'):
+            raise IOError('Failed to save %s' % output)
+    else:
+        raise ValueError('Unknown format %s' % fileFormat)
+
+# savePlot()
+
+
+def renderPlot(spec, directory=os.curdir):
+    """Render the plot specification `spec` to its output file.
+
+    Returns the name of the output file and the rendering time in seconds.
+    """
+    start = time.time()
+    output = os.path.join(directory, spec['output'])
+    fileFormat = spec.get('format') or Formats.get(
+        os.path.splitext(output)[1].lower())
+    plot = makePlot(spec, directory)
+    savePlot(plot, output, fileFormat, spec.get('size', (800, 600)))
+    return output, time.time() - start
+
+# renderPlot()
+
+
+def renderJob(job):
+    """Render a (spec, directory) pair in a worker process.
+
+    Returns the name of the output file, the rendering time in seconds,
+    and an error message or None.
+    """
+    spec, directory = job
+    start = time.time()
+    try:
+        output, seconds = renderPlot(spec, directory)
+        return output, seconds, None
+    except Exception:
+        return (spec.get('output', '?'), time.time() - start,
+                '%s: %s' % sys.exc_info()[:2])
+
+# renderJob()
+
+
+def loadSpecs(fileName):
+    """Return a list of (spec, directory) pairs read from a JSON file.
+    """
+    specs = json.load(open(fileName))
+    if isinstance(specs, dict):
+        specs = [specs]
+    directory = os.path.dirname(os.path.abspath(fileName))
+    return [(spec, directory) for spec in specs]
+
+# loadSpecs()
+
+
+def makePool(processes=None, platform=None):
+    """Return a `multiprocessing.Pool` of `processes` processes, which have
+    been initialized by `initialize(platform)`.
+
+    The processes start from a clean interpreter, when Python supports it.
+    Otherwise, they are forked and RuntimeError is raised, when this process
+    has a `QApplication`, except on Windows, which never forks.
+    """
+    if hasattr(multiprocessing, 'get_context'):
+        context = multiprocessing.get_context('spawn')
+    elif QApplication.instance() is not None and sys.platform != 'win32':
+        raise RuntimeError(
+            'Cannot fork render processes from a process with a QApplication')
+    else:
+        context = multiprocessing
+    return context.Pool(processes, initialize, (platform,))
+
+# makePool()
+
+
+def renderPlots(jobs, processes=None, platform=None):
+    """Render a list of (spec, directory) pairs and yield the result of
+    `renderJob()` for each plot in the order of the list.
+
+    A pool of `processes` processes renders the plots; None uses a process
+    per CPU and 1 renders them in this process.  See `makePool()`.
+    """
+    if processes == 1:
+        initialize(platform)
+        for job in jobs:
+            yield renderJob(job)
+        return
+
+    pool = makePool(processes, platform)
+    try:
+        for result in pool.imap(renderJob, jobs):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+# renderPlots()
+
+
+def main(args):
+    parser = OptionParser(
+        usage='python -m PyQt4.Qwt5.render [options] spec.json ...')
+    parser.add_option(
+        '-j', '--jobs', type='int', default=0, metavar='N',
+        help='render with N processes (default: one per CPU)')
+    parser.add_option(
+        '-p', '--platform', default=None, metavar='NAME',
+        help='the Qt platform of the processes, for instance minimal '
+        '(default: the platform of the build)')
+    options, fileNames = parser.parse_args(args)
+    if not fileNames:
+        parser.error('no plot specification files')
+
+    jobs = []
+    for fileName in fileNames:
+        jobs.extend(loadSpecs(fileName))
+
+    failures = 0
+    start = time.time()
+    for output, seconds, error in renderPlots(
+        jobs, options.jobs or None, options.platform):
+        if error:
+            failures += 1
+            print('%-50s %8.3f s  FAILED %s' % (output, seconds, error))
+        else:
+            print('%-50s %8.3f s' % (output, seconds))
+    print('%d plots rendered in %.3f s, %d failed'
+          % (len(jobs) - failures, time.time() - start, failures))
+
+    return failures and 1 or 0
+
+# main()
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+# Local Variables: ***
+# mode: python ***
+# End: ***
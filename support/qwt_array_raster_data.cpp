@@ -0,0 +1,245 @@
+// The code for QwtArrayRasterData, a QwtRasterData sharing the buffer of
+// a 2-D NumPy array.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifdef HAS_NUMPY
+
+// See qwt_numpy.cpp.
+#define PY_ARRAY_UNIQUE_SYMBOL PyQwt_NumPy_API
+#define NO_IMPORT_ARRAY
+
+#include <Python.h>
+#include <numpy/arrayobject.h>
+#include <limits>
+#include <qwt_math.h>
+#include <qwt_array_raster_data.h>
+
+
+class QwtArrayRasterData::PrivateData
+{
+public:
+    PrivateData(PyObject *array):
+        array(array),
+        bytes(PyArray_BYTES(array)),
+        ny(PyArray_DIM(array, 0)),
+        nx(PyArray_DIM(array, 1)),
+        yStride(PyArray_STRIDE(array, 0)),
+        xStride(PyArray_STRIDE(array, 1)),
+        rangeValid(false),
+        ref(1)
+    {
+        Py_INCREF(array);
+    }
+
+    // must be called with the GIL held
+    ~PrivateData()
+    {
+        Py_DECREF(array);
+    }
+
+    inline double value(npy_intp i, npy_intp j) const
+    {
+        return *reinterpret_cast<const double *>(
+            bytes + i * yStride + j * xStride);
+    }
+
+    PyObject *array;
+    const char *bytes;
+    const npy_intp ny;
+    const npy_intp nx;
+    const npy_intp yStride;
+    const npy_intp xStride;
+    // the cached range, shared by all copies
+    bool rangeValid;
+    QwtDoubleInterval range;
+    // shared by all copies and protected by the GIL
+    int ref;
+};
+
+
+QwtArrayRasterData::QwtArrayRasterData(
+    PyObject *array, const QwtDoubleRect &rect):
+    QwtRasterData(rect),
+    d_mode(NearestNeighbour)
+{
+    d_data = new PrivateData(array);
+}
+
+
+QwtArrayRasterData::QwtArrayRasterData(
+    PrivateData *data, const QwtDoubleRect &rect):
+    QwtRasterData(rect),
+    d_data(data),
+    d_mode(NearestNeighbour)
+{
+}
+
+
+QwtArrayRasterData::~QwtArrayRasterData()
+{
+    // Qt may delete the last copy after Python has been finalized
+    if (!Py_IsInitialized())
+        return;
+
+    PyGILState_STATE state = PyGILState_Ensure();
+    if (0 == --d_data->ref)
+        delete d_data;
+    PyGILState_Release(state);
+}
+
+
+QwtRasterData *QwtArrayRasterData::copy() const
+{
+    PyGILState_STATE state = PyGILState_Ensure();
+    ++d_data->ref;
+    PyGILState_Release(state);
+
+    QwtArrayRasterData *data = new QwtArrayRasterData(d_data, boundingRect());
+    data->d_mode = d_mode;
+
+    return data;
+}
+
+
+QSize QwtArrayRasterData::rasterHint(const QwtDoubleRect &rect) const
+{
+    const QwtDoubleRect r = boundingRect();
+    if (r.width() <= 0.0 || r.height() <= 0.0)
+        return QSize();
+
+    return QSize(
+        qwtMax(1, qRound(d_data->nx * rect.width() / r.width())),
+        qwtMax(1, qRound(d_data->ny * rect.height() / r.height())));
+}
+
+
+double QwtArrayRasterData::value(double x, double y) const
+{
+    const npy_intp nx = d_data->nx;
+    const npy_intp ny = d_data->ny;
+    if (0 == nx || 0 == ny)
+        return 0.0;
+
+    // an empty rectangle or a NaN position has no cell
+    const QwtDoubleRect r = boundingRect();
+    if (!(r.width() > 0.0 && r.height() > 0.0 && x == x && y == y))
+        return std::numeric_limits<double>::quiet_NaN();
+
+    // the position in units of cells, relative to the first cell center,
+    // clamped before casting to an index
+    const double u = qwtLim(
+        (x - r.left()) * nx / r.width() - 0.5, -1.0, double(nx));
+    const double v = qwtLim(
+        (y - r.top()) * ny / r.height() - 0.5, -1.0, double(ny));
+
+    if (NearestNeighbour == d_mode) {
+        const npy_intp j =
+            qwtLim(npy_intp(floor(u + 0.5)), npy_intp(0), nx - 1);
+        const npy_intp i =
+            qwtLim(npy_intp(floor(v + 0.5)), npy_intp(0), ny - 1);
+        return d_data->value(i, j);
+    }
+
+    const double uu = qwtLim(u, 0.0, double(nx - 1));
+    const double vv = qwtLim(v, 0.0, double(ny - 1));
+    const npy_intp j0 = npy_intp(uu);
+    const npy_intp i0 = npy_intp(vv);
+    const npy_intp j1 = qwtMin(j0 + 1, nx - 1);
+    const npy_intp i1 = qwtMin(i0 + 1, ny - 1);
+    const double s = uu - j0;
+    const double t = vv - i0;
+
+    return (1.0 - t) * ((1.0 - s) * d_data->value(i0, j0)
+                        + s * d_data->value(i0, j1))
+        + t * ((1.0 - s) * d_data->value(i1, j0)
+               + s * d_data->value(i1, j1));
+}
+
+
+QwtDoubleInterval QwtArrayRasterData::range() const
+{
+    if (!d_data->rangeValid) {
+        // NaN fails all comparisons and never becomes a minimum or maximum
+        double min = 0.0, max = 0.0;
+        bool valid = false;
+        for (npy_intp i = 0; i < d_data->ny; ++i) {
+            for (npy_intp j = 0; j < d_data->nx; ++j) {
+                const double value = d_data->value(i, j);
+                if (valid) {
+                    if (value < min)
+                        min = value;
+                    else if (value > max)
+                        max = value;
+                } else if (value == value) {
+                    min = max = value;
+                    valid = true;
+                }
+            }
+        }
+        d_data->range = valid ? QwtDoubleInterval(min, max)
+            : QwtDoubleInterval();
+        d_data->rangeValid = true;
+    }
+
+    return d_data->range;
+}
+
+
+void QwtArrayRasterData::setResampleMode(ResampleMode mode)
+{
+    d_mode = mode;
+}
+
+
+QwtArrayRasterData::ResampleMode QwtArrayRasterData::resampleMode() const
+{
+    return d_mode;
+}
+
+
+PyObject *QwtArrayRasterData::array() const
+{
+    Py_INCREF(d_data->array);
+    return d_data->array;
+}
+
+
+void QwtArrayRasterData::invalidate()
+{
+    d_data->rangeValid = false;
+}
+
+#endif // HAS_NUMPY
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
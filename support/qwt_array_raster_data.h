@@ -0,0 +1,93 @@
+// The header for QwtArrayRasterData, a QwtRasterData sharing the buffer of
+// a 2-D NumPy array.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_ARRAY_RASTER_DATA_H
+#define QWT_ARRAY_RASTER_DATA_H
+
+#ifdef HAS_NUMPY
+
+#include <Python.h>
+#include <qwt_raster_data.h>
+
+// QwtArrayRasterData resamples a 2-D NumPy array of type double covering
+// its bounding rectangle: the value of array[i, j] belongs to the cell
+// centered at x = left + (j + 0.5) * width / nx, y = top + (i + 0.5) *
+// height / ny, where ny, nx is the shape of the array.
+//
+// The array is shared by all copies, like the range of its values which
+// is computed once, ignoring NaN values.  invalidate() must be called after
+// changing the values of the array.
+class QwtArrayRasterData: public QwtRasterData
+{
+public:
+    enum ResampleMode {
+        NearestNeighbour,
+        BilinearInterpolation
+    };
+
+    // array must be an aligned 2-D array of type double
+    QwtArrayRasterData(PyObject *array, const QwtDoubleRect &rect);
+    virtual ~QwtArrayRasterData();
+
+    virtual QwtRasterData *copy() const;
+
+    virtual QSize rasterHint(const QwtDoubleRect &rect) const;
+    virtual double value(double x, double y) const;
+    virtual QwtDoubleInterval range() const;
+
+    void setResampleMode(ResampleMode mode);
+    ResampleMode resampleMode() const;
+
+    // returns a new reference to the array
+    PyObject *array() const;
+
+    void invalidate();
+
+private:
+    class PrivateData;
+
+    QwtArrayRasterData(PrivateData *data, const QwtDoubleRect &rect);
+    QwtArrayRasterData(const QwtArrayRasterData &);
+    QwtArrayRasterData &operator=(const QwtArrayRasterData &);
+
+    PrivateData *d_data;
+    ResampleMode d_mode;
+};
+
+#endif // HAS_NUMPY
+
+#endif // QWT_ARRAY_RASTER_DATA_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
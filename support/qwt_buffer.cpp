@@ -0,0 +1,262 @@
+// The code for the interface PyQwt <-> Python buffer protocol (PEP 3118).
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <Python.h>
+#include <qwt_buffer.h>
+
+#if PY_VERSION_HEX >= 0x02060000
+
+#include <ctype.h>
+#include <string.h>
+
+
+// returns true for objects exporting a buffer, except strings
+static bool qwtCheckBuffer(PyObject *in)
+{
+    return PyObject_CheckBuffer(in)
+        && !PyBytes_Check(in) && !PyUnicode_Check(in);
+}
+
+
+// returns the struct module code of the elements of view, or 0 when they
+// are not integer or floating point numbers in native byte order
+static char qwtBufferCode(const Py_buffer &view)
+{
+    const int one = 1;
+    const bool littleEndian = 1 == *reinterpret_cast<const char *>(&one);
+
+    const char *format = view.format ? view.format : "B";
+    switch (*format) {
+    case '@':
+    case '=':
+        ++format;
+        break;
+    case '<':
+        if (!littleEndian)
+            return 0;
+        ++format;
+        break;
+    case '>':
+    case '!':
+        if (littleEndian)
+            return 0;
+        ++format;
+        break;
+    }
+
+    if (!format[0] || format[1] || !strchr("bBhHiIlLqQfd", format[0]))
+        return 0;
+
+    return format[0];
+}
+
+
+// copies size elements of type S separated by stride bytes into it
+// without assuming that the elements are aligned
+template <typename T, typename S>
+static void qwtCopyBuffer(
+    const char *bytes, Py_ssize_t stride, Py_ssize_t size, T *it)
+{
+    S value;
+    for (Py_ssize_t i = size; i > 0; --i, bytes += stride) {
+        memcpy(&value, bytes, sizeof(S));
+        *it++ = T(value);
+    }
+}
+
+
+// copies size elements with the struct module code into it, or returns
+// false for an unhandled item size
+template <typename T>
+static bool qwtCopyBuffer(
+    const char *bytes, Py_ssize_t stride, Py_ssize_t size,
+    char code, size_t itemSize, T *it)
+{
+    if ('f' == code || 'd' == code) {
+        if (sizeof(float) == itemSize)
+            qwtCopyBuffer<T, float>(bytes, stride, size, it);
+        else if (sizeof(double) == itemSize)
+            qwtCopyBuffer<T, double>(bytes, stride, size, it);
+        else
+            return false;
+    } else if (islower(code)) {
+        if (sizeof(signed char) == itemSize)
+            qwtCopyBuffer<T, signed char>(bytes, stride, size, it);
+        else if (sizeof(short) == itemSize)
+            qwtCopyBuffer<T, short>(bytes, stride, size, it);
+        else if (sizeof(int) == itemSize)
+            qwtCopyBuffer<T, int>(bytes, stride, size, it);
+        else if (sizeof(long long) == itemSize)
+            qwtCopyBuffer<T, long long>(bytes, stride, size, it);
+        else
+            return false;
+    } else {
+        if (sizeof(unsigned char) == itemSize)
+            qwtCopyBuffer<T, unsigned char>(bytes, stride, size, it);
+        else if (sizeof(unsigned short) == itemSize)
+            qwtCopyBuffer<T, unsigned short>(bytes, stride, size, it);
+        else if (sizeof(unsigned int) == itemSize)
+            qwtCopyBuffer<T, unsigned int>(bytes, stride, size, it);
+        else if (sizeof(unsigned long long) == itemSize)
+            qwtCopyBuffer<T, unsigned long long>(bytes, stride, size, it);
+        else
+            return false;
+    }
+
+    return true;
+}
+
+
+template <typename T>
+static int qwtPyBufferToQwtArray(PyObject *in, QwtArray<T> &out)
+{
+    if (!qwtCheckBuffer(in))
+        return 0;
+
+    Py_buffer view;
+    if (-1 == PyObject_GetBuffer(in, &view, PyBUF_STRIDES | PyBUF_FORMAT))
+        return -1;
+
+    int result = -1;
+    const char code = qwtBufferCode(view);
+    if (1 == view.ndim && code) {
+        out.resize(view.shape[0]);
+        if (qwtCopyBuffer<T>(
+                reinterpret_cast<const char *>(view.buf), view.strides[0],
+                view.shape[0], code, size_t(view.itemsize), out.data()))
+            result = 1;
+    }
+
+    PyBuffer_Release(&view);
+
+    if (-1 == result)
+        PyErr_SetString(
+            PyExc_RuntimeError,
+            "The buffer is no 1D buffer containing real or integer types "
+            "in native byte order");
+
+    return result;
+}
+
+
+int try_PyBuffer_to_QwtArray(PyObject *in, QwtArray<double> &out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_PyBuffer_to_QwtArray() // QwtArray<double>\n");
+#endif
+
+    return qwtPyBufferToQwtArray(in, out);
+}
+
+
+int try_PyBuffer_to_QwtArray(PyObject *in, QwtArray<int> &out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_PyBuffer_to_QwtArray() // QwtArray<int>\n");
+#endif
+
+    return qwtPyBufferToQwtArray(in, out);
+}
+
+
+int try_PyBuffer_to_QwtArray(PyObject *in, QwtArray<long> &out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_PyBuffer_to_QwtArray() // QwtArray<long>\n");
+#endif
+
+    return qwtPyBufferToQwtArray(in, out);
+}
+
+
+int try_PyBuffer_to_QImage(PyObject *in, QImage **out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_PyBuffer_to_QImage()\n");
+#endif
+
+    if (!qwtCheckBuffer(in))
+        return 0;
+
+    Py_buffer view;
+    if (-1 == PyObject_GetBuffer(in, &view, PyBUF_STRIDES | PyBUF_FORMAT))
+        return -1;
+
+    const char code = qwtBufferCode(view);
+    if (2 != view.ndim || !code || islower(code)
+        || !(1 == view.itemsize || 4 == view.itemsize)) {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_RuntimeError,
+                        "The buffer must be 2-D of type uint8 or uint32");
+        return -1;
+    }
+
+    const Py_ssize_t ny = view.shape[0];
+    const Py_ssize_t nx = view.shape[1];
+    const char *bytes = reinterpret_cast<const char *>(view.buf);
+
+    if (1 == view.itemsize) {
+#if QT_VERSION < 0x040000
+        *out = new QImage(nx, ny, 8, 256);
+#else
+        *out = new QImage(nx, ny, QImage::Format_Indexed8);
+#endif
+        for (int i = 0; i < ny; ++i)
+            qwtCopyBuffer<uchar, uchar>(
+                bytes + i * view.strides[0], view.strides[1], nx,
+                (*out)->scanLine(i));
+        // initialize the palette as all gray
+        (*out)->setNumColors(256);
+        for (int i = 0; i<(*out)->numColors(); i++)
+            (*out)->setColor(i, qRgb(i, i, i));
+    } else {
+#if QT_VERSION < 0x040000
+        *out = new QImage(nx, ny, 32);
+#else
+        *out = new QImage(nx, ny, QImage::Format_ARGB32);
+#endif
+        for (int i = 0; i < ny; ++i)
+            qwtCopyBuffer<QRgb, unsigned int>(
+                bytes + i * view.strides[0], view.strides[1], nx,
+                reinterpret_cast<QRgb *>((*out)->scanLine(i)));
+    }
+
+    PyBuffer_Release(&view);
+
+    return 1;
+}
+
+#endif // PY_VERSION_HEX >= 0x02060000
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,65 @@
+// The header for the interface PyQwt <-> Python buffer protocol (PEP 3118).
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_BUFFER_H
+#define QWT_BUFFER_H
+
+#include <Python.h>
+#include <qimage.h>
+#include <qwt_array.h>
+
+#if PY_VERSION_HEX >= 0x02060000
+
+// The buffer functions accept objects exporting 1-D (QwtArray) or 2-D
+// (QImage) buffers of integer or floating point types in native byte order,
+// like memoryview, array.array, and mmap in Python 3.  Strings are left
+// to the sequence functions.
+
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+int try_PyBuffer_to_QwtArray(PyObject *in, QwtArray<double> &out);
+
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+int try_PyBuffer_to_QwtArray(PyObject *in, QwtArray<int> &out);
+
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+int try_PyBuffer_to_QwtArray(PyObject *in, QwtArray<long> &out);
+
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+int try_PyBuffer_to_QImage(PyObject *in, QImage **out);
+
+#endif // PY_VERSION_HEX >= 0x02060000
+
+#endif // QWT_BUFFER_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
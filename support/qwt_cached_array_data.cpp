@@ -0,0 +1,162 @@
+// The code for QwtCachedArrayData, a QwtArrayData caching its bounding
+// rectangle.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <string.h>
+#include <qwt_cached_array_data.h>
+
+
+QwtCachedArrayData::QwtCachedArrayData(
+    const QwtArray<double> &x, const QwtArray<double> &y):
+    QwtArrayData(x, y),
+    d_valid(false)
+{
+}
+
+
+QwtCachedArrayData::QwtCachedArrayData(
+    const double *x, const double *y, size_t size):
+    QwtArrayData(x, y, size),
+    d_valid(false)
+{
+}
+
+
+QwtCachedArrayData::~QwtCachedArrayData()
+{
+}
+
+
+QwtCachedArrayData &QwtCachedArrayData::operator=(const QwtArrayData &data)
+{
+    if (this != &data) {
+        QwtArrayData::operator=(data);
+        d_valid = false;
+    }
+
+    return *this;
+}
+
+
+QwtData *QwtCachedArrayData::copy() const
+{
+    QwtCachedArrayData *data = new QwtCachedArrayData(xData(), yData());
+    data->d_valid = d_valid;
+    data->d_rect = d_rect;
+
+    return data;
+}
+
+
+QwtDoubleRect QwtCachedArrayData::boundingRect() const
+{
+    if (!d_valid) {
+        d_rect = qwtBoundingRect(
+            reinterpret_cast<const char *>(xData().data()), sizeof(double),
+            reinterpret_cast<const char *>(yData().data()), sizeof(double),
+            size());
+        d_valid = true;
+    }
+
+    return d_rect;
+}
+
+
+bool QwtCachedArrayData::update(
+    size_t start, const double *x, const double *y, size_t size)
+{
+    if (start > this->size() || size > this->size() - start)
+        return false;
+
+    // QwtArrayData gives only const access to its own arrays
+    QwtArray<double> &xArray = const_cast<QwtArray<double> &>(xData());
+    QwtArray<double> &yArray = const_cast<QwtArray<double> &>(yData());
+
+#if QT_VERSION < 0x040000
+    // QMemArray is explicitly shared
+    xArray.detach();
+    yArray.detach();
+#endif
+
+    // QVector::data() detaches only when the arrays are shared
+    memcpy(xArray.data() + start, x, size * sizeof(double));
+    memcpy(yArray.data() + start, y, size * sizeof(double));
+    d_valid = false;
+
+    return true;
+}
+
+
+QwtDoubleRect qwtBoundingRect(
+    const char *xBytes, ptrdiff_t xStride,
+    const char *yBytes, ptrdiff_t yStride, size_t size)
+{
+    // NaN fails all comparisons and never becomes a minimum or maximum
+    double minX = 0.0, maxX = 0.0, minY = 0.0, maxY = 0.0;
+    bool xValid = false, yValid = false;
+
+    for (size_t i = 0; i < size; ++i) {
+        const double x = *reinterpret_cast<const double *>(xBytes);
+        const double y = *reinterpret_cast<const double *>(yBytes);
+        xBytes += xStride;
+        yBytes += yStride;
+
+        if (xValid) {
+            if (x < minX)
+                minX = x;
+            else if (x > maxX)
+                maxX = x;
+        } else if (x == x) {
+            minX = maxX = x;
+            xValid = true;
+        }
+
+        if (yValid) {
+            if (y < minY)
+                minY = y;
+            else if (y > maxY)
+                maxY = y;
+        } else if (y == y) {
+            minY = maxY = y;
+            yValid = true;
+        }
+    }
+
+    if (!xValid || !yValid)
+        return QwtDoubleRect(1.0, 1.0, -2.0, -2.0); // invalid
+
+    return QwtDoubleRect(minX, minY, maxX - minX, maxY - minY);
+}
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
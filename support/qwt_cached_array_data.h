@@ -0,0 +1,75 @@
+// The header for QwtCachedArrayData, a QwtArrayData caching its bounding
+// rectangle.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_CACHED_ARRAY_DATA_H
+#define QWT_CACHED_ARRAY_DATA_H
+
+#include <stddef.h>
+#include <qwt_data.h>
+
+// QwtCachedArrayData computes its bounding rectangle once, ignoring NaN
+// values, since the arrays of a QwtArrayData change only by update().
+class QwtCachedArrayData: public QwtArrayData
+{
+public:
+    QwtCachedArrayData(const QwtArray<double> &x, const QwtArray<double> &y);
+    QwtCachedArrayData(const double *x, const double *y, size_t size);
+    virtual ~QwtCachedArrayData();
+
+    QwtCachedArrayData &operator=(const QwtArrayData &data);
+
+    virtual QwtData *copy() const;
+    virtual QwtDoubleRect boundingRect() const;
+
+    // Overwrites the samples from start to start + size with x and y,
+    // without reallocating the arrays unless they are shared.
+    // Returns false, when the samples do not fit into the data.
+    bool update(size_t start, const double *x, const double *y, size_t size);
+
+private:
+    mutable bool d_valid;
+    mutable QwtDoubleRect d_rect;
+};
+
+// The bounding rectangle of size points in strided buffers of doubles,
+// ignoring NaN values.  Returns an invalid rectangle, when there are
+// no points or when all values of x or y are NaN.
+QwtDoubleRect qwtBoundingRect(
+    const char *xBytes, ptrdiff_t xStride,
+    const char *yBytes, ptrdiff_t yStride, size_t size);
+
+#endif // QWT_CACHED_ARRAY_DATA_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,118 @@
+// The code for drawing the samples appended to the data of a curve.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qpainter.h>
+#include <qpixmap.h>
+#include <qwt_math.h>
+#include <qwt_plot.h>
+#include <qwt_plot_canvas.h>
+#include <qwt_plot_curve.h>
+#include <qwt_ring_buffer_data.h>
+#include <qwt_scale_map.h>
+#include <qwt_draw_appended.h>
+
+
+// returns true, when all values from from to to fit into the scale of an
+// axis or when the axis is not autoscaled.  NaN values fit.
+static bool qwtFitsAxis(
+    const QwtPlotCurve *curve, int axis, bool x, int from, int to)
+{
+    const QwtPlot *plot = curve->plot();
+    if (!plot->axisAutoScale(axis))
+        return true;
+
+    const QwtScaleMap map = plot->canvasMap(axis);
+    const double min = qwtMin(map.s1(), map.s2());
+    const double max = qwtMax(map.s1(), map.s2());
+
+    for (int i = from; i <= to; ++i) {
+        const double value = x ? curve->x(i) : curve->y(i);
+        if (value < min || value > max)
+            return false;
+    }
+
+    return true;
+}
+
+
+bool qwtDrawAppended(QwtPlotCurve *curve, int from, int to)
+{
+    // nothing to draw nor to replot
+    QwtPlot *plot = curve->plot();
+    if (!plot)
+        return true;
+
+    // keeps other threads from appending to a ring buffer while drawing
+    const QwtRingBufferData *ring =
+        dynamic_cast<const QwtRingBufferData *>(&curve->data());
+    const QwtRingBufferData::Locker locker(ring);
+
+    if (to < 0)
+        to = curve->dataSize() - 1;
+    if (from > 0)
+        --from;
+    if (from > to)
+        return true;
+
+    // a ring buffer, which has overwritten samples, has moved all samples
+    if ((ring && ring->dropped() > 0)
+        || !qwtFitsAxis(curve, curve->xAxis(), true, from, to)
+        || !qwtFitsAxis(curve, curve->yAxis(), false, from, to)) {
+        plot->replot();
+        return false;
+    }
+
+    QwtPlotCanvas *canvas = plot->canvas();
+    QPixmap *cache = canvas->paintCache();
+    const QRect rect = canvas->contentsRect();
+
+    if (canvas->testPaintAttribute(QwtPlotCanvas::PaintCached)
+        && cache && !cache->isNull() && cache->size() == rect.size()) {
+        QPainter painter(cache);
+        painter.translate(-rect.x(), -rect.y());
+        curve->draw(&painter,
+                    plot->canvasMap(curve->xAxis()),
+                    plot->canvasMap(curve->yAxis()),
+                    from, to);
+        painter.end();
+        // the paint event copies the cache onto the canvas
+        canvas->update(rect);
+    } else {
+        curve->draw(from, to);
+    }
+
+    return true;
+}
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,58 @@
+// The header for drawing the samples appended to the data of a curve.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_DRAW_APPENDED_H
+#define QWT_DRAW_APPENDED_H
+
+class QwtPlotCurve;
+
+// Draws the samples from index from to index to (the last sample when to
+// is negative) of a curve attached to a plot, after appending them to the
+// data of the curve.  The sample before from is drawn again to connect the
+// lines.
+//
+// When the canvas caches its contents, the samples are drawn into its paint
+// cache and the canvas is updated from the cache within its next paint
+// event, so that no other item is drawn again.  Otherwise, the samples are
+// drawn with QwtPlotCurve::draw(from, to).
+//
+// Returns false after a replot of the whole plot, when the samples fall
+// outside the scale of an autoscaled axis of the curve or when the data of
+// the curve is a QwtRingBufferData, which has overwritten samples.  Returns
+// true for a curve without a plot, since there is nothing to replot.
+bool qwtDrawAppended(QwtPlotCurve *curve, int from, int to = -1);
+
+#endif // QWT_DRAW_APPENDED_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,108 @@
+// The code for the functions releasing the GIL while Qwt renders.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qwt_gil.h>
+#include <qwt_plot.h>
+#if QT_VERSION >= 0x040000
+#include <qvariant.h>
+#endif
+
+// protected by the GIL
+static bool releaseGIL = true;
+
+
+void qwtSetReleaseGIL(bool on)
+{
+    releaseGIL = on;
+}
+
+
+bool qwtTestReleaseGIL()
+{
+    return releaseGIL;
+}
+
+
+bool qwtReleaseGIL(const QwtPlot *plot)
+{
+    if (!releaseGIL)
+        return false;
+
+#if QT_VERSION >= 0x040000
+    if (plot) {
+        const QVariant value = plot->property("releaseGIL");
+        if (value.isValid() && !value.toBool())
+            return false;
+    }
+#else
+    Q_UNUSED(plot);
+#endif
+
+    return true;
+}
+
+
+PyThreadState *qwtBeginAllowThreads(const QwtPlot *plot)
+{
+    if (!qwtReleaseGIL(plot))
+        return 0;
+
+    return PyEval_SaveThread();
+}
+
+
+void qwtEndAllowThreads(PyThreadState *state)
+{
+    if (state)
+        PyEval_RestoreThread(state);
+}
+
+
+bool qwtHasPythonMethod(PyObject *object, const char *name)
+{
+    PyObject *method = PyObject_GetAttrString(object, name);
+    if (!method) {
+        PyErr_Clear();
+        return false;
+    }
+
+    // the methods wrapped by SIP are builtin functions
+    const bool result = PyMethod_Check(method)
+        && PyFunction_Check(PyMethod_GET_FUNCTION(method));
+    Py_DECREF(method);
+
+    return result;
+}
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,63 @@
+// The header for the functions releasing the GIL while Qwt renders.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_GIL_H
+#define QWT_GIL_H
+
+#include <Python.h>
+
+class QwtPlot;
+
+// Switch the release of the GIL around the rendering functions on or off.
+// The GIL is released by default.
+void qwtSetReleaseGIL(bool on);
+bool qwtTestReleaseGIL();
+
+// Returns true, when the GIL may be released while rendering plot.
+// A plot opts out by setting its dynamic property "releaseGIL" to false.
+bool qwtReleaseGIL(const QwtPlot *plot);
+
+// Releases the GIL when qwtReleaseGIL(plot) and returns the thread state
+// to be restored by qwtEndAllowThreads().  Must be called with the GIL held.
+PyThreadState *qwtBeginAllowThreads(const QwtPlot *plot);
+void qwtEndAllowThreads(PyThreadState *state);
+
+// Returns true, when object has a method name implemented in Python, so
+// that calling it from C++ requires the GIL.  Must be called with the GIL
+// held.
+bool qwtHasPythonMethod(PyObject *object, const char *name);
+
+#endif // QWT_GIL_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,254 @@
+// The code for QwtGridRasterData, a QwtRasterData evaluating a whole
+// raster at once.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifdef HAS_NUMPY
+
+// See qwt_numpy.cpp.
+#define PY_ARRAY_UNIQUE_SYMBOL PyQwt_NumPy_API
+#define NO_IMPORT_ARRAY
+
+#include <Python.h>
+#include <numpy/arrayobject.h>
+#include <limits>
+#include <qwt_math.h>
+#include <qwt_grid_raster_data.h>
+
+
+QwtGridRasterData::QwtGridRasterData():
+    QwtRasterData(),
+    d_raster(0),
+    d_contours(false),
+    d_interpolate(false)
+{
+}
+
+
+QwtGridRasterData::QwtGridRasterData(const QwtDoubleRect &rect):
+    QwtRasterData(rect),
+    d_raster(0),
+    d_contours(false),
+    d_interpolate(false)
+{
+}
+
+
+QwtGridRasterData::~QwtGridRasterData()
+{
+    releaseRaster();
+}
+
+
+void QwtGridRasterData::initRaster(
+    const QwtDoubleRect &area, const QSize &size)
+{
+    releaseRaster();
+
+    const npy_intp ny = size.height();
+    const npy_intp nx = size.width();
+    if (ny <= 0 || nx <= 0 || area.width() <= 0.0 || area.height() <= 0.0)
+        return;
+
+    // contourLines() samples the area from edge to edge: widen the area by
+    // half a cell on each side, so that the cell centers of the raster lie
+    // on the edges and value() interpolates between the cell centers.
+    QwtDoubleRect rect = area;
+    d_interpolate = d_contours && nx > 1 && ny > 1;
+    if (d_interpolate) {
+        const double dx = 0.5 * area.width() / (nx - 1);
+        const double dy = 0.5 * area.height() / (ny - 1);
+        rect = QwtDoubleRect(area.left() - dx, area.top() - dy,
+                             area.width() + 2 * dx, area.height() + 2 * dy);
+    }
+
+    PyGILState_STATE state = PyGILState_Ensure();
+
+    PyObject *result = valueGrid(rect, size);
+    if (Py_None == result) {
+        Py_DECREF(result);
+        result = 0;
+
+        npy_intp dimensions[2] = { ny, nx };
+        PyObject *x = PyArray_SimpleNew(2, dimensions, NPY_DOUBLE);
+        PyObject *y = PyArray_SimpleNew(2, dimensions, NPY_DOUBLE);
+        if (x && y) {
+            double *xIt = (double *) PyArray_DATA(x);
+            double *yIt = (double *) PyArray_DATA(y);
+            for (npy_intp i = 0; i < ny; ++i) {
+                const double yi = rect.top() + (i + 0.5) * rect.height() / ny;
+                for (npy_intp j = 0; j < nx; ++j) {
+                    *xIt++ = rect.left() + (j + 0.5) * rect.width() / nx;
+                    *yIt++ = yi;
+                }
+            }
+            result = values(x, y);
+        }
+        Py_XDECREF(x);
+        Py_XDECREF(y);
+    }
+
+    if (result && Py_None != result) {
+        d_raster = PyArray_FromAny(
+            result, PyArray_DescrFromType(NPY_DOUBLE), 2, 2,
+            NPY_ALIGNED, 0);
+        if (d_raster && (PyArray_DIM(d_raster, 0) != ny
+                         || PyArray_DIM(d_raster, 1) != nx)) {
+            PyErr_SetString(PyExc_RuntimeError,
+                            "The raster has not the requested shape");
+            Py_DECREF(d_raster);
+            d_raster = 0;
+        }
+        d_rect = rect;
+    }
+    Py_XDECREF(result);
+
+    // Qwt cannot handle Python exceptions
+    if (PyErr_Occurred())
+        PyErr_Print();
+
+    PyGILState_Release(state);
+}
+
+
+void QwtGridRasterData::discardRaster()
+{
+    releaseRaster();
+}
+
+
+// Returns the index of the cell holding u, the position in units of cells.
+// QwtPlotSpectrogram and the tile cache sample exactly at the cell edges,
+// where rounding errors may put u just below the edge: positions within a
+// millionth of a cell below an edge belong to the cell above the edge.
+static inline npy_intp qwtCell(double u, npy_intp n)
+{
+    return qwtLim(npy_intp(floor(qwtLim(u, -1.0, double(n)) + 1e-6)),
+                  npy_intp(0), n - 1);
+}
+
+
+static inline double qwtRasterValue(PyObject *raster, npy_intp i, npy_intp j)
+{
+    return *reinterpret_cast<const double *>(
+        PyArray_BYTES(raster)
+        + i * PyArray_STRIDE(raster, 0) + j * PyArray_STRIDE(raster, 1));
+}
+
+
+// Splits u, the position in units of cells relative to the first cell
+// center, into the index of the cell center at or below u and the fraction
+// of the way to the next cell center.
+static inline npy_intp qwtCellCenter(double u, npy_intp n, double &fraction)
+{
+    u = qwtLim(u, 0.0, double(n - 1));
+    const npy_intp k = qwtMin(npy_intp(floor(u)), n - 2);
+    fraction = u - k;
+
+    return k;
+}
+
+
+double QwtGridRasterData::value(double x, double y) const
+{
+    if (!d_raster || x != x || y != y)
+        return std::numeric_limits<double>::quiet_NaN();
+
+    const npy_intp ny = PyArray_DIM(d_raster, 0);
+    const npy_intp nx = PyArray_DIM(d_raster, 1);
+    const double u = (x - d_rect.left()) * nx / d_rect.width();
+    const double v = (y - d_rect.top()) * ny / d_rect.height();
+
+    if (!d_interpolate)
+        return qwtRasterValue(d_raster, qwtCell(v, ny), qwtCell(u, nx));
+
+    double fu, fv;
+    const npy_intp j = qwtCellCenter(u - 0.5, nx, fu);
+    const npy_intp i = qwtCellCenter(v - 0.5, ny, fv);
+
+    const double top = (1.0 - fu) * qwtRasterValue(d_raster, i, j)
+        + fu * qwtRasterValue(d_raster, i, j + 1);
+    const double bottom = (1.0 - fu) * qwtRasterValue(d_raster, i + 1, j)
+        + fu * qwtRasterValue(d_raster, i + 1, j + 1);
+
+    return (1.0 - fv) * top + fv * bottom;
+}
+
+
+#if QT_VERSION >= 0x040000
+QwtRasterData::ContourLines QwtGridRasterData::contourLines(
+    const QwtDoubleRect &rect, const QSize &raster,
+    const QList<double> &levels, int flags) const
+{
+    d_contours = true;
+    const ContourLines lines =
+        QwtRasterData::contourLines(rect, raster, levels, flags);
+    d_contours = false;
+
+    return lines;
+}
+#endif // QT_VERSION >= 0x040000
+
+
+PyObject *QwtGridRasterData::valueGrid(
+    const QwtDoubleRect &, const QSize &) const
+{
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+PyObject *QwtGridRasterData::values(PyObject *, PyObject *) const
+{
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+void QwtGridRasterData::releaseRaster()
+{
+    if (!d_raster)
+        return;
+
+    // Qt may delete the data after Python has been finalized
+    if (Py_IsInitialized()) {
+        PyGILState_STATE state = PyGILState_Ensure();
+        Py_DECREF(d_raster);
+        PyGILState_Release(state);
+    }
+    d_raster = 0;
+}
+
+#endif // HAS_NUMPY
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,97 @@
+// The header for QwtGridRasterData, a QwtRasterData evaluating a whole
+// raster at once.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_GRID_RASTER_DATA_H
+#define QWT_GRID_RASTER_DATA_H
+
+#ifdef HAS_NUMPY
+
+#include <Python.h>
+#include <qwt_raster_data.h>
+
+// QwtGridRasterData evaluates the raster passed to initRaster() by a single
+// call of valueGrid() or values(), which are meant to be reimplemented in
+// Python, and looks up the values of the raster in value().
+//
+// The raster of size ny, nx covering rect consists of cells centered at
+// x[i, j] = left + (j + 0.5) * width / nx, y[i, j] = top + (i + 0.5) *
+// height / ny.  valueGrid(rect, size) must return an array of shape
+// (ny, nx) holding the values at those points.  values(x, y) takes the
+// 2-D arrays x and y and must return an array of the same shape.
+//
+// contourLines() samples the raster from edge to edge instead of at the
+// cell centers.  During contourLines() the raster covers rect widened by
+// half a cell on each side, so that its cell centers lie on the points
+// sampled by contourLines(), and value() interpolates bilinearly between
+// the cell centers.
+//
+// The default implementations of valueGrid() and values() return None,
+// and value() returns NaN when neither of them is reimplemented.
+class QwtGridRasterData: public QwtRasterData
+{
+public:
+    QwtGridRasterData();
+    QwtGridRasterData(const QwtDoubleRect &rect);
+    virtual ~QwtGridRasterData();
+
+    virtual void initRaster(const QwtDoubleRect &rect, const QSize &size);
+    virtual void discardRaster();
+    virtual double value(double x, double y) const;
+
+#if QT_VERSION >= 0x040000
+    virtual ContourLines contourLines(
+        const QwtDoubleRect &rect, const QSize &raster,
+        const QList<double> &levels, int flags) const;
+#endif
+
+    // return new references and must be called with the GIL held
+    virtual PyObject *valueGrid(
+        const QwtDoubleRect &rect, const QSize &size) const;
+    virtual PyObject *values(PyObject *x, PyObject *y) const;
+
+private:
+    void releaseRaster();
+
+    PyObject *d_raster;
+    QwtDoubleRect d_rect;
+    mutable bool d_contours;
+    bool d_interpolate;
+};
+
+#endif // HAS_NUMPY
+
+#endif // QWT_GRID_RASTER_DATA_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
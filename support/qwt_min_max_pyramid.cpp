@@ -0,0 +1,160 @@
+// The code for QwtMinMaxPyramid, a level of detail index of a curve.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qwt_min_max_pyramid.h>
+
+// the smallest block holds 2**Shift samples
+static const int Shift = 6;
+
+
+QwtMinMaxPyramid::QwtMinMaxPyramid(
+    const char *bytes, ptrdiff_t stride, int size):
+    d_bytes(bytes),
+    d_stride(stride),
+    d_size(size),
+    d_levels(0)
+{
+    int total = 0;
+    for (int count = size >> Shift; count > 0 && d_levels < 32; count >>= 1) {
+        d_offset[d_levels] = total;
+        d_count[d_levels] = count;
+        total += 2 * count;
+        ++d_levels;
+    }
+    d_index.resize(total);
+
+    if (0 == d_levels)
+        return;
+
+    // the smallest blocks from the samples
+    int *index = d_index.data();
+    for (int block = 0; block < d_count[0]; ++block) {
+        const int first = block << Shift;
+        int min = first;
+        int max = first;
+        double yMin = y(first);
+        double yMax = yMin;
+        for (int i = first + 1; i < first + (1 << Shift); ++i) {
+            const double value = y(i);
+            if (value < yMin) {
+                min = i;
+                yMin = value;
+            } else if (value > yMax) {
+                max = i;
+                yMax = value;
+            }
+        }
+        *index++ = min;
+        *index++ = max;
+    }
+
+    // the larger blocks from pairs of smaller blocks
+    for (int level = 1; level < d_levels; ++level) {
+        const int *lower = d_index.data() + d_offset[level - 1];
+        index = d_index.data() + d_offset[level];
+        for (int block = 0; block < d_count[level]; ++block) {
+            const int *left = lower + 4 * block;
+            const int *right = left + 2;
+            *index++ = (y(right[0]) < y(left[0])) ? right[0] : left[0];
+            *index++ = (y(right[1]) > y(left[1])) ? right[1] : left[1];
+        }
+    }
+}
+
+
+QwtMinMaxPyramid::~QwtMinMaxPyramid()
+{
+}
+
+
+int QwtMinMaxPyramid::size() const
+{
+    return d_size;
+}
+
+
+int QwtMinMaxPyramid::levels() const
+{
+    return d_levels;
+}
+
+
+void QwtMinMaxPyramid::minMax(int from, int to, int &min, int &max) const
+{
+    min = max = from;
+    double yMin = y(from);
+    double yMax = yMin;
+
+    int i = from + 1;
+    while (i <= to) {
+        // the largest block starting at i and ending before to
+        int level = -1;
+        while (level + 1 < d_levels) {
+            const int shift = level + 1 + Shift;
+            const int block = i >> shift;
+            if ((block << shift) != i
+                || i + (1 << shift) - 1 > to
+                || block >= d_count[level + 1])
+                break;
+            ++level;
+        }
+
+        if (-1 == level) {
+            const double value = y(i);
+            if (value < yMin) {
+                min = i;
+                yMin = value;
+            } else if (value > yMax) {
+                max = i;
+                yMax = value;
+            }
+            ++i;
+            continue;
+        }
+
+        const int *index = d_index.data()
+            + d_offset[level] + 2 * (i >> (level + Shift));
+        if (y(index[0]) < yMin) {
+            min = index[0];
+            yMin = y(min);
+        }
+        if (y(index[1]) > yMax) {
+            max = index[1];
+            yMax = y(max);
+        }
+        i += 1 << (level + Shift);
+    }
+}
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,80 @@
+// The header for QwtMinMaxPyramid, a level of detail index of a curve.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_MIN_MAX_PYRAMID_H
+#define QWT_MIN_MAX_PYRAMID_H
+
+#include <stddef.h>
+#include <qwt_array.h>
+
+// QwtMinMaxPyramid holds the indices of the minimum and the maximum of
+// the y-values in blocks of 2**6, 2**7, ... samples, so that the extremes
+// of any range of samples are found by looking at less than 2**7 samples
+// and a few blocks of each level.
+//
+// The y-values are read from a strided buffer of doubles, which must
+// outlive the pyramid.  The first index of a minimum or maximum wins.
+class QwtMinMaxPyramid
+{
+public:
+    QwtMinMaxPyramid(const char *bytes, ptrdiff_t stride, int size);
+    ~QwtMinMaxPyramid();
+
+    int size() const;
+    int levels() const;
+
+    // the indices of the minimum and maximum in [from, to]
+    void minMax(int from, int to, int &min, int &max) const;
+
+private:
+    inline double y(int i) const
+    {
+        return *reinterpret_cast<const double *>(
+            d_bytes + ptrdiff_t(i) * d_stride);
+    }
+
+    const char *d_bytes;
+    const ptrdiff_t d_stride;
+    const int d_size;
+
+    int d_levels;
+    int d_offset[32];
+    int d_count[32];
+    // pairs of indices of the minimum and maximum of each block
+    QwtArray<int> d_index;
+};
+
+#endif // QWT_MIN_MAX_PYRAMID_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -29,44 +29,151 @@
 // PyQwt becomes a free plug-in for a non-free program.
 
 
+#include <qwt_buffer.h>
 #include <qwt_ndarray.h>
 #include <qwt_numerical_interface.h>
 #include <qwt_numarray.h>
 #include <qwt_numeric.h>
 #include <qwt_numpy.h>
+#include <qwt_math.h>
 
 
-static int try_PySequence_to_QwtArray(PyObject *in, QwtArray<double> &out)
+// converts a Python number to value
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+static inline int qwtFromPyNumber(PyObject *element, double &value)
 {
-    if (!PyList_Check(in) && !PyTuple_Check(in))
+    if (PyFloat_Check(element)) {
+        value = PyFloat_AsDouble(element);
+#if PY_MAJOR_VERSION < 3
+    } else if (PyInt_Check(element)) {
+        value = double(PyInt_AS_LONG(element));
+#endif
+    } else if (PyLong_Check(element)) {
+        value = PyLong_AsDouble(element);
+        if (-1.0 == value && PyErr_Occurred())
+            return -1;
+    } else {
         return 0;
+    }
+
+    return 1;
+}
 
-    // MSVC-6.0 chokes on passing an uint in QwtArray<double>::operator[](int)
-    int size = PySequence_Size(in);
-    out.resize(size);
 
-    for (int i=0; i<size; i++) {
-        PyObject *element = PySequence_Fast_GET_ITEM(in, i);
-        if (PyFloat_Check(element)) {
-            out[i] = PyFloat_AsDouble(element);
+// converts a Python number to value
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+static inline int qwtFromPyNumber(PyObject *element, long &value)
+{
+    if (PyFloat_Check(element)) {
+        value = long(PyFloat_AsDouble(element));
 #if PY_MAJOR_VERSION < 3
-        } else if (PyInt_Check(element)) {
-            out[i] = double(PyInt_AsLong(element));
+    } else if (PyInt_Check(element)) {
+        value = PyInt_AS_LONG(element);
 #endif
-        } else if (PyLong_Check(element)) {
-            out[i] = PyLong_AsDouble(element);
-        } else {
-            PyErr_SetString(
-                PyExc_TypeError,
-                "The sequence may only contain float, int, or long types.");
-
+    } else if (PyLong_Check(element)) {
+        value = PyLong_AsLong(element);
+        if (-1 == value && PyErr_Occurred())
             return -1;
+    } else {
+        return 0;
+    }
+
+    return 1;
+}
+
+
+// converts a Python number to value
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+static inline int qwtFromPyNumber(PyObject *element, int &value)
+{
+    long result;
+    const int ok = qwtFromPyNumber(element, result);
+    value = int(result);
+    return ok;
+}
+
+
+// returns -1 after setting a Python exception, when result is 0
+static int qwtSequenceError(int result)
+{
+    if (0 == result)
+        PyErr_SetString(
+            PyExc_TypeError,
+            "The sequence may only contain float, int, or long types.");
+
+    return -1;
+}
+
+
+// Lists and tuples of floats take the fast path: no function call is made
+// for a float.  Other iterables, except strings, are read in a single pass
+// while growing out geometrically.
+template <typename T>
+static int try_PySequence_to_QwtArray(PyObject *in, QwtArray<T> &out)
+{
+    int result;
+
+    if (PyList_Check(in) || PyTuple_Check(in)) {
+        const Py_ssize_t size = PySequence_Fast_GET_SIZE(in);
+        PyObject **items = PySequence_Fast_ITEMS(in);
+        out.resize(size);
+        T *it = out.data();
+        for (Py_ssize_t i = 0; i < size; ++i, ++it) {
+            PyObject *element = items[i];
+            if (PyFloat_CheckExact(element))
+                *it = T(PyFloat_AS_DOUBLE(element));
+            else if (1 != (result = qwtFromPyNumber(element, *it)))
+                return qwtSequenceError(result);
+        }
+        return 1;
+    }
+
+#if PY_MAJOR_VERSION < 3
+    if (PyString_Check(in) || PyUnicode_Check(in))
+#else
+    if (PyBytes_Check(in) || PyUnicode_Check(in))
+#endif
+        return 0;
+
+    PyObject *iterator = PyObject_GetIter(in);
+    if (!iterator) {
+        PyErr_Clear();
+        return 0;
+    }
+
+    Py_ssize_t size = PyObject_Size(in);
+    if (size < 0) {
+        PyErr_Clear();
+        size = 0;
+    }
+    out.resize(size);
+
+    Py_ssize_t count = 0;
+    PyObject *element;
+    while ((element = PyIter_Next(iterator))) {
+        if (count == out.size())
+            out.resize(qwtMax(Py_ssize_t(16), 2 * count));
+        if (PyFloat_CheckExact(element))
+            out[count] = T(PyFloat_AS_DOUBLE(element));
+        else if (1 != (result = qwtFromPyNumber(element, out[count]))) {
+            Py_DECREF(element);
+            Py_DECREF(iterator);
+            return qwtSequenceError(result);
         }
+        Py_DECREF(element);
+        ++count;
     }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred())
+        return -1;
+
+    out.resize(count);
 
     return 1;
 }
 
+
 int try_PyObject_to_QwtArray(PyObject *in, QwtArray<double> &out)
 {
     int result;
@@ -86,6 +193,11 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<double> &out)
         return result;
 #endif
 
+#if PY_VERSION_HEX >= 0x02060000
+    if ((result = try_PyBuffer_to_QwtArray(in, out)))
+        return result;
+#endif
+
     if ((result = try_NDArray_to_QwtArray(in, out)))
         return result;
 
@@ -93,8 +205,11 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<double> &out)
         return result;
 
     PyErr_SetString(PyExc_TypeError, "expected is\n"
-                    "(*) a list or tuple of Python numbers.\n"
+                    "(*) a list, tuple, or iterable of Python numbers.\n"
                     "(*) an array with the N-D array interface.\n"
+#if PY_VERSION_HEX >= 0x02060000
+                    "(*) an object with the buffer interface.\n"
+#endif
 #ifdef HAS_NUMPY
                     "(*) a NumPy array coercible to PyArray_DOUBLE.\n"
 #else
@@ -116,38 +231,6 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<double> &out)
 }
 
 
-static int try_PySequence_to_QwtArray(PyObject *in, QwtArray<int> &out)
-{
-    if (!PyList_Check(in) && !PyTuple_Check(in))
-        return 0;
-
-    // MSVC-6.0 chokes on passing an uint in QwtArray<double>::operator[](int)
-    int size = PySequence_Size(in);
-    out.resize(size);
-
-    for (int i=0; i<size; i++) {
-        PyObject *element = PySequence_Fast_GET_ITEM(in, i);
-        if (PyFloat_Check(element)) {
-            out[i] = int(PyFloat_AsDouble(element));
-#if PY_MAJOR_VERSION < 3
-        } else if (PyInt_Check(element)) {
-            out[i] = int(PyInt_AsLong(element));
-#endif
-        } else if (PyLong_Check(element)) {
-            out[i] = int(PyLong_AsLong(element));
-        } else {
-            PyErr_SetString(
-                PyExc_TypeError,
-                "The sequence may only contain float, int, or long types.");
-
-            return -1;
-        }
-    }
-
-    return 1;
-}
-
-
 int try_PyObject_to_QwtArray(PyObject *in, QwtArray<int> &out)
 {
     int result;
@@ -167,6 +250,11 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<int> &out)
         return result;
 #endif
 
+#if PY_VERSION_HEX >= 0x02060000
+    if ((result = try_PyBuffer_to_QwtArray(in, out)))
+        return result;
+#endif
+
     if ((result = try_NDArray_to_QwtArray(in, out)))
         return result;
 
@@ -174,8 +262,11 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<int> &out)
         return result;
 
     PyErr_SetString(PyExc_TypeError, "expected is\n"
-                    "(*) a list or tuple of Python numbers.\n"
+                    "(*) a list, tuple, or iterable of Python numbers.\n"
                     "(*) an array with the N-D array interface.\n"
+#if PY_VERSION_HEX >= 0x02060000
+                    "(*) an object with the buffer interface.\n"
+#endif
 #ifdef HAS_NUMPY
                     "(*) a NumPy array coercible to PyArray_INT.\n"
 #else
@@ -197,38 +288,6 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<int> &out)
 }
 
 
-static int try_PySequence_to_QwtArray(PyObject *in, QwtArray<long> &out)
-{
-    if (!PyList_Check(in) && !PyTuple_Check(in))
-        return 0;
-
-    // MSVC-6.0 chokes on passing an uint in QwtArray<double>::operator[](int)
-    int size = PySequence_Size(in);
-    out.resize(size);
-
-    for (int i=0; i<size; i++) {
-        PyObject *element = PySequence_Fast_GET_ITEM(in, i);
-        if (PyFloat_Check(element)) {
-            out[i] = long(PyFloat_AsDouble(element));
-#if PY_MAJOR_VERSION < 3
-        } else if (PyInt_Check(element)) {
-            out[i] = PyInt_AsLong(element);
-#endif
-        } else if (PyLong_Check(element)) {
-            out[i] = PyLong_AsLong(element);
-        } else {
-            PyErr_SetString(
-                PyExc_TypeError,
-                "The sequence may only contain float, int, or long types.");
-
-            return -1;
-        }
-    }
-
-    return 1;
-}
-
-
 int try_PyObject_to_QwtArray(PyObject *in, QwtArray<long> &out)
 {
     int result;
@@ -248,6 +307,11 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<long> &out)
         return result;
 #endif
 
+#if PY_VERSION_HEX >= 0x02060000
+    if ((result = try_PyBuffer_to_QwtArray(in, out)))
+        return result;
+#endif
+
     if ((result = try_NDArray_to_QwtArray(in, out)))
         return result;
 
@@ -255,8 +319,11 @@ int try_PyObject_to_QwtArray(PyObject *in, QwtArray<long> &out)
         return result;
 
     PyErr_SetString(PyExc_TypeError, "expected is\n"
-                    "(*) a list or tuple of Python numbers.\n"
+                    "(*) a list, tuple, or iterable of Python numbers.\n"
                     "(*) an array with the N-D array interface.\n"
+#if PY_VERSION_HEX >= 0x02060000
+                    "(*) an object with the buffer interface.\n"
+#endif
 #ifdef HAS_NUMPY
                     "(*) a NumPy array coercible to PyArray_INT.\n"
 #else
@@ -297,11 +364,19 @@ int try_PyObject_to_QImage(PyObject *in, QImage **out)
         return result;
 #endif
 
+#if PY_VERSION_HEX >= 0x02060000
+    if ((result = try_PyBuffer_to_QImage(in, out)))
+        return result;
+#endif
+
     if ((result = try_NDArray_to_QImage(in, out)))
         return result;
 
     PyErr_SetString(PyExc_TypeError, "expected is\n"
                     "(*) an array with the N-D array interface.\n"
+#if PY_VERSION_HEX >= 0x02060000
+                    "(*) an object with the buffer interface.\n"
+#endif
 #ifdef HAS_NUMPY
                     "(*) a NumPy array.\n"
 #else
@@ -31,36 +31,115 @@
 
 #ifdef HAS_NUMPY
 
+// The NumPy C-API is shared by all files in support which include
+// numpy/arrayobject.h, but only this file calls import_array().
+#define PY_ARRAY_UNIQUE_SYMBOL PyQwt_NumPy_API
+
 #include <Python.h>
 #include <numpy/arrayobject.h>
 #include <qwt_numerical_interface.h>
 #include <qwt_numpy.h>
+#include <qwt_math.h>
 
 int qwt_import_numpy() {
     import_array1(0);
 }
 
 
-int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<double> &out)
+// copies size elements of type S separated by stride bytes into it
+template <typename T, typename S>
+static void qwtCopyStrided(
+    const char *bytes, npy_intp stride, npy_intp size, T *it)
 {
-#ifdef TRACE_PYQWT
-    fprintf(stderr, "Qwt: try_NumPyArray_to_QwtArray()\n");
-#endif
+    if (stride == npy_intp(sizeof(S))) {
+        const S *data = reinterpret_cast<const S *>(bytes);
+        for (npy_intp i = size; i > 0; --i)
+            *it++ = T(*data++);
+    } else {
+        for (npy_intp i = size; i > 0; --i, bytes += stride)
+            *it++ = T(*reinterpret_cast<const S *>(bytes));
+    }
+}
+
+
+// copies the elements of the aligned 1-D array in into out, converting
+// them to T in a single pass, or returns false for an unhandled type
+template <typename T>
+static bool qwtCopyElements(PyObject *in, T *out)
+{
+    const char *bytes = PyArray_BYTES(in);
+    const npy_intp stride = PyArray_STRIDE(in, 0);
+    const npy_intp size = PyArray_DIM(in, 0);
 
+    switch (PyArray_TYPE(in)) {
+    case NPY_BYTE:
+        qwtCopyStrided<T, npy_byte>(bytes, stride, size, out);
+        return true;
+    case NPY_UBYTE:
+        qwtCopyStrided<T, npy_ubyte>(bytes, stride, size, out);
+        return true;
+    case NPY_SHORT:
+        qwtCopyStrided<T, npy_short>(bytes, stride, size, out);
+        return true;
+    case NPY_USHORT:
+        qwtCopyStrided<T, npy_ushort>(bytes, stride, size, out);
+        return true;
+    case NPY_INT:
+        qwtCopyStrided<T, npy_int>(bytes, stride, size, out);
+        return true;
+    case NPY_UINT:
+        qwtCopyStrided<T, npy_uint>(bytes, stride, size, out);
+        return true;
+    case NPY_LONG:
+        qwtCopyStrided<T, npy_long>(bytes, stride, size, out);
+        return true;
+    case NPY_ULONG:
+        qwtCopyStrided<T, npy_ulong>(bytes, stride, size, out);
+        return true;
+    case NPY_LONGLONG:
+        qwtCopyStrided<T, npy_longlong>(bytes, stride, size, out);
+        return true;
+    case NPY_ULONGLONG:
+        qwtCopyStrided<T, npy_ulonglong>(bytes, stride, size, out);
+        return true;
+    case NPY_FLOAT:
+        qwtCopyStrided<T, npy_float>(bytes, stride, size, out);
+        return true;
+    case NPY_DOUBLE:
+        qwtCopyStrided<T, npy_double>(bytes, stride, size, out);
+        return true;
+    default:
+        return false;
+    }
+}
+
+
+template <typename T>
+static int qwtNumPyArrayToQwtArray(
+    PyObject *in, QwtArray<T> &out, int type, const char *message)
+{
     if (!PyArray_Check(in))
         return 0;
 
-    PyObject *array = PyArray_ContiguousFromObject(in, PyArray_DOUBLE, 1, 0);
+    // An aligned 1-D array in native byte order of any numerical type
+    // converts in a single pass without a temporary array.
+    if (1 == PyArray_NDIM(in)
+        && PyArray_ISALIGNED(in) && PyArray_ISNOTSWAPPED(in)) {
+        out.resize(PyArray_DIM(in, 0));
+        if (qwtCopyElements<T>(in, out.data()))
+            return 1;
+    }
+
+    PyObject *array = PyArray_ContiguousFromObject(in, type, 1, 0);
 
     if (!array) {
-        PyErr_SetString(PyExc_RuntimeError,
-                        "Failed to make contiguous array of PyArray_DOUBLE");
+        PyErr_SetString(PyExc_RuntimeError, message);
         return -1;
     }
 
-    double *data = (double *) PyArray_DATA(array);
+    const T *data = (const T *) PyArray_DATA(array);
     out.resize(PyArray_DIM(array, 0));
-    for (double *it = out.begin(); it != out.end();) {
+    for (T *it = out.begin(); it != out.end();) {
         *it++ = *data++;
     }
 
@@ -70,68 +149,301 @@ int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<double> &out)
 }
 
 
+int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<double> &out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_NumPyArray_to_QwtArray()\n");
+#endif
+
+    return qwtNumPyArrayToQwtArray(
+        in, out, PyArray_DOUBLE,
+        "Failed to make contiguous array of PyArray_DOUBLE");
+}
+
+
 int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<int> &out)
 {
 #ifdef TRACE_PYQWT
     fprintf(stderr, "Qwt: try_NumPyArray_to_QwtArray()\n");
 #endif
 
-    if (!PyArray_Check(in))
+    return qwtNumPyArrayToQwtArray(
+        in, out, PyArray_INT,
+        "Failed to make contiguous array of PyArray_INT");
+}
+
+
+int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<long> &out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_NumPyArray_to_QwtArray()\n");
+#endif
+
+    return qwtNumPyArrayToQwtArray(
+        in, out, PyArray_LONG,
+        "Failed to make contiguous array of PyArray_LONG");
+}
+
+
+// returns a new image of depth 8 with a gray palette, or of depth 32
+static QImage *qwtNewImage(npy_intp nx, npy_intp ny, int depth, bool alpha)
+{
+    QImage *image;
+
+#if QT_VERSION < 0x040000
+    if (8 == depth)
+        image = new QImage(nx, ny, 8, 256);
+    else {
+        image = new QImage(nx, ny, 32);
+        image->setAlphaBuffer(alpha);
+    }
+#else
+    if (8 == depth)
+        image = new QImage(nx, ny, QImage::Format_Indexed8);
+    else
+        image = new QImage(nx, ny, alpha ? QImage::Format_ARGB32
+                                         : QImage::Format_RGB32);
+#endif
+
+    if (image->isNull()) {
+        delete image;
+        PyErr_SetString(PyExc_RuntimeError, "Failed to create a QImage");
         return 0;
+    }
 
-    PyObject *array = PyArray_ContiguousFromObject(in, PyArray_INT, 1, 0);
+    if (8 == depth) {
+        // initialize the palette as all gray
+        image->setNumColors(256);
+        for (int i = 0; i<image->numColors(); i++)
+            image->setColor(i, qRgb(i, i, i));
+    }
 
-    if (!array) {
-        PyErr_SetString(PyExc_RuntimeError,
-                        "Failed to make contiguous array of PyArray_INT");
-        return -1;
+    return image;
+}
+
+
+// copies the pixels of a 2-D array of uint8 or uint32 into image
+template <typename T>
+static void qwtCopyPixels(PyObject *array, QImage *image)
+{
+    const char *bytes = PyArray_BYTES(array);
+    const npy_intp nx = PyArray_DIM(array, 1);
+    const npy_intp stride0 = PyArray_STRIDE(array, 0);
+    const npy_intp stride1 = PyArray_STRIDE(array, 1);
+
+    for (int i = 0; i < image->height(); ++i) {
+        const char *data = bytes + i * stride0;
+        T *it = reinterpret_cast<T *>(image->scanLine(i));
+        if (stride1 == sizeof(T)) {
+            memcpy(it, data, nx * sizeof(T));
+        } else {
+            for (npy_intp j = 0; j < nx; ++j, data += stride1)
+                *it++ = *reinterpret_cast<const T *>(data);
+        }
     }
+}
 
-    int *data = (int *) PyArray_DATA(data);
-    out.resize(PyArray_DIM(array, 0));
-    for (int *it = out.begin(); it != out.end();) {
-        *it++ = *data++;
+
+// finds the minimum and maximum of a 2-D array, ignoring NaN values
+template <typename T>
+static void qwtMinMax(PyObject *array, double &min, double &max)
+{
+    const char *bytes = PyArray_BYTES(array);
+    const npy_intp ny = PyArray_DIM(array, 0);
+    const npy_intp nx = PyArray_DIM(array, 1);
+    const npy_intp stride0 = PyArray_STRIDE(array, 0);
+    const npy_intp stride1 = PyArray_STRIDE(array, 1);
+
+    bool first = true;
+    for (npy_intp i = 0; i < ny; ++i) {
+        const char *data = bytes + i * stride0;
+        for (npy_intp j = 0; j < nx; ++j, data += stride1) {
+            const double value = double(*reinterpret_cast<const T *>(data));
+            if (value != value)
+                continue;
+            if (first) {
+                min = max = value;
+                first = false;
+            } else if (value < min) {
+                min = value;
+            } else if (value > max) {
+                max = value;
+            }
+        }
     }
 
-    Py_DECREF(array);
+    if (first)
+        min = max = 0.0;
+}
 
-    return 1;
+
+// maps the values of a 2-D array from [min, max] to the palette indices
+// [0, 255] of image; NaN values map to 0.
+template <typename T>
+static void qwtScalePixels(
+    PyObject *array, QImage *image, bool autoScale, double min, double max)
+{
+    if (autoScale)
+        qwtMinMax<T>(array, min, max);
+
+    const char *bytes = PyArray_BYTES(array);
+    const npy_intp nx = PyArray_DIM(array, 1);
+    const npy_intp stride0 = PyArray_STRIDE(array, 0);
+    const npy_intp stride1 = PyArray_STRIDE(array, 1);
+    const double cnv = max > min ? 255.0 / (max - min) : 0.0;
+
+    for (int i = 0; i < image->height(); ++i) {
+        const char *data = bytes + i * stride0;
+        uchar *it = image->scanLine(i);
+        for (npy_intp j = 0; j < nx; ++j, data += stride1) {
+            const double value = double(*reinterpret_cast<const T *>(data));
+            // fails also on NaN
+            if (!(value > min))
+                *it++ = 0;
+            else if (value >= max)
+                *it++ = 255;
+            else
+                *it++ = uchar((value - min) * cnv + 0.5);
+        }
+    }
 }
 
-int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<long> &out)
+
+// packs the channels of a HxWx3 or HxWx4 array of uint8 into image
+static void qwtPackPixels(PyObject *array, QImage *image)
 {
-#ifdef TRACE_PYQWT
-    fprintf(stderr, "Qwt: try_NumPyArray_to_QwtArray()\n");
-#endif
+    const char *bytes = PyArray_BYTES(array);
+    const npy_intp nx = PyArray_DIM(array, 1);
+    const npy_intp stride0 = PyArray_STRIDE(array, 0);
+    const npy_intp stride1 = PyArray_STRIDE(array, 1);
+    const npy_intp stride2 = PyArray_STRIDE(array, 2);
+    const bool alpha = 4 == PyArray_DIM(array, 2);
 
+    for (int i = 0; i < image->height(); ++i) {
+        const char *data = bytes + i * stride0;
+        QRgb *it = reinterpret_cast<QRgb *>(image->scanLine(i));
+        for (npy_intp j = 0; j < nx; ++j, data += stride1) {
+            *it++ = qRgba(
+                uchar(data[0]), uchar(data[stride2]), uchar(data[2 * stride2]),
+                alpha ? uchar(data[3 * stride2]) : 255);
+        }
+    }
+}
+
+
+static int qwtNumPyArrayToQImage(
+    PyObject *in, QImage **out, bool autoScale, double min, double max)
+{
     if (!PyArray_Check(in))
         return 0;
 
-    PyObject *array = PyArray_ContiguousFromObject(in, PyArray_LONG, 1, 0);
+    const int type = PyArray_TYPE(in);
+    const int nd = PyArray_NDIM(in);
+    if (!((2 == nd) || (3 == nd && NPY_UINT8 == type))) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Array must be 2-dimensional, "
+                        "or 3-dimensional of type uint8");
+        return -1;
+    }
 
-    if (!array) {
+    if (3 == nd && !(3 == PyArray_DIM(in, 2) || 4 == PyArray_DIM(in, 2))) {
         PyErr_SetString(PyExc_RuntimeError,
-                        "Failed to make contiguous array of PyArray_LONG");
+                        "3-dimensional array must have 3 or 4 channels");
         return -1;
     }
 
-    long *data = (long *) PyArray_DATA(data);
-    out.resize(PyArray_DIM(array, 0));
-    for (long *it = out.begin(); it != out.end();) {
-        *it++ = *data++;
+    if (!(NPY_UINT8 == type || NPY_UINT16 == type || NPY_INT16 == type
+          || NPY_UINT32 == type || NPY_FLOAT32 == type
+          || NPY_FLOAT64 == type)) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Data type must be uint8, uint16, int16, uint32, "
+                        "float32, or float64");
+        return -1;
+    }
+
+    // returns a new reference to in itself, when it is aligned and
+    // in native byte order
+    PyObject *array = PyArray_FromAny(
+        in, PyArray_DescrFromType(type), nd, nd, NPY_ALIGNED, 0);
+    if (!array)
+        return -1;
+
+    const npy_intp ny = PyArray_DIM(array, 0);
+    const npy_intp nx = PyArray_DIM(array, 1);
+
+    if (3 == nd) {
+        *out = qwtNewImage(nx, ny, 32, 4 == PyArray_DIM(array, 2));
+        if (*out)
+            qwtPackPixels(array, *out);
+    } else if (autoScale && NPY_UINT32 == type) {
+        *out = qwtNewImage(nx, ny, 32, true);
+        if (*out)
+            qwtCopyPixels<npy_uint32>(array, *out);
+    } else if (autoScale && NPY_UINT8 == type) {
+        *out = qwtNewImage(nx, ny, 8, false);
+        if (*out)
+            qwtCopyPixels<npy_uint8>(array, *out);
+    } else {
+        *out = qwtNewImage(nx, ny, 8, false);
+        if (*out) {
+            switch (type) {
+            case NPY_UINT8:
+                qwtScalePixels<npy_uint8>(array, *out, autoScale, min, max);
+                break;
+            case NPY_UINT16:
+                qwtScalePixels<npy_uint16>(array, *out, autoScale, min, max);
+                break;
+            case NPY_INT16:
+                qwtScalePixels<npy_int16>(array, *out, autoScale, min, max);
+                break;
+            case NPY_UINT32:
+                qwtScalePixels<npy_uint32>(array, *out, autoScale, min, max);
+                break;
+            case NPY_FLOAT32:
+                qwtScalePixels<npy_float32>(array, *out, autoScale, min, max);
+                break;
+            default:
+                qwtScalePixels<npy_float64>(array, *out, autoScale, min, max);
+                break;
+            }
+        }
     }
 
     Py_DECREF(array);
 
-    return 1;
+    return *out ? 1 : -1;
 }
 
+
 int try_NumPyArray_to_QImage(PyObject *in, QImage **out)
 {
 #ifdef TRACE_PYQWT
     fprintf(stderr, "Qwt: try_NumPyArray_to_QImage()\n");
 #endif
 
+    return qwtNumPyArrayToQImage(in, out, true, 0.0, 0.0);
+}
+
+
+int try_NumPyArray_to_QImage(
+    PyObject *in, QImage **out, double min, double max)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_NumPyArray_to_QImage()\n");
+#endif
+
+    return qwtNumPyArrayToQImage(in, out, false, min, max);
+}
+
+
+#if QT_VERSION >= 0x040000
+
+int try_NumPyArray_to_SharedQImage(PyObject *in, QImage **out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_NumPyArray_to_SharedQImage()\n");
+#endif
+
     if (!PyArray_Check(in))
         return 0;
 
@@ -139,56 +451,102 @@ int try_NumPyArray_to_QImage(PyObject *in, QImage **out)
         PyErr_SetString(PyExc_RuntimeError, "Array must be 2-dimensional");
         return -1;
     }
-    
+
+    QImage::Format format;
+    npy_intp itemSize;
+    if (PyArray_TYPE(in) == NPY_UINT8) {
+        format = QImage::Format_Indexed8;
+        itemSize = 1;
+    } else if (PyArray_TYPE(in) == NPY_UINT32) {
+        format = QImage::Format_ARGB32;
+        itemSize = 4;
+    } else {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Data type must be uint8, or uint32");
+        return -1;
+    }
+
     const npy_intp ny = PyArray_DIM(in, 0);
     const npy_intp nx = PyArray_DIM(in, 1);
     const npy_intp stride = PyArray_STRIDE(in, 0);
-    
-    //  8 bit data
-    if (PyArray_TYPE(in) == NPY_UINT8) {
-#if QT_VERSION < 0x040000
-        if (!(*out = new QImage(nx, ny, 8, 256))) {
+    uchar *data = reinterpret_cast<uchar *>(PyArray_BYTES(in));
+
+    // QImage wants the pixels of a scan line next to each other and
+    // the scan lines aligned on 32 bit boundaries
+    if (PyArray_STRIDE(in, 1) != itemSize
+        || stride < nx * itemSize || 0 != stride % 4
+        || 0 != reinterpret_cast<size_t>(data) % 4
+#if QT_VERSION < 0x040400
+        || stride != nx * itemSize
+#endif
+        ) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Array must have aligned rows of contiguous "
+                        "pixels to share its buffer");
+        return -1;
+    }
+
+    if (!PyArray_ISWRITEABLE(in)) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Array must be writeable to share its buffer");
+        return -1;
+    }
+
+#if QT_VERSION < 0x040400
+    *out = new QImage(data, nx, ny, format);
 #else
-        if (!(*out = new QImage(nx, ny, QImage::Format_Indexed8))) {
+    *out = new QImage(data, nx, ny, stride, format);
 #endif
-            PyErr_SetString(PyExc_RuntimeError, "Failed to create a QImage");
-            return -1;
-        }
-        char *data = PyArray_BYTES(in);
-        for (int i=0; i<ny; i++) {
-            memcpy((*out)->scanLine(i), data, stride);
-            data += stride;
-        }
+
+    if (QImage::Format_Indexed8 == format) {
         // initialize the palette as all gray
         (*out)->setNumColors(256);
         for (int i = 0; i<(*out)->numColors(); i++)
             (*out)->setColor(i, qRgb(i, i, i));
-        return 1;
     }
 
-    // 32 bit data
-    if (PyArray_TYPE(in) == NPY_UINT32) {
-#if QT_VERSION < 0x040000
-        if (!(*out = new QImage(nx, ny, 32))) {
-#else
-        if (!(*out = new QImage(nx, ny, QImage::Format_ARGB32))) {
+    return 1;
+}
+
+
+PyObject *toNumpyView(QImage &image, PyObject *base)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: toNumpyView()\n");
 #endif
-            PyErr_SetString(PyExc_RuntimeError, "Failed to create a QImage");
-            return -1;
-        }
-        char *data = PyArray_BYTES(in);  
-        for (int i=0; i<ny; i++) {
-            memcpy((*out)->scanLine(i), data, stride);
-            data += stride;
-        }
-        return 1;
+
+    int type;
+    if (image.depth() == 8) {
+        type = NPY_UINT8;
+    } else if (image.depth() == 32) {
+        type = NPY_UINT32;
+    } else {
+        PyErr_SetString(PyExc_RuntimeError, "Image depth must be 8 or 32");
+        return 0;
     }
-    
-    PyErr_SetString(PyExc_RuntimeError, "Data type must be uint8, or uint32");
-    
-    return -1;
+
+    npy_intp dimensions[2] = {image.height(), image.width()};
+    npy_intp strides[2] = {image.bytesPerLine(), image.depth() / 8};
+
+    // bits() detaches image, so that the array views only its buffer
+    PyObject *result = PyArray_New(
+        &PyArray_Type, 2, dimensions, type, strides, image.bits(), 0,
+        NPY_ALIGNED | NPY_WRITEABLE, 0);
+    if (!result)
+        return 0;
+
+    Py_INCREF(base);
+#if NPY_API_VERSION >= 0x00000007
+    PyArray_SetBaseObject(reinterpret_cast<PyArrayObject *>(result), base);
+#else
+    PyArray_BASE(result) = base;
+#endif
+
+    return result;
 }
 
+#endif // QT_VERSION >= 0x040000
+
 
 PyObject *toNumpy(const QImage &image)
 {
@@ -223,6 +581,475 @@ PyObject *toNumpy(const QImage &image)
     return result;
 }
 
+
+// The transformation of a QwtScaleMap, with the factor and the offsets of
+// the linear and logarithmic cases hoisted out of the loops below.
+class ScaleMapTransform
+{
+public:
+    ScaleMapTransform(const QwtScaleMap &map):
+        d_map(map),
+        d_type(map.transformation()->type()),
+        d_s1(map.s1()),
+        d_p1(map.p1()),
+        d_cnv(0.0)
+    {
+        if (map.s1() != map.s2()) {
+            if (QwtScaleTransformation::Linear == d_type)
+                d_cnv = (map.p2() - map.p1()) / (map.s2() - map.s1());
+            else if (QwtScaleTransformation::Log10 == d_type)
+                d_cnv = (map.p2() - map.p1()) / log(map.s2() / map.s1());
+        }
+    }
+
+    inline double xTransform(double s) const
+    {
+        if (QwtScaleTransformation::Linear == d_type)
+            return d_p1 + (s - d_s1) * d_cnv;
+        if (QwtScaleTransformation::Log10 == d_type)
+            return d_p1 + log(s / d_s1) * d_cnv;
+        return d_map.xTransform(s);
+    }
+
+    inline double invTransform(double p) const
+    {
+        if (QwtScaleTransformation::Linear == d_type)
+            return d_s1 + (p - d_p1) / d_cnv;
+        if (QwtScaleTransformation::Log10 == d_type)
+            return d_s1 * exp((p - d_p1) / d_cnv);
+        return d_map.invTransform(p);
+    }
+
+private:
+    const QwtScaleMap &d_map;
+    const QwtScaleTransformation::Type d_type;
+    const double d_s1;
+    const double d_p1;
+    double d_cnv;
+};
+
+
+// returns a new reference to a contiguous array of doubles, or 0
+static PyObject *qwtContiguousDoubleArray(PyObject *in)
+{
+    PyObject *array = PyArray_ContiguousFromObject(in, PyArray_DOUBLE, 0, 0);
+
+    if (!array) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Failed to make contiguous array of PyArray_DOUBLE");
+        return 0;
+    }
+
+    return array;
+}
+
+
+PyObject *qwtTransformArray(const QwtScaleMap &map, PyObject *in)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: qwtTransformArray()\n");
+#endif
+
+    PyObject *array = qwtContiguousDoubleArray(in);
+    if (!array)
+        return 0;
+
+    PyObject *result = PyArray_SimpleNew(
+        PyArray_NDIM(array), PyArray_DIMS(array), NPY_INT32);
+    if (!result) {
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_MemoryError, "Failed to allocate array");
+        return 0;
+    }
+
+    const ScaleMapTransform transform(map);
+    const double *data = (const double *) PyArray_DATA(array);
+    npy_int32 *it = (npy_int32 *) PyArray_DATA(result);
+    for (npy_intp i = PyArray_SIZE(array); i > 0; --i) {
+        *it++ = qRound(transform.xTransform(*data++));
+    }
+
+    Py_DECREF(array);
+
+    return result;
+}
+
+
+PyObject *qwtXTransformArray(const QwtScaleMap &map, PyObject *in)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: qwtXTransformArray()\n");
+#endif
+
+    PyObject *array = qwtContiguousDoubleArray(in);
+    if (!array)
+        return 0;
+
+    PyObject *result = PyArray_SimpleNew(
+        PyArray_NDIM(array), PyArray_DIMS(array), NPY_DOUBLE);
+    if (!result) {
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_MemoryError, "Failed to allocate array");
+        return 0;
+    }
+
+    const ScaleMapTransform transform(map);
+    const double *data = (const double *) PyArray_DATA(array);
+    double *it = (double *) PyArray_DATA(result);
+    for (npy_intp i = PyArray_SIZE(array); i > 0; --i) {
+        *it++ = transform.xTransform(*data++);
+    }
+
+    Py_DECREF(array);
+
+    return result;
+}
+
+
+PyObject *qwtInvTransformArray(const QwtScaleMap &map, PyObject *in)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: qwtInvTransformArray()\n");
+#endif
+
+    PyObject *array = qwtContiguousDoubleArray(in);
+    if (!array)
+        return 0;
+
+    PyObject *result = PyArray_SimpleNew(
+        PyArray_NDIM(array), PyArray_DIMS(array), NPY_DOUBLE);
+    if (!result) {
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_MemoryError, "Failed to allocate array");
+        return 0;
+    }
+
+    const ScaleMapTransform transform(map);
+    const double *data = (const double *) PyArray_DATA(array);
+    double *it = (double *) PyArray_DATA(result);
+    for (npy_intp i = PyArray_SIZE(array); i > 0; --i) {
+        *it++ = transform.invTransform(*data++);
+    }
+
+    Py_DECREF(array);
+
+    return result;
+}
+
+
+// The lookup table of a QwtColorMap, filled once by colorTable() instead of
+// calling rgb() for each value.  Values outside the interval and NaN values
+// map to the bad color.
+class ColorMapTable
+{
+public:
+    ColorMapTable(const QwtColorMap &colorMap,
+                  const QwtDoubleInterval &interval, QRgb bad):
+        d_table(colorMap.colorTable(interval)),
+        d_bad(bad),
+        d_min(interval.minValue()),
+        d_max(interval.maxValue()),
+        d_valid(interval.isValid()),
+        d_round(0.5),
+        d_cnv(0.0)
+    {
+        if (d_valid && interval.width() > 0.0)
+            d_cnv = (d_table.size() - 1) / interval.width();
+
+        // QwtLinearColorMap::colorIndex() floors in FixedColors mode
+        const QwtLinearColorMap *linearColorMap =
+            dynamic_cast<const QwtLinearColorMap *>(&colorMap);
+        if (linearColorMap
+            && QwtLinearColorMap::FixedColors == linearColorMap->mode())
+            d_round = 0.0;
+    }
+
+    inline QRgb rgb(double value) const
+    {
+        // fails also on NaN
+        if (!(d_valid && value >= d_min && value <= d_max))
+            return d_bad;
+        return d_table[int((value - d_min) * d_cnv + d_round)];
+    }
+
+    void map(const double *data, QRgb *it, npy_intp size) const
+    {
+        for (npy_intp i = size; i > 0; --i) {
+            *it++ = rgb(*data++);
+        }
+    }
+
+private:
+    const QwtColorTable d_table;
+    const QRgb d_bad;
+    const double d_min;
+    const double d_max;
+    const bool d_valid;
+    double d_round;
+    double d_cnv;
+};
+
+
+PyObject *qwtMapArray(const QwtColorMap &colorMap,
+                      const QwtDoubleInterval &interval,
+                      PyObject *in, QRgb bad)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: qwtMapArray()\n");
+#endif
+
+    PyObject *array = qwtContiguousDoubleArray(in);
+    if (!array)
+        return 0;
+
+    PyObject *result = PyArray_SimpleNew(
+        PyArray_NDIM(array), PyArray_DIMS(array), NPY_UINT32);
+    if (!result) {
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_MemoryError, "Failed to allocate array");
+        return 0;
+    }
+
+    const ColorMapTable table(colorMap, interval, bad);
+    table.map((const double *) PyArray_DATA(array),
+              (QRgb *) PyArray_DATA(result), PyArray_SIZE(array));
+
+    Py_DECREF(array);
+
+    return result;
+}
+
+
+QImage *qwtMapImage(const QwtColorMap &colorMap,
+                    const QwtDoubleInterval &interval,
+                    PyObject *in, QRgb bad)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: qwtMapImage()\n");
+#endif
+
+    PyObject *array = qwtContiguousDoubleArray(in);
+    if (!array)
+        return 0;
+
+    if (2 != PyArray_NDIM(array)) {
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_RuntimeError, "Array must be 2-dimensional");
+        return 0;
+    }
+
+    const npy_intp ny = PyArray_DIM(array, 0);
+    const npy_intp nx = PyArray_DIM(array, 1);
+
+#if QT_VERSION < 0x040000
+    QImage *image = new QImage(nx, ny, 32);
+    image->setAlphaBuffer(true);
+#else
+    QImage *image = new QImage(nx, ny, QImage::Format_ARGB32);
+#endif
+    if (image->isNull()) {
+        delete image;
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_MemoryError, "Failed to create a QImage");
+        return 0;
+    }
+
+    const ColorMapTable table(colorMap, interval, bad);
+    const double *data = (const double *) PyArray_DATA(array);
+    for (npy_intp i = 0; i < ny; ++i) {
+        table.map(data, (QRgb *) image->scanLine(i), nx);
+        data += nx;
+    }
+
+    Py_DECREF(array);
+
+    return image;
+}
+
+#if QT_VERSION >= 0x040000
+
+// The columns of the points passed to toQwtPolygon() and toQPolygonF().
+class PointArrays
+{
+public:
+    PointArrays():
+        xArray(0),
+        yArray(0),
+        size(0)
+    {
+    }
+
+    ~PointArrays()
+    {
+        Py_XDECREF(xArray);
+        Py_XDECREF(yArray);
+    }
+
+    // returns false and sets a Python exception on failure
+    bool init(PyObject *x, PyObject *y)
+    {
+        if (!y) {
+            xArray = PyArray_FromAny(
+                x, PyArray_DescrFromType(NPY_DOUBLE), 2, 2, NPY_ALIGNED, 0);
+            if (!xArray) {
+                PyErr_SetString(
+                    PyExc_RuntimeError,
+                    "Failed to make a 2-D array of PyArray_DOUBLE");
+                return false;
+            }
+            if (2 != PyArray_DIM(xArray, 1)) {
+                PyErr_SetString(PyExc_RuntimeError,
+                                "Array must have 2 columns");
+                return false;
+            }
+            xBytes = PyArray_BYTES(xArray);
+            yBytes = xBytes + PyArray_STRIDE(xArray, 1);
+            xStride = yStride = PyArray_STRIDE(xArray, 0);
+            size = PyArray_DIM(xArray, 0);
+            return true;
+        }
+
+        xArray = PyArray_FromAny(
+            x, PyArray_DescrFromType(NPY_DOUBLE), 1, 1, NPY_ALIGNED, 0);
+        yArray = PyArray_FromAny(
+            y, PyArray_DescrFromType(NPY_DOUBLE), 1, 1, NPY_ALIGNED, 0);
+        if (!xArray || !yArray) {
+            PyErr_SetString(PyExc_RuntimeError,
+                            "Failed to make a 1-D array of PyArray_DOUBLE");
+            return false;
+        }
+        xBytes = PyArray_BYTES(xArray);
+        yBytes = PyArray_BYTES(yArray);
+        xStride = PyArray_STRIDE(xArray, 0);
+        yStride = PyArray_STRIDE(yArray, 0);
+        size = qwtMin(PyArray_DIM(xArray, 0), PyArray_DIM(yArray, 0));
+        return true;
+    }
+
+    inline double x(npy_intp i) const
+    {
+        return *reinterpret_cast<const double *>(xBytes + i * xStride);
+    }
+
+    inline double y(npy_intp i) const
+    {
+        return *reinterpret_cast<const double *>(yBytes + i * yStride);
+    }
+
+    PyObject *xArray;
+    PyObject *yArray;
+    const char *xBytes;
+    const char *yBytes;
+    npy_intp xStride;
+    npy_intp yStride;
+    npy_intp size;
+};
+
+
+QwtPolygon *toQwtPolygon(
+    PyObject *x, PyObject *y,
+    const QwtScaleMap *xMap, const QwtScaleMap *yMap)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: toQwtPolygon()\n");
+#endif
+
+    PointArrays points;
+    if (!points.init(x, y))
+        return 0;
+
+    QwtPolygon *polygon = new QwtPolygon(points.size);
+    QPoint *it = polygon->data();
+    if (xMap && yMap) {
+        const ScaleMapTransform xTransform(*xMap);
+        const ScaleMapTransform yTransform(*yMap);
+        for (npy_intp i = 0; i < points.size; ++i) {
+            *it++ = QPoint(qRound(xTransform.xTransform(points.x(i))),
+                           qRound(yTransform.xTransform(points.y(i))));
+        }
+    } else {
+        for (npy_intp i = 0; i < points.size; ++i) {
+            *it++ = QPoint(qRound(points.x(i)), qRound(points.y(i)));
+        }
+    }
+
+    return polygon;
+}
+
+
+QPolygonF *toQPolygonF(
+    PyObject *x, PyObject *y,
+    const QwtScaleMap *xMap, const QwtScaleMap *yMap)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: toQPolygonF()\n");
+#endif
+
+    PointArrays points;
+    if (!points.init(x, y))
+        return 0;
+
+    QPolygonF *polygon = new QPolygonF(points.size);
+    QPointF *it = polygon->data();
+    if (xMap && yMap) {
+        const ScaleMapTransform xTransform(*xMap);
+        const ScaleMapTransform yTransform(*yMap);
+        for (npy_intp i = 0; i < points.size; ++i) {
+            *it++ = QPointF(xTransform.xTransform(points.x(i)),
+                            yTransform.xTransform(points.y(i)));
+        }
+    } else {
+        for (npy_intp i = 0; i < points.size; ++i) {
+            *it++ = QPointF(points.x(i), points.y(i));
+        }
+    }
+
+    return polygon;
+}
+
+
+PyObject *toNumpyContours(const QwtRasterData::ContourLines &lines)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: toNumpyContours()\n");
+#endif
+
+    PyObject *result = PyDict_New();
+    if (!result)
+        return 0;
+
+    QwtRasterData::ContourLines::const_iterator it = lines.constBegin();
+    for (; it != lines.constEnd(); ++it) {
+        const QPolygonF &polygon = it.value();
+        npy_intp dimensions[2] = {polygon.size(), 2};
+        PyObject *array = PyArray_SimpleNew(2, dimensions, NPY_DOUBLE);
+        if (!array) {
+            Py_DECREF(result);
+            return 0;
+        }
+
+        double *data = reinterpret_cast<double *>(PyArray_DATA(array));
+        for (int i = 0; i < polygon.size(); ++i) {
+            *data++ = polygon[i].x();
+            *data++ = polygon[i].y();
+        }
+
+        PyObject *level = PyFloat_FromDouble(it.key());
+        if (!level || 0 > PyDict_SetItem(result, level, array)) {
+            Py_XDECREF(level);
+            Py_DECREF(array);
+            Py_DECREF(result);
+            return 0;
+        }
+        Py_DECREF(level);
+        Py_DECREF(array);
+    }
+
+    return result;
+}
+
+#endif // QT_VERSION >= 0x040000
+
 #endif // HAS_NUMPY
 
 // Local Variables:
@@ -36,7 +36,12 @@
 
 #include <Python.h>
 #include <qwt_array.h>
+#include <qwt_color_map.h>
+#include <qwt_double_interval.h>
 #include <qwt_numerical_interface.h>
+#include <qwt_polygon.h>
+#include <qwt_raster_data.h>
+#include <qwt_scale_map.h>
 
 // returns 1, 0, -1 in case of success, wrong PyObject type, failure
 int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<double> &out);
@@ -48,8 +53,69 @@ int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<int> &out);
 int try_NumPyArray_to_QwtArray(PyObject *in, QwtArray<long> &out);
 
 // returns 1, 0, -1 in case of success, wrong PyObject type, failure
+// A 2-D array of uint8 converts to an 8 bit gray image, and of uint32 to an
+// ARGB32 image.  A 2-D array of uint16, int16, float32, or float64 scales
+// from its minimum and maximum to an 8 bit gray image.  A HxWx3 or HxWx4
+// array of uint8 packs its RGB or RGBA channels into a 32 bit image.
 int try_NumPyArray_to_QImage(PyObject *in, QImage **out);
 
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+// A 2-D array scales from [min, max] to an 8 bit gray image.
+int try_NumPyArray_to_QImage(
+    PyObject *in, QImage **out, double min, double max);
+
+#if QT_VERSION >= 0x040000
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+// On success, out is a new QImage sharing the buffer of the uint8 or uint32
+// array in.  The caller must keep in alive as long as out and its copies.
+int try_NumPyArray_to_SharedQImage(PyObject *in, QImage **out);
+
+// Returns a new 2-D array viewing the buffer of image, which must have depth
+// 8 or 32, or 0 and sets a Python exception on failure.  The array keeps a
+// reference to base, which must own image.
+PyObject *toNumpyView(QImage &image, PyObject *base);
+#endif
+
+// QwtScaleMap::transform() on all elements of in, returning an int32 array
+PyObject *qwtTransformArray(const QwtScaleMap &map, PyObject *in);
+
+// QwtScaleMap::xTransform() on all elements of in, returning a float64 array
+PyObject *qwtXTransformArray(const QwtScaleMap &map, PyObject *in);
+
+// QwtScaleMap::invTransform() on all elements of in, returning a float64 array
+PyObject *qwtInvTransformArray(const QwtScaleMap &map, PyObject *in);
+
+// QwtColorMap::rgb() on all elements of in, returning a uint32 array.
+// The colors are looked up in colorMap.colorTable(interval) and values
+// outside the interval or NaN map to bad.
+PyObject *qwtMapArray(const QwtColorMap &colorMap,
+                      const QwtDoubleInterval &interval,
+                      PyObject *in, QRgb bad);
+
+// As qwtMapArray(), but for a 2-D array returning a new 32 bit QImage,
+// or 0 and setting a Python exception on failure.
+QImage *qwtMapImage(const QwtColorMap &colorMap,
+                    const QwtDoubleInterval &interval,
+                    PyObject *in, QRgb bad);
+
+#if QT_VERSION >= 0x040000
+// The polygon functions take the points from two 1-D arrays x and y, or from
+// an Nx2 array x when y is 0, and map them through xMap and yMap when given.
+// They return a new polygon, or 0 and set a Python exception on failure.
+QwtPolygon *toQwtPolygon(
+    PyObject *x, PyObject *y,
+    const QwtScaleMap *xMap = 0, const QwtScaleMap *yMap = 0);
+
+QPolygonF *toQPolygonF(
+    PyObject *x, PyObject *y,
+    const QwtScaleMap *xMap = 0, const QwtScaleMap *yMap = 0);
+
+// Returns a new dictionary mapping each level to an Nx2 float64 array of
+// vertices, where each pair of rows is a segment of the contour lines, or 0
+// and sets a Python exception on failure.
+PyObject *toNumpyContours(const QwtRasterData::ContourLines &lines);
+#endif
+
 #endif // HAS_NUMPY
 
 #endif // QWT_NUMPY_H
@@ -0,0 +1,374 @@
+// The code for QwtNumPyData, a QwtData sharing the buffers of NumPy arrays.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifdef HAS_NUMPY
+
+// See qwt_numpy.cpp.
+#define PY_ARRAY_UNIQUE_SYMBOL PyQwt_NumPy_API
+#define NO_IMPORT_ARRAY
+
+#include <Python.h>
+#include <numpy/arrayobject.h>
+#include <qglobal.h>
+#if QT_VERSION >= 0x040000
+#include <qmutex.h>
+#endif
+#include <qwt_math.h>
+#include <qwt_cached_array_data.h>
+#include <qwt_min_max_pyramid.h>
+#include <qwt_numpy_data.h>
+
+
+class QwtNumPyData::PrivateData
+{
+public:
+    PrivateData(PyObject *x, PyObject *y):
+        xArray(x),
+        yArray(y),
+        xBytes(PyArray_BYTES(x)),
+        yBytes(PyArray_BYTES(y)),
+        xStride(PyArray_STRIDE(x, 0)),
+        yStride(PyArray_STRIDE(y, 0)),
+        size(qwtMin(PyArray_DIM(x, 0), PyArray_DIM(y, 0))),
+        ref(1),
+        rectValid(false),
+        levelOfDetail(true),
+        pyramid(0),
+        increasing(-1)
+#if QT_VERSION >= 0x040000
+        , mutex(QMutex::Recursive)
+#endif
+    {
+        Py_INCREF(xArray);
+        Py_INCREF(yArray);
+    }
+
+    // must be called with the GIL held
+    ~PrivateData()
+    {
+        delete pyramid;
+        Py_DECREF(xArray);
+        Py_DECREF(yArray);
+    }
+
+    void lock()
+    {
+#if QT_VERSION >= 0x040000
+        mutex.lock();
+#endif
+    }
+
+    void unlock()
+    {
+#if QT_VERSION >= 0x040000
+        mutex.unlock();
+#endif
+    }
+
+    // must be called with the lock held
+    const QwtMinMaxPyramid *lazyPyramid()
+    {
+        if (!levelOfDetail)
+            return 0;
+
+        if (!pyramid && isIncreasing())
+            pyramid = new QwtMinMaxPyramid(yBytes, yStride, int(size));
+
+        return pyramid;
+    }
+
+    bool isIncreasing()
+    {
+        if (-1 == increasing) {
+            increasing = 1;
+            for (size_t i = 1; i < size; ++i) {
+                // fails also on NaN
+                if (!(x(i - 1) <= x(i))) {
+                    increasing = 0;
+                    break;
+                }
+            }
+        }
+
+        return 1 == increasing;
+    }
+
+    inline double x(size_t i) const
+    {
+        return *reinterpret_cast<const double *>(xBytes + i * xStride);
+    }
+
+    PyObject *xArray;
+    PyObject *yArray;
+    const char *xBytes;
+    const char *yBytes;
+    npy_intp xStride;
+    npy_intp yStride;
+    size_t size;
+    // shared by all copies and protected by the GIL
+    int ref;
+    // the cached bounding rectangle, shared by all copies
+    bool rectValid;
+    QwtDoubleRect rect;
+    // the level of detail data, shared by all copies
+    bool levelOfDetail;
+    QwtMinMaxPyramid *pyramid;
+    int increasing;
+#if QT_VERSION >= 0x040000
+    // guards the cached bounding rectangle and the level of detail data,
+    // which are read by curves drawn without the GIL
+    QMutex mutex;
+#endif
+};
+
+
+QwtNumPyData::QwtNumPyData(PyObject *x, PyObject *y):
+    QwtData()
+{
+    d_data = new PrivateData(x, y);
+}
+
+
+QwtNumPyData::QwtNumPyData(PrivateData *data):
+    QwtData(),
+    d_data(data)
+{
+}
+
+
+QwtNumPyData::~QwtNumPyData()
+{
+    // Qt may delete the last copy after Python has been finalized
+    if (!Py_IsInitialized())
+        return;
+
+    PyGILState_STATE state = PyGILState_Ensure();
+    if (0 == --d_data->ref)
+        delete d_data;
+    PyGILState_Release(state);
+}
+
+
+QwtData *QwtNumPyData::copy() const
+{
+    PyGILState_STATE state = PyGILState_Ensure();
+    ++d_data->ref;
+    PyGILState_Release(state);
+
+    return new QwtNumPyData(d_data);
+}
+
+
+size_t QwtNumPyData::size() const
+{
+    return d_data->size;
+}
+
+
+double QwtNumPyData::x(size_t i) const
+{
+    return d_data->x(i);
+}
+
+
+double QwtNumPyData::y(size_t i) const
+{
+    return *reinterpret_cast<const double *>(
+        d_data->yBytes + i * d_data->yStride);
+}
+
+
+QwtDoubleRect QwtNumPyData::boundingRect() const
+{
+    d_data->lock();
+    if (!d_data->rectValid) {
+        d_data->rect = qwtBoundingRect(d_data->xBytes, d_data->xStride,
+                                       d_data->yBytes, d_data->yStride,
+                                       d_data->size);
+        d_data->rectValid = true;
+    }
+    const QwtDoubleRect rect = d_data->rect;
+    d_data->unlock();
+
+    return rect;
+}
+
+
+PyObject *QwtNumPyData::xData() const
+{
+    Py_INCREF(d_data->xArray);
+    return d_data->xArray;
+}
+
+
+PyObject *QwtNumPyData::yData() const
+{
+    Py_INCREF(d_data->yArray);
+    return d_data->yArray;
+}
+
+
+void QwtNumPyData::setLevelOfDetail(bool on)
+{
+    d_data->lock();
+    d_data->levelOfDetail = on;
+    d_data->unlock();
+    if (!on)
+        invalidate();
+}
+
+
+bool QwtNumPyData::levelOfDetail() const
+{
+    return d_data->levelOfDetail;
+}
+
+
+QwtNumPyData::PyramidLocker::PyramidLocker(const QwtNumPyData *data):
+    d_data(data ? data->d_data : 0)
+{
+    if (d_data)
+        d_data->lock();
+}
+
+
+QwtNumPyData::PyramidLocker::~PyramidLocker()
+{
+    if (d_data)
+        d_data->unlock();
+}
+
+
+const QwtMinMaxPyramid *QwtNumPyData::PyramidLocker::pyramid() const
+{
+    return d_data ? d_data->lazyPyramid() : 0;
+}
+
+
+// waits for curves drawing with the pyramid on other threads
+void QwtNumPyData::invalidate()
+{
+    d_data->lock();
+    d_data->rectValid = false;
+    delete d_data->pyramid;
+    d_data->pyramid = 0;
+    d_data->increasing = -1;
+    d_data->unlock();
+}
+
+
+bool QwtNumPyData::isWriteable() const
+{
+    return PyArray_ISWRITEABLE(d_data->xArray)
+        && PyArray_ISWRITEABLE(d_data->yArray);
+}
+
+
+bool QwtNumPyData::update(
+    size_t start, const double *x, const double *y, size_t size)
+{
+    if (start > d_data->size || size > d_data->size - start
+        || !isWriteable())
+        return false;
+
+    char *xBytes = PyArray_BYTES(d_data->xArray) + start * d_data->xStride;
+    char *yBytes = PyArray_BYTES(d_data->yArray) + start * d_data->yStride;
+    for (size_t i = 0; i < size; ++i) {
+        *reinterpret_cast<double *>(xBytes) = *x++;
+        *reinterpret_cast<double *>(yBytes) = *y++;
+        xBytes += d_data->xStride;
+        yBytes += d_data->yStride;
+    }
+
+    invalidate();
+
+    return true;
+}
+
+
+int try_NumPyArray_to_DoubleArray(PyObject *in, PyObject **out, int nd)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_NumPyArray_to_DoubleArray()\n");
+#endif
+
+    if (!PyArray_Check(in))
+        return 0;
+
+    // returns a new reference to in itself, when in is already an aligned
+    // array of doubles in native byte order: this keeps the strides.
+    *out = PyArray_FromAny(
+        in, PyArray_DescrFromType(NPY_DOUBLE), nd, nd, NPY_ALIGNED, 0);
+
+    if (!*out) {
+        PyErr_Format(PyExc_RuntimeError,
+                     "Failed to make a %d-D array of PyArray_DOUBLE", nd);
+        return -1;
+    }
+
+    return 1;
+}
+
+
+int try_NumPyArray_to_QwtNumPyData(
+    PyObject *x, PyObject *y, QwtNumPyData **out)
+{
+#ifdef TRACE_PYQWT
+    fprintf(stderr, "Qwt: try_NumPyArray_to_QwtNumPyData()\n");
+#endif
+
+    if (!PyArray_Check(x) || !PyArray_Check(y))
+        return 0;
+
+    PyObject *xArray = 0;
+    if (-1 == try_NumPyArray_to_DoubleArray(x, &xArray))
+        return -1;
+
+    PyObject *yArray = 0;
+    if (-1 == try_NumPyArray_to_DoubleArray(y, &yArray)) {
+        Py_DECREF(xArray);
+        return -1;
+    }
+
+    *out = new QwtNumPyData(xArray, yArray);
+
+    Py_DECREF(xArray);
+    Py_DECREF(yArray);
+
+    return 1;
+}
+
+#endif // HAS_NUMPY
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
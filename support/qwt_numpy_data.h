@@ -0,0 +1,136 @@
+// The header for QwtNumPyData, a QwtData sharing the buffers of NumPy arrays.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_NUMPY_DATA_H
+#define QWT_NUMPY_DATA_H
+
+#ifdef HAS_NUMPY
+
+#include <Python.h>
+#include <qwt_data.h>
+
+class QwtMinMaxPyramid;
+
+// QwtNumPyData reads the samples straight from the buffers of two
+// 1-D NumPy arrays of type double, honouring their strides.
+//
+// The arrays are shared and not copied: copy() returns an object which
+// refers to the same arrays, so that QwtPlotCurve::setData(const QwtData &)
+// does not duplicate the samples.  All reference counting happens with
+// the GIL held, so that the data may be copied or deleted from any thread.
+//
+// The bounding rectangle is computed once, ignoring NaN values, and shared
+// by all copies.  When the x-values are increasing, the data builds a
+// QwtMinMaxPyramid of the y-values on the first call of pyramid(), which is
+// shared by all copies as well.
+// invalidate() must be called after changing the values of the arrays,
+// except by update().
+//
+// The cached bounding rectangle and pyramid are guarded by a mutex, since
+// the curve may be drawn without the GIL while a Python thread invalidates
+// the data: a PyramidLocker keeps the pyramid alive while it is in scope.
+class QwtNumPyData: public QwtData
+{
+    class PrivateData;
+
+public:
+    // x and y must be aligned 1-D arrays of type double
+    QwtNumPyData(PyObject *x, PyObject *y);
+    virtual ~QwtNumPyData();
+
+    virtual QwtData *copy() const;
+
+    virtual size_t size() const;
+    virtual double x(size_t i) const;
+    virtual double y(size_t i) const;
+    virtual QwtDoubleRect boundingRect() const;
+
+    // return new references to the arrays
+    PyObject *xData() const;
+    PyObject *yData() const;
+
+    void setLevelOfDetail(bool on);
+    bool levelOfDetail() const;
+
+    // PyramidLocker locks the caches of data, so that invalidate() and
+    // update() on other threads wait, until the locker goes out of scope.
+    // A locker of a null pointer does nothing.
+    class PyramidLocker
+    {
+    public:
+        explicit PyramidLocker(const QwtNumPyData *data);
+        ~PyramidLocker();
+
+        // returns 0, when the level of detail is off or x is not increasing
+        const QwtMinMaxPyramid *pyramid() const;
+
+    private:
+        PyramidLocker(const PyramidLocker &);
+        PyramidLocker &operator=(const PyramidLocker &);
+
+        PrivateData *d_data;
+    };
+
+    void invalidate();
+
+    // returns true, when the values of both arrays may be changed
+    bool isWriteable() const;
+
+    // Overwrites the samples from start to start + size in the arrays with
+    // x and y and invalidates the data.  Returns false, when the samples
+    // do not fit into the data or the arrays are read-only.
+    bool update(size_t start, const double *x, const double *y, size_t size);
+
+private:
+    QwtNumPyData(PrivateData *data);
+    QwtNumPyData(const QwtNumPyData &);
+    QwtNumPyData &operator=(const QwtNumPyData &);
+
+    PrivateData *d_data;
+};
+
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+// On success, out is a new reference to an aligned nd-D array of type double
+// which shares the buffer of in, unless in must be cast to double.
+int try_NumPyArray_to_DoubleArray(PyObject *in, PyObject **out, int nd = 1);
+
+// returns 1, 0, -1 in case of success, wrong PyObject type, failure
+int try_NumPyArray_to_QwtNumPyData(
+    PyObject *x, PyObject *y, QwtNumPyData **out);
+
+#endif // HAS_NUMPY
+
+#endif // QWT_NUMPY_DATA_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
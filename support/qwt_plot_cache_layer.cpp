@@ -0,0 +1,320 @@
+// The code for QwtPlotCacheLayer, a QwtPlotItem caching static items.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <qalgorithms.h>
+#include <qimage.h>
+#include <qpainter.h>
+#include <qvector.h>
+#include <qwt_plot.h>
+#include <qwt_plot_canvas.h>
+#include <qwt_scale_div.h>
+#include <qwt_scale_map.h>
+#include <qwt_plot_cache_layer.h>
+
+
+static bool qwtLessZ(const QwtPlotItem *item1, const QwtPlotItem *item2)
+{
+    return item1->z() < item2->z();
+}
+
+
+// the scale maps of all axes, which determine the picture of the items
+static QVector<double> qwtScaleKey(const QwtPlot *plot)
+{
+    QVector<double> key;
+    for (int axis = 0; axis < QwtPlot::axisCnt; ++axis) {
+        const QwtScaleMap map = plot->canvasMap(axis);
+        key << map.s1() << map.s2() << map.p1() << map.p2();
+    }
+
+    return key;
+}
+
+
+// the hidden plot holding the items of a layer, which forwards the
+// itemChanged() of the items to the layer by its automatic replot
+class QwtCacheLayerPlot: public QwtPlot
+{
+public:
+    QwtCacheLayerPlot(QwtPlotCacheLayer *layer):
+        QwtPlot(),
+        d_layer(layer)
+    {
+        // the layer owns the items
+        setAutoDelete(false);
+        setAutoReplot(true);
+    }
+
+    virtual void replot()
+    {
+        d_layer->itemChanged();
+    }
+
+private:
+    QwtPlotCacheLayer *d_layer;
+};
+
+
+class QwtPlotCacheLayer::PrivateData
+{
+public:
+    PrivateData():
+        plot(0),
+        valid(false),
+        renders(0)
+    {
+    }
+
+    // created by the first addItem(), since a plot requires a QApplication
+    QwtCacheLayerPlot *plot;
+    QList<QwtPlotItem *> items;
+    // the cache is mutable, because it is rendered by draw()
+    QImage image;
+    QRect rect;
+    QVector<double> key;
+    QwtScaleDiv scaleDivs[QwtPlot::axisCnt];
+    bool valid;
+    int renders;
+};
+
+
+QwtPlotCacheLayer::QwtPlotCacheLayer():
+    QwtPlotItem()
+{
+    init();
+}
+
+
+QwtPlotCacheLayer::QwtPlotCacheLayer(const QwtText &title):
+    QwtPlotItem(title)
+{
+    init();
+}
+
+
+QwtPlotCacheLayer::~QwtPlotCacheLayer()
+{
+    qDeleteAll(d_data->items);
+    delete d_data->plot;
+    delete d_data;
+}
+
+
+void QwtPlotCacheLayer::init()
+{
+    d_data = new PrivateData;
+
+    // the layer autoscales for its items and has no legend entry
+    setItemAttribute(QwtPlotItem::AutoScale, true);
+    setItemAttribute(QwtPlotItem::Legend, false);
+}
+
+
+void QwtPlotCacheLayer::addItem(QwtPlotItem *item)
+{
+    if (!item || item == this || d_data->items.contains(item))
+        return;
+
+    if (!d_data->plot)
+        d_data->plot = new QwtCacheLayerPlot(this);
+
+    d_data->items.append(item);
+    item->attach(d_data->plot);
+
+    if (plot())
+        item->updateScaleDiv(*plot()->axisScaleDiv(item->xAxis()),
+                             *plot()->axisScaleDiv(item->yAxis()));
+
+    itemChanged();
+}
+
+
+bool QwtPlotCacheLayer::removeItem(QwtPlotItem *item)
+{
+    if (!d_data->items.removeAll(item))
+        return false;
+
+    item->detach();
+    itemChanged();
+
+    return true;
+}
+
+
+QList<QwtPlotItem *> QwtPlotCacheLayer::items() const
+{
+    return d_data->items;
+}
+
+
+void QwtPlotCacheLayer::invalidate()
+{
+    d_data->valid = false;
+}
+
+
+bool QwtPlotCacheLayer::isValid() const
+{
+    return d_data->valid;
+}
+
+
+int QwtPlotCacheLayer::renders() const
+{
+    return d_data->renders;
+}
+
+
+void QwtPlotCacheLayer::itemChanged()
+{
+    invalidate();
+    QwtPlotItem::itemChanged();
+}
+
+
+void QwtPlotCacheLayer::draw(
+    QPainter *painter,
+    const QwtScaleMap &, const QwtScaleMap &,
+    const QRect &canvasRect) const
+{
+    const QwtPlot *plot = this->plot();
+    if (!plot || canvasRect.isEmpty())
+        return;
+
+    // print the items with the maps of the printer
+    const QwtPlotCanvas *canvas = plot->canvas();
+    const QPaintDevice *device = painter->device();
+    if (device != canvas && device != canvas->paintCache()) {
+        drawItems(painter, canvasRect);
+        return;
+    }
+
+    const QVector<double> key = qwtScaleKey(plot);
+    if (!d_data->valid || canvasRect != d_data->rect || key != d_data->key) {
+        d_data->image = QImage(
+            canvasRect.size(), QImage::Format_ARGB32_Premultiplied);
+        d_data->image.fill(0);
+
+        QPainter imagePainter(&d_data->image);
+        imagePainter.translate(-canvasRect.x(), -canvasRect.y());
+        drawItems(&imagePainter, canvasRect);
+        imagePainter.end();
+
+        d_data->rect = canvasRect;
+        d_data->key = key;
+        d_data->valid = true;
+        ++d_data->renders;
+    }
+
+    painter->drawImage(canvasRect.topLeft(), d_data->image);
+}
+
+
+void QwtPlotCacheLayer::drawItems(
+    QPainter *painter, const QRect &canvasRect) const
+{
+    const QwtPlot *plot = this->plot();
+
+    QList<QwtPlotItem *> items = d_data->items;
+    qStableSort(items.begin(), items.end(), qwtLessZ);
+
+    for (int i = 0; i < items.size(); ++i) {
+        const QwtPlotItem *item = items[i];
+        if (!item->isVisible())
+            continue;
+
+        painter->save();
+        painter->setRenderHint(
+            QPainter::Antialiasing,
+            item->testRenderHint(QwtPlotItem::RenderAntialiased));
+        item->draw(painter,
+                   plot->canvasMap(item->xAxis()),
+                   plot->canvasMap(item->yAxis()),
+                   canvasRect);
+        painter->restore();
+    }
+}
+
+
+QwtDoubleRect QwtPlotCacheLayer::boundingRect() const
+{
+    QwtDoubleRect rect(1.0, 1.0, -2.0, -2.0); // invalid
+    for (int i = 0; i < d_data->items.size(); ++i) {
+        // QwtPlot::updateAxes() scales the axes of the layer only
+        const QwtPlotItem *item = d_data->items[i];
+        if (!item->testItemAttribute(QwtPlotItem::AutoScale)
+            || item->xAxis() != xAxis() || item->yAxis() != yAxis())
+            continue;
+
+        const QwtDoubleRect itemRect = item->boundingRect();
+        if (!itemRect.isValid())
+            continue;
+
+        rect = rect.isValid() ? rect.unite(itemRect) : itemRect;
+    }
+
+    return rect;
+}
+
+
+void QwtPlotCacheLayer::updateScaleDiv(
+    const QwtScaleDiv &, const QwtScaleDiv &)
+{
+    const QwtPlot *plot = this->plot();
+    if (!plot)
+        return;
+
+    // QwtPlot::replot() updates the scale divisions of all items
+    for (int axis = 0; axis < QwtPlot::axisCnt; ++axis) {
+        const QwtScaleDiv &scaleDiv = *plot->axisScaleDiv(axis);
+        if (scaleDiv != d_data->scaleDivs[axis]) {
+            d_data->scaleDivs[axis] = scaleDiv;
+            invalidate();
+        }
+    }
+
+    for (int i = 0; i < d_data->items.size(); ++i) {
+        QwtPlotItem *item = d_data->items[i];
+        item->updateScaleDiv(*plot->axisScaleDiv(item->xAxis()),
+                             *plot->axisScaleDiv(item->yAxis()));
+    }
+}
+
+#endif // QT_VERSION >= 0x040000
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
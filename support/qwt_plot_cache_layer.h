@@ -0,0 +1,107 @@
+// The header for QwtPlotCacheLayer, a QwtPlotItem caching static items.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_PLOT_CACHE_LAYER_H
+#define QWT_PLOT_CACHE_LAYER_H
+
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <qlist.h>
+#include <qwt_plot_item.h>
+
+// QwtPlotCacheLayer draws a group of static items from an image, which is
+// rendered once and reused by every replot until the layer is invalidated.
+// The live items stay attached to the plot and are drawn on top of the
+// layer, when their z is larger than the z of the layer.
+//
+// The layer owns its items, which are attached to a hidden plot of the
+// layer: it draws them with the canvas maps of their own axes and calls
+// updateScaleDiv() on them.  The layer renders its items again, when the
+// canvas or the scale of an axis changed, after invalidate(), or after
+// itemChanged() on the layer or on one of its items, which reaches the
+// layer through the automatic replot of the hidden plot.  The items must
+// not be attached to another plot.
+//
+// The image is only used when drawing on the canvas or on its paint cache,
+// so that printing renders the items with the maps of the printer.
+//
+// The layer autoscales the axes it is attached to with the bounding
+// rectangles of its autoscaled items on those axes, and has no legend item.
+class QwtPlotCacheLayer: public QwtPlotItem
+{
+public:
+    explicit QwtPlotCacheLayer();
+    explicit QwtPlotCacheLayer(const QwtText &title);
+    virtual ~QwtPlotCacheLayer();
+
+    // takes ownership of item and attaches it to the hidden plot
+    void addItem(QwtPlotItem *item);
+    // releases the ownership of item and detaches it
+    bool removeItem(QwtPlotItem *item);
+    QList<QwtPlotItem *> items() const;
+
+    void invalidate();
+    bool isValid() const;
+
+    // the number of times the items have been rendered into the image
+    int renders() const;
+
+    virtual void itemChanged();
+
+    virtual void draw(QPainter *painter,
+                      const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                      const QRect &canvasRect) const;
+
+    virtual QwtDoubleRect boundingRect() const;
+
+    virtual void updateScaleDiv(const QwtScaleDiv &xDiv,
+                                const QwtScaleDiv &yDiv);
+
+protected:
+    void drawItems(QPainter *painter, const QRect &canvasRect) const;
+
+private:
+    void init();
+
+    class PrivateData;
+    PrivateData *d_data;
+};
+
+#endif // QT_VERSION >= 0x040000
+
+#endif // QWT_PLOT_CACHE_LAYER_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,1063 @@
+// The code for QwtPlotCachedSpectrogram, caching its contour lines.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <string.h>
+#include <qcache.h>
+#include <qcoreapplication.h>
+#include <qevent.h>
+#include <qimage.h>
+#include <qlist.h>
+#include <qmutex.h>
+#include <qobject.h>
+#include <qpainter.h>
+#include <qthread.h>
+#include <qvector.h>
+#include <qwt_color_map.h>
+#include <qwt_plot.h>
+#include <qwt_plot_canvas.h>
+#include <qwt_scale_map.h>
+#include <qwt_plot_cached_spectrogram.h>
+
+
+// the state shared by the threads rendering the strips of an image
+class QwtRenderJob
+{
+public:
+    QwtRenderJob(const QwtRasterData &data, const QwtColorMap &colorMap,
+                 const QwtDoubleInterval &range,
+                 const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                 const QRect &rect, QImage &image,
+                 const volatile bool *cancel):
+        data(data),
+        colorMap(colorMap),
+        range(range),
+        yMap(yMap),
+        rect(rect),
+        rgb(colorMap.format() == QwtColorMap::RGB),
+        bits(image.bits()),
+        bytesPerLine(image.bytesPerLine()),
+        cancel(cancel),
+        xs(rect.width())
+    {
+        for (int i = 0; i < rect.width(); ++i)
+            xs[i] = xMap.invTransform(rect.left() + i);
+    }
+
+    // renders the rows from top to bottom of rect until *cancel is true
+    void render(int top, int bottom) const
+    {
+        const double *tx = xs.constData();
+        const int width = xs.size();
+
+        for (int y = top; y <= bottom; ++y) {
+            if (cancel && *cancel)
+                return;
+
+            const double ty = yMap.invTransform(y);
+            uchar *line = bits + (y - rect.top()) * bytesPerLine;
+            if (rgb) {
+                QRgb *pixel = reinterpret_cast<QRgb *>(line);
+                for (int i = 0; i < width; ++i)
+                    *pixel++ = colorMap.rgb(range, data.value(tx[i], ty));
+            } else {
+                for (int i = 0; i < width; ++i)
+                    *line++ = colorMap.colorIndex(
+                        range, data.value(tx[i], ty));
+            }
+        }
+    }
+
+    const QwtRasterData &data;
+    const QwtColorMap &colorMap;
+    const QwtDoubleInterval range;
+    const QwtScaleMap yMap;
+    const QRect rect;
+    const bool rgb;
+    uchar *bits;
+    const int bytesPerLine;
+    const volatile bool *cancel;
+    QVector<double> xs;
+};
+
+
+// the rows from top to bottom of the image of a job
+class QwtRenderPiece
+{
+public:
+    QwtRenderPiece(const QwtRenderJob *job = 0, int top = 0, int bottom = -1):
+        job(job),
+        top(top),
+        bottom(bottom)
+    {
+    }
+
+    const QwtRenderJob *job;
+    int top;
+    int bottom;
+};
+
+
+// renders the pieces from first on in steps of step
+static void qwtRenderPieces(
+    const QVector<QwtRenderPiece> &pieces, int first, int step)
+{
+    for (int i = first; i < pieces.size(); i += step)
+        pieces[i].job->render(pieces[i].top, pieces[i].bottom);
+}
+
+
+class QwtRenderThread: public QThread
+{
+public:
+    QwtRenderThread(const QVector<QwtRenderPiece> &pieces,
+                    int first, int step):
+        d_pieces(pieces),
+        d_first(first),
+        d_step(step)
+    {
+    }
+
+protected:
+    virtual void run()
+    {
+        qwtRenderPieces(d_pieces, d_first, d_step);
+    }
+
+private:
+    const QVector<QwtRenderPiece> &d_pieces;
+    const int d_first;
+    const int d_step;
+};
+
+
+// renders the pieces on threads threads, of which the calling thread is one
+static void qwtRenderPieces(
+    const QVector<QwtRenderPiece> &pieces, int threads)
+{
+    const int step = qMax(1, qMin(threads, pieces.size()));
+    QList<QwtRenderThread *> workers;
+    for (int i = 1; i < step; ++i) {
+        QwtRenderThread *worker = new QwtRenderThread(pieces, i, step);
+        worker->start();
+        workers.append(worker);
+    }
+
+    qwtRenderPieces(pieces, 0, step);
+
+    for (int i = 0; i < workers.size(); ++i) {
+        workers[i]->wait();
+        delete workers[i];
+    }
+}
+
+
+// renders rect of xMap and yMap into image, which has the size of rect,
+// in horizontal strips on threads threads until *cancel is true
+static void qwtRenderRaster(
+    const QwtRasterData &data, const QwtColorMap &colorMap,
+    const QwtDoubleInterval &range,
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    const QRect &rect, QImage &image, int threads,
+    const volatile bool *cancel = 0)
+{
+    const QwtRenderJob job(
+        data, colorMap, range, xMap, yMap, rect, image, cancel);
+
+    const int rows = rect.height();
+    const int strips = qMax(1, qMin(threads, rows));
+    QVector<QwtRenderPiece> pieces;
+    for (int i = 0; i < strips; ++i)
+        pieces.append(QwtRenderPiece(
+                          &job,
+                          rect.top() + i * rows / strips,
+                          rect.top() + (i + 1) * rows / strips - 1));
+
+    qwtRenderPieces(pieces, strips);
+}
+
+
+// renders area, which transforms to rect, into an image as
+// QwtPlotSpectrogram::renderImage(), but reducing the number of pixels in
+// each direction by fraction, on threads threads, and until *cancel is true
+static QImage qwtRenderImage(
+    QwtRasterData &data, const QwtColorMap &colorMap,
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    const QwtDoubleRect &area, QRect rect, int threads,
+    double fraction = 1.0, const volatile bool *cancel = 0)
+{
+    QwtScaleMap xxMap = xMap;
+    QwtScaleMap yyMap = yMap;
+
+    const QSize res = data.rasterHint(area);
+    if (res.isValid() || fraction < 1.0) {
+        QSize size = rect.size();
+        if (res.isValid())
+            size = size.boundedTo(res);
+        if (fraction < 1.0)
+            size = QSize(qMax(1, qRound(size.width() * fraction)),
+                         qMax(1, qRound(size.height() * fraction)));
+        rect.setSize(size);
+
+        int px1 = rect.x();
+        int px2 = rect.x() + rect.width();
+        if (xMap.p1() > xMap.p2())
+            qSwap(px1, px2);
+
+        double sx1 = area.x();
+        double sx2 = area.x() + area.width();
+        if (xMap.s1() > xMap.s2())
+            qSwap(sx1, sx2);
+
+        int py1 = rect.y();
+        int py2 = rect.y() + rect.height();
+        if (yMap.p1() > yMap.p2())
+            qSwap(py1, py2);
+
+        double sy1 = area.y();
+        double sy2 = area.y() + area.height();
+        if (yMap.s1() > yMap.s2())
+            qSwap(sy1, sy2);
+
+        xxMap.setPaintInterval(px1, px2);
+        xxMap.setScaleInterval(sx1, sx2);
+        yyMap.setPaintInterval(py1, py2);
+        yyMap.setScaleInterval(sy1, sy2);
+    }
+
+    QImage image(rect.size(), colorMap.format() == QwtColorMap::RGB
+                 ? QImage::Format_ARGB32 : QImage::Format_Indexed8);
+
+    const QwtDoubleInterval range = data.range();
+    if (!range.isValid() || rect.isEmpty())
+        return image;
+
+    if (colorMap.format() == QwtColorMap::Indexed)
+        image.setColorTable(colorMap.colorTable(range));
+
+    data.initRaster(area, rect.size());
+    qwtRenderRaster(data, colorMap, range, xxMap, yyMap, rect, image,
+                    threads, cancel);
+    data.discardRaster();
+
+    // mirror the image in case of inverted maps
+    const bool hInvert = xxMap.p1() > xxMap.p2();
+    const bool vInvert = yyMap.p1() < yyMap.p2();
+    if (hInvert || vInvert)
+        image = image.mirrored(hInvert, vInvert);
+
+    return image;
+}
+
+
+// the object deleting the cancelled refinements, see qwtCancelThread()
+static QObject *qwtRefineReaper = 0;
+
+
+// renders the full image in the background with copies of the data and
+// of the color map
+class QwtRefineThread: public QThread
+{
+public:
+    QwtRefineThread(QwtRasterData *data, QwtColorMap *colorMap,
+                    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                    const QwtDoubleRect &area, const QRect &rect,
+                    int threads):
+        d_rasterData(data),
+        d_colorMap(colorMap),
+        d_xMap(xMap),
+        d_yMap(yMap),
+        d_area(area),
+        d_rect(rect),
+        d_threads(threads),
+        d_cancel(false),
+        d_done(false),
+        d_returned(false)
+    {
+    }
+
+    virtual ~QwtRefineThread()
+    {
+        delete d_rasterData;
+        delete d_colorMap;
+    }
+
+    void cancel()
+    {
+        d_cancel = true;
+    }
+
+    bool isDone() const
+    {
+        return d_done;
+    }
+
+    // returns true, when run() does not touch the data anymore
+    bool hasReturned() const
+    {
+        return d_returned;
+    }
+
+    QImage image() const
+    {
+        return d_image;
+    }
+
+protected:
+    virtual void run()
+    {
+        d_image = qwtRenderImage(*d_rasterData, *d_colorMap, d_xMap, d_yMap,
+                                 d_area, d_rect, d_threads, 1.0, &d_cancel);
+        d_done = !d_cancel;
+
+        // qwtCancelThread() tests d_returned after setting d_cancel
+        d_returned = true;
+        if (d_cancel && qwtRefineReaper)
+            QCoreApplication::postEvent(
+                qwtRefineReaper, new QEvent(QEvent::User));
+    }
+
+private:
+    QwtRasterData *d_rasterData;
+    QwtColorMap *d_colorMap;
+    const QwtScaleMap d_xMap;
+    const QwtScaleMap d_yMap;
+    const QwtDoubleRect d_area;
+    const QRect d_rect;
+    const int d_threads;
+    volatile bool d_cancel;
+    volatile bool d_done;
+    volatile bool d_returned;
+    QImage d_image;
+};
+
+
+// the cancelled refinements, which are deleted when they have returned
+// from run(), so that nobody waits for them with the GIL held
+static QMutex qwtCancelledMutex;
+static QList<QwtRefineThread *> qwtCancelledThreads;
+
+
+// deletes the cancelled refinements, which have returned or all of them
+static void qwtDeleteCancelledThreads(bool all = false)
+{
+    QMutexLocker locker(&qwtCancelledMutex);
+    for (int i = qwtCancelledThreads.size() - 1; i >= 0; --i) {
+        QwtRefineThread *thread = qwtCancelledThreads[i];
+        if (all || thread->hasReturned()) {
+            thread->wait();
+            delete thread;
+            qwtCancelledThreads.removeAt(i);
+        }
+    }
+}
+
+
+// called by ~QCoreApplication for the refinements still running, which
+// have been cancelled and do not call Python
+static void qwtDeleteAllCancelledThreads()
+{
+    qwtDeleteCancelledThreads(true);
+    delete qwtRefineReaper;
+    qwtRefineReaper = 0;
+}
+
+
+// receives the events posted by the cancelled refinements in the main
+// thread, when they return from run()
+class QwtRefineReaper: public QObject
+{
+public:
+    virtual bool event(QEvent *event)
+    {
+        if (event->type() != QEvent::User)
+            return QObject::event(event);
+
+        qwtDeleteCancelledThreads();
+        return true;
+    }
+};
+
+
+// cancels thread and deletes it now, when it has returned, or by the event
+// it posts to the reaper, when it returns
+static void qwtCancelThread(QwtRefineThread *thread)
+{
+    if (!qwtRefineReaper && QCoreApplication::instance()) {
+        qwtRefineReaper = new QwtRefineReaper;
+        qAddPostRoutine(qwtDeleteAllCancelledThreads);
+    }
+
+    QObject::disconnect(thread, 0, 0, 0);
+    thread->cancel();
+    {
+        QMutexLocker locker(&qwtCancelledMutex);
+        qwtCancelledThreads.append(thread);
+    }
+    qwtDeleteCancelledThreads();
+}
+
+
+static bool qwtSameMap(const QwtScaleMap &map1, const QwtScaleMap &map2)
+{
+    return map1.s1() == map2.s1() && map1.s2() == map2.s2()
+        && map1.p1() == map2.p1() && map1.p2() == map2.p2();
+}
+
+
+// the width and height of a tile in pixels
+static const int qwtTileSize = 256;
+
+
+// the number of scale levels keeping tiles in the cache
+static const int qwtMaxScaleLevels = 8;
+
+
+// the distance in scale units between two pixels of the tiles of a level
+class QwtScaleLevel
+{
+public:
+    QwtScaleLevel(int id, double dx, double dy):
+        id(id),
+        dx(dx),
+        dy(dy)
+    {
+    }
+
+    int id;
+    double dx;
+    double dy;
+};
+
+
+// a tile is the square of pixels from (x, y) * qwtTileSize on, where pixel
+// (i, j) is the value at (i * dx, j * dy) of the scale level (dx, dy)
+class QwtTileKey
+{
+public:
+    QwtTileKey(int level, qint64 x, qint64 y):
+        level(level),
+        x(x),
+        y(y)
+    {
+    }
+
+    bool operator==(const QwtTileKey &other) const
+    {
+        return level == other.level && x == other.x && y == other.y;
+    }
+
+    int level;
+    qint64 x;
+    qint64 y;
+};
+
+
+static uint qHash(const QwtTileKey &key)
+{
+    return uint(key.level) * 73856093u
+        ^ uint(key.x) * 19349663u ^ uint(key.y) * 83492791u;
+}
+
+
+static qint64 qwtFloorDiv(qint64 a, qint64 b)
+{
+    return a >= 0 ? a / b : -((-a - 1) / b) - 1;
+}
+
+
+static bool qwtFuzzyEqual(double a, double b)
+{
+    return qAbs(a - b) <= 1e-9 * qMax(qAbs(a), qAbs(b));
+}
+
+
+// returns the distance in scale units between two pixels of a linear map,
+// or 0.0 when the map cannot be tiled
+static double qwtPixelDistance(const QwtScaleMap &map)
+{
+    if (map.transformation()->type() != QwtScaleTransformation::Linear
+        || map.p1() == map.p2())
+        return 0.0;
+
+    const double distance =
+        qAbs((map.s2() - map.s1()) / (map.p2() - map.p1()));
+    if (!(distance > 0.0)
+        || qMax(qAbs(map.s1()), qAbs(map.s2())) / distance > 1e15)
+        return 0.0;
+
+    return distance;
+}
+
+
+class QwtPlotCachedSpectrogram::PrivateData
+{
+public:
+    PrivateData():
+        renderThreadCount(1),
+        reentrantData(true),
+        reentrantColorMap(true),
+        refinableData(true),
+        progressive(false),
+        previewFraction(0.25),
+        printing(false),
+        refineValid(false),
+        refineThread(0),
+        nextScaleLevel(0),
+        tileRenders(0),
+        valid(false),
+        flags(0),
+        renders(0)
+    {
+        tiles.setMaxCost(0);
+    }
+
+    int renderThreadCount;
+    bool reentrantData;
+    bool reentrantColorMap;
+    bool refinableData;
+
+    // the progressive rendering of the image for the key of the maps
+    bool progressive;
+    double previewFraction;
+    // true while drawing on another device than the canvas
+    bool printing;
+    bool refineValid;
+    QwtScaleMap refineXMap;
+    QwtScaleMap refineYMap;
+    QwtDoubleRect refineArea;
+    QwtRefineThread *refineThread;
+    QImage preview;
+    QImage refined;
+
+    // the tiles of the images, costing kilobytes
+    QCache<QwtTileKey, QImage> tiles;
+    // the scale levels, the most recently used one first
+    QList<QwtScaleLevel> scaleLevels;
+    int nextScaleLevel;
+    QwtDoubleInterval tileRange;
+    int tileRenders;
+
+    // the key of the contour lines
+    bool valid;
+    QwtDoubleRect rect;
+    QSize raster;
+    QwtValueList levels;
+    int flags;
+
+    QwtRasterData::ContourLines lines;
+    int renders;
+};
+
+
+QwtPlotCachedSpectrogram::QwtPlotCachedSpectrogram(const QString &title):
+    QwtPlotSpectrogram(title)
+{
+    d_data = new PrivateData;
+}
+
+
+QwtPlotCachedSpectrogram::~QwtPlotCachedSpectrogram()
+{
+    stopRefinement();
+    qwtDeleteCancelledThreads();
+    delete d_data;
+}
+
+
+void QwtPlotCachedSpectrogram::setData(const QwtRasterData &data)
+{
+    stopRefinement();
+    invalidateContourLines();
+    invalidateTiles();
+    QwtPlotSpectrogram::setData(data);
+}
+
+
+void QwtPlotCachedSpectrogram::setColorMap(const QwtColorMap &colorMap)
+{
+    stopRefinement();
+    invalidateTiles();
+    QwtPlotSpectrogram::setColorMap(colorMap);
+}
+
+
+void QwtPlotCachedSpectrogram::setRenderThreadCount(int count)
+{
+    d_data->renderThreadCount = qMax(count, 0);
+}
+
+
+int QwtPlotCachedSpectrogram::renderThreadCount() const
+{
+    return d_data->renderThreadCount;
+}
+
+
+void QwtPlotCachedSpectrogram::setReentrantData(bool on)
+{
+    d_data->reentrantData = on;
+}
+
+
+bool QwtPlotCachedSpectrogram::isReentrantData() const
+{
+    return d_data->reentrantData;
+}
+
+
+void QwtPlotCachedSpectrogram::setReentrantColorMap(bool on)
+{
+    d_data->reentrantColorMap = on;
+}
+
+
+bool QwtPlotCachedSpectrogram::isReentrantColorMap() const
+{
+    return d_data->reentrantColorMap;
+}
+
+
+void QwtPlotCachedSpectrogram::setRefinableData(bool on)
+{
+    if (!on)
+        stopRefinement();
+    d_data->refinableData = on;
+}
+
+
+bool QwtPlotCachedSpectrogram::isRefinableData() const
+{
+    return d_data->refinableData;
+}
+
+
+void QwtPlotCachedSpectrogram::setProgressive(bool on)
+{
+    if (!on)
+        stopRefinement();
+    d_data->progressive = on;
+}
+
+
+bool QwtPlotCachedSpectrogram::isProgressive() const
+{
+    return d_data->progressive;
+}
+
+
+void QwtPlotCachedSpectrogram::setPreviewFraction(double fraction)
+{
+    d_data->previewFraction = qMax(0.0, qMin(fraction, 1.0));
+}
+
+
+double QwtPlotCachedSpectrogram::previewFraction() const
+{
+    return d_data->previewFraction;
+}
+
+
+bool QwtPlotCachedSpectrogram::isRefining() const
+{
+    return d_data->refineThread && !d_data->refineThread->isDone();
+}
+
+
+void QwtPlotCachedSpectrogram::cancelRefinement()
+{
+    stopRefinement();
+}
+
+
+void QwtPlotCachedSpectrogram::setTileCacheSize(int kilobytes)
+{
+    d_data->tiles.setMaxCost(qMax(kilobytes, 0));
+}
+
+
+int QwtPlotCachedSpectrogram::tileCacheSize() const
+{
+    return d_data->tiles.maxCost();
+}
+
+
+void QwtPlotCachedSpectrogram::invalidateTiles()
+{
+    d_data->tiles.clear();
+    d_data->scaleLevels.clear();
+}
+
+
+int QwtPlotCachedSpectrogram::tileRenders() const
+{
+    return d_data->tileRenders;
+}
+
+
+void QwtPlotCachedSpectrogram::invalidateContourLines()
+{
+    d_data->valid = false;
+    d_data->lines.clear();
+}
+
+
+int QwtPlotCachedSpectrogram::contourRenders() const
+{
+    return d_data->renders;
+}
+
+
+QwtRasterData::ContourLines QwtPlotCachedSpectrogram::contourLines(
+    const QwtDoubleRect &rect, const QSize &raster) const
+{
+    return renderContourLines(rect, raster);
+}
+
+
+void QwtPlotCachedSpectrogram::draw(
+    QPainter *painter, const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    const QRect &canvasRect) const
+{
+    // a printout gets the full image and not a preview
+    const QwtPlot *plot = this->plot();
+    const QPaintDevice *device = painter->device();
+    d_data->printing = !plot || (device != plot->canvas()
+                                 && device != plot->canvas()->paintCache());
+
+    QwtPlotSpectrogram::draw(painter, xMap, yMap, canvasRect);
+
+    d_data->printing = false;
+}
+
+
+QImage QwtPlotCachedSpectrogram::renderImage(
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    const QwtDoubleRect &area) const
+{
+    int threads = d_data->renderThreadCount;
+#if QT_VERSION >= 0x040300
+    if (0 == threads)
+        threads = QThread::idealThreadCount();
+#endif
+    if (!d_data->reentrantData || !d_data->reentrantColorMap)
+        threads = 1;
+
+    if (area.isEmpty())
+        return QwtPlotSpectrogram::renderImage(xMap, yMap, area);
+
+    if (d_data->tiles.maxCost() > 0
+        && qwtPixelDistance(xMap) > 0.0 && qwtPixelDistance(yMap) > 0.0)
+        return renderTiles(xMap, yMap, area, threads);
+
+    if (d_data->progressive && d_data->previewFraction < 1.0
+        && !d_data->printing
+        && d_data->reentrantData && d_data->reentrantColorMap
+        && d_data->refinableData)
+        return renderProgressive(xMap, yMap, area, threads);
+
+    if (threads < 2)
+        return QwtPlotSpectrogram::renderImage(xMap, yMap, area);
+
+    QwtRasterData &data = const_cast<QwtRasterData &>(this->data());
+    return qwtRenderImage(data, colorMap(), xMap, yMap, area,
+                          transform(xMap, yMap, area), threads);
+}
+
+
+QImage QwtPlotCachedSpectrogram::renderProgressive(
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    const QwtDoubleRect &area, int threads) const
+{
+    if (d_data->refineValid
+        && qwtSameMap(xMap, d_data->refineXMap)
+        && qwtSameMap(yMap, d_data->refineYMap)
+        && area == d_data->refineArea) {
+        QwtRefineThread *thread = d_data->refineThread;
+        if (thread && thread->isDone()) {
+            thread->wait();
+            d_data->refined = thread->image();
+            delete thread;
+            d_data->refineThread = 0;
+        }
+
+        if (!d_data->refined.isNull())
+            return d_data->refined;
+
+        if (d_data->refineThread)
+            return d_data->preview;
+    }
+
+    // a new zoom or pan: cancel the refinement of the previous one
+    stopRefinement();
+
+    QwtRasterData &data = const_cast<QwtRasterData &>(this->data());
+    const QRect rect = transform(xMap, yMap, area);
+    d_data->preview = qwtRenderImage(data, colorMap(), xMap, yMap, area,
+                                     rect, threads, d_data->previewFraction);
+    d_data->refineXMap = xMap;
+    d_data->refineYMap = yMap;
+    d_data->refineArea = area;
+    d_data->refineValid = true;
+
+    d_data->refineThread = new QwtRefineThread(
+        data.copy(), colorMap().copy(), xMap, yMap, area, rect, threads);
+    if (plot())
+        QObject::connect(d_data->refineThread, SIGNAL(finished()),
+                         plot(), SLOT(replot()), Qt::QueuedConnection);
+    d_data->refineThread->start(QThread::LowPriority);
+
+    return d_data->preview;
+}
+
+
+void QwtPlotCachedSpectrogram::stopRefinement() const
+{
+    if (d_data->refineThread) {
+        qwtCancelThread(d_data->refineThread);
+        d_data->refineThread = 0;
+    }
+
+    d_data->refineValid = false;
+    d_data->preview = QImage();
+    d_data->refined = QImage();
+}
+
+
+QImage QwtPlotCachedSpectrogram::renderTiles(
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    const QwtDoubleRect &area, int threads) const
+{
+    const QRect rect = transform(xMap, yMap, area);
+    const QwtColorMap &colorMap = this->colorMap();
+    const bool rgb = colorMap.format() == QwtColorMap::RGB;
+    const QImage::Format format =
+        rgb ? QImage::Format_ARGB32 : QImage::Format_Indexed8;
+
+    QImage image(rect.size(), format);
+
+    const QwtDoubleInterval range = data().range();
+    if (!range.isValid() || rect.isEmpty())
+        return image;
+
+    if (range != d_data->tileRange) {
+        invalidateTiles();
+        d_data->tileRange = range;
+    }
+
+    QVector<QRgb> colorTable;
+    if (!rgb) {
+        colorTable = colorMap.colorTable(range);
+        image.setColorTable(colorTable);
+    }
+
+    // find the scale level and drop the tiles of the least recently used
+    // level, when there are too many
+    const double dx = qwtPixelDistance(xMap);
+    const double dy = qwtPixelDistance(yMap);
+    QList<QwtScaleLevel> &levels = d_data->scaleLevels;
+    int index = 0;
+    while (index < levels.size()
+           && !(qwtFuzzyEqual(levels[index].dx, dx)
+                && qwtFuzzyEqual(levels[index].dy, dy)))
+        ++index;
+    if (index == levels.size()) {
+        if (levels.size() == qwtMaxScaleLevels) {
+            const int id = levels.takeLast().id;
+            const QList<QwtTileKey> keys = d_data->tiles.keys();
+            for (int i = 0; i < keys.size(); ++i) {
+                if (keys[i].level == id)
+                    d_data->tiles.remove(keys[i]);
+            }
+        }
+        levels.prepend(QwtScaleLevel(d_data->nextScaleLevel++, dx, dy));
+    } else if (index > 0) {
+        levels.move(index, 0);
+    }
+    const int level = levels.first().id;
+
+    // the pixels of the image in the increasing directions of the scales
+    const int width = rect.width();
+    const int height = rect.height();
+    const bool hInvert = (xMap.s2() - xMap.s1()) * (xMap.p2() - xMap.p1()) < 0;
+    const bool vInvert = (yMap.s2() - yMap.s1()) * (yMap.p2() - yMap.p1()) < 0;
+    qint64 gx0 = qRound64(xMap.invTransform(rect.left()) / dx);
+    if (hInvert)
+        gx0 -= width - 1;
+    qint64 gy0 = qRound64(yMap.invTransform(rect.top()) / dy);
+    if (vInvert)
+        gy0 -= height - 1;
+
+    const qint64 tx0 = qwtFloorDiv(gx0, qwtTileSize);
+    const qint64 tx1 = qwtFloorDiv(gx0 + width - 1, qwtTileSize);
+    const qint64 ty0 = qwtFloorDiv(gy0, qwtTileSize);
+    const qint64 ty1 = qwtFloorDiv(gy0 + height - 1, qwtTileSize);
+    const int columns = int(tx1 - tx0 + 1);
+
+    // collect the tiles and the bounding rectangle of the missing ones
+    const int rows = int(ty1 - ty0 + 1);
+    QVector<QImage> tiles(rows * columns);
+    QList<int> missing;
+    qint64 mx0 = tx1, mx1 = tx0, my0 = ty1, my1 = ty0;
+    for (int i = 0; i < tiles.size(); ++i) {
+        const qint64 tx = tx0 + i % columns;
+        const qint64 ty = ty0 + i / columns;
+        const QImage *cached = d_data->tiles.object(QwtTileKey(level, tx, ty));
+        if (cached) {
+            tiles[i] = *cached;
+            continue;
+        }
+
+        missing.append(i);
+        mx0 = qMin(mx0, tx);
+        mx1 = qMax(mx1, tx);
+        my0 = qMin(my0, ty);
+        my1 = qMax(my1, ty);
+    }
+
+    // render the missing tiles in parallel, a tile per thread at a time,
+    // after initializing the raster of their bounding rectangle at once
+    if (!missing.isEmpty()) {
+        QwtRasterData &data = const_cast<QwtRasterData &>(this->data());
+        const QRect tileRect(0, 0, qwtTileSize, qwtTileSize);
+        const double tileWidth = qwtTileSize * dx;
+        const double tileHeight = qwtTileSize * dy;
+
+        QList<QwtRenderJob *> jobs;
+        QVector<QwtRenderPiece> pieces;
+        for (int k = 0; k < missing.size(); ++k) {
+            const int i = missing[k];
+            const qint64 tx = tx0 + i % columns;
+            const qint64 ty = ty0 + i / columns;
+
+            QwtScaleMap tileXMap;
+            tileXMap.setPaintInterval(0, qwtTileSize);
+            tileXMap.setScaleInterval(tx * tileWidth, (tx + 1) * tileWidth);
+            QwtScaleMap tileYMap;
+            tileYMap.setPaintInterval(0, qwtTileSize);
+            tileYMap.setScaleInterval(ty * tileHeight, (ty + 1) * tileHeight);
+
+            tiles[i] = QImage(tileRect.size(), format);
+            if (!rgb)
+                tiles[i].setColorTable(colorTable);
+
+            jobs.append(new QwtRenderJob(data, colorMap, range,
+                                         tileXMap, tileYMap, tileRect,
+                                         tiles[i], 0));
+            pieces.append(QwtRenderPiece(
+                              jobs.last(), tileRect.top(), tileRect.bottom()));
+        }
+
+        data.initRaster(
+            QwtDoubleRect(mx0 * tileWidth, my0 * tileHeight,
+                          (mx1 - mx0 + 1) * tileWidth,
+                          (my1 - my0 + 1) * tileHeight),
+            QSize(int(mx1 - mx0 + 1) * qwtTileSize,
+                  int(my1 - my0 + 1) * qwtTileSize));
+        qwtRenderPieces(pieces, threads);
+        data.discardRaster();
+        qDeleteAll(jobs);
+
+        for (int k = 0; k < missing.size(); ++k) {
+            const int i = missing[k];
+            const QImage &tile = tiles[i];
+            d_data->tiles.insert(
+                QwtTileKey(level, tx0 + i % columns, ty0 + i / columns),
+                new QImage(tile),
+                qMax(1, tile.bytesPerLine() * tile.height() / 1024));
+            ++d_data->tileRenders;
+        }
+    }
+
+    // copy the tiles into the image
+    const int depth = rgb ? 4 : 1;
+    for (int row = 0; row < height; ++row) {
+        const qint64 gy = gy0 + row;
+        const qint64 ty = qwtFloorDiv(gy, qwtTileSize);
+        const int j = int(gy - ty * qwtTileSize);
+        uchar *line = image.scanLine(row);
+
+        qint64 gx = gx0;
+        int column = 0;
+        while (column < width) {
+            const qint64 tx = qwtFloorDiv(gx, qwtTileSize);
+            const int i = int(gx - tx * qwtTileSize);
+            const int count = qMin(qwtTileSize - i, width - column);
+            const QImage &tile =
+                tiles.at(int(ty - ty0) * columns + int(tx - tx0));
+            memcpy(line + column * depth, tile.scanLine(j) + i * depth,
+                   count * depth);
+            column += count;
+            gx += count;
+        }
+    }
+
+    if (hInvert || vInvert)
+        image = image.mirrored(hInvert, vInvert);
+
+    return image;
+}
+
+
+QwtRasterData::ContourLines QwtPlotCachedSpectrogram::renderContourLines(
+    const QwtDoubleRect &rect, const QSize &raster) const
+{
+    int flags = 0;
+    if (testConrecAttribute(QwtRasterData::IgnoreAllVerticesOnLevel))
+        flags |= QwtRasterData::IgnoreAllVerticesOnLevel;
+    if (testConrecAttribute(QwtRasterData::IgnoreOutOfRange))
+        flags |= QwtRasterData::IgnoreOutOfRange;
+
+    const QwtValueList levels = contourLevels();
+
+    if (!d_data->valid || rect != d_data->rect || raster != d_data->raster
+        || levels != d_data->levels || flags != d_data->flags) {
+        d_data->lines = QwtPlotSpectrogram::renderContourLines(rect, raster);
+        d_data->rect = rect;
+        d_data->raster = raster;
+        d_data->levels = levels;
+        d_data->flags = flags;
+        d_data->valid = true;
+        ++d_data->renders;
+    }
+
+    return d_data->lines;
+}
+
+#endif // QT_VERSION >= 0x040000
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
@@ -0,0 +1,164 @@
+// The header for QwtPlotCachedSpectrogram, caching its contour lines.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_PLOT_CACHED_SPECTROGRAM_H
+#define QWT_PLOT_CACHED_SPECTROGRAM_H
+
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <qwt_plot_spectrogram.h>
+
+// QwtPlotCachedSpectrogram is a QwtPlotSpectrogram keeping the contour
+// lines of its last call of renderContourLines(), so that a replot without
+// a change of the raster rectangle, the raster size, the contour levels or
+// the CONREC attributes does not run CONREC again.
+//
+// setData() discards the contour lines, but invalidateContourLines() must
+// be called after changing the values of the data in place.
+//
+// renderImage() splits the image into horizontal strips rendered on
+// renderThreadCount() threads, when the data and the color map are
+// reentrant: their value(), rgb() and colorIndex() are called from several
+// threads at once, between initRaster() and discardRaster() on the calling
+// thread.  The Python wrappers clear the reentrant flags for data and color
+// maps implementing these functions in Python.
+//
+// When the tile cache size is positive and both maps are linear,
+// renderImage() composes the image from tiles of 256x256 pixels, which are
+// kept in a cache with a least recently used policy.  The tiles are keyed
+// by the scale level, the distance in scale units between two pixels, and
+// by their position on a grid anchored at the origin of the scales, so
+// that panning renders only the tiles which become visible.  The pixels
+// are sampled on this grid, which shifts the image by less than a pixel
+// and ignores QwtRasterData::rasterHint().  The missing tiles are rendered
+// in parallel, after a single initRaster() covering all of them.  The cache
+// keeps the tiles of the 8 most recently used scale levels.
+//
+// In progressive mode, renderImage() returns a preview rendered with
+// previewFraction() of the pixels in each direction and refines the image
+// on a background thread with copies of the data and the color map.  The
+// thread requests a replot of the plot, when it has finished, and the next
+// call of renderImage() with the same maps returns the refined image.
+// Rendering other maps cancels the refinement without waiting for it: the
+// cancelled thread is deleted, when it returns, or at the latest when the
+// QCoreApplication is destroyed.
+// Progressive mode requires reentrant color maps and data, which must also
+// be refinable: the copy of the data must be independent of the original
+// and must not call Python on the thread.  The Python wrappers clear the
+// refinable flag for QwtGridRasterData and for data implementing copy(),
+// initRaster() or discardRaster() in Python.  Progressive mode is ignored
+// when the tile cache is on.  Printing and drawing without a plot render
+// the full image.
+class QwtPlotCachedSpectrogram: public QwtPlotSpectrogram
+{
+public:
+    explicit QwtPlotCachedSpectrogram(const QString &title = QString::null);
+    virtual ~QwtPlotCachedSpectrogram();
+
+    void setData(const QwtRasterData &data);
+    void setColorMap(const QwtColorMap &colorMap);
+
+    // 1 renders on the calling thread, 0 on QThread::idealThreadCount()
+    void setRenderThreadCount(int count);
+    int renderThreadCount() const;
+
+    void setReentrantData(bool on);
+    bool isReentrantData() const;
+
+    void setReentrantColorMap(bool on);
+    bool isReentrantColorMap() const;
+
+    // true, when copies of the data may render on a background thread
+    void setRefinableData(bool on);
+    bool isRefinableData() const;
+
+    // the budget of the tile cache in kilobytes, 0 switches the cache off
+    void setTileCacheSize(int kilobytes);
+    int tileCacheSize() const;
+    void invalidateTiles();
+
+    // the number of tiles which have been rendered
+    int tileRenders() const;
+
+    void setProgressive(bool on);
+    bool isProgressive() const;
+
+    // the fraction of the pixels in each direction rendered for the preview
+    void setPreviewFraction(double fraction);
+    double previewFraction() const;
+
+    // returns true, while a refinement runs in the background
+    bool isRefining() const;
+    void cancelRefinement();
+
+    void invalidateContourLines();
+
+    // the number of times CONREC has been run
+    int contourRenders() const;
+
+    // the contour lines of the raster covering rect
+    QwtRasterData::ContourLines contourLines(
+        const QwtDoubleRect &rect, const QSize &raster) const;
+
+    virtual void draw(QPainter *painter,
+                      const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                      const QRect &canvasRect) const;
+
+protected:
+    virtual QImage renderImage(const QwtScaleMap &xMap,
+                               const QwtScaleMap &yMap,
+                               const QwtDoubleRect &area) const;
+
+    virtual QwtRasterData::ContourLines renderContourLines(
+        const QwtDoubleRect &rect, const QSize &raster) const;
+
+private:
+    QImage renderTiles(const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                       const QwtDoubleRect &area, int threads) const;
+    QImage renderProgressive(
+        const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+        const QwtDoubleRect &area, int threads) const;
+    void stopRefinement() const;
+
+    class PrivateData;
+    PrivateData *d_data;
+};
+
+#endif // QT_VERSION >= 0x040000
+
+#endif // QWT_PLOT_CACHED_SPECTROGRAM_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
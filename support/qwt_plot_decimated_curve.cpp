@@ -0,0 +1,220 @@
+// The code for QwtPlotDecimatedCurve, a QwtPlotCurve drawing a decimated
+// polyline.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifdef HAS_NUMPY
+#include <qwt_numpy_data.h>
+#endif
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <qpainter.h>
+#include <qwt_global.h>
+#if QWT_VERSION >= 0x050100
+#include <qwt_clipper.h>
+#endif
+#include <qwt_data.h>
+#include <qwt_math.h>
+#include <qwt_min_max_pyramid.h>
+#include <qwt_painter.h>
+#include <qwt_scale_map.h>
+#include <qwt_plot_decimated_curve.h>
+
+
+QwtPlotDecimatedCurve::QwtPlotDecimatedCurve():
+    QwtPlotCurve(),
+    d_decimated(true)
+{
+}
+
+
+QwtPlotDecimatedCurve::QwtPlotDecimatedCurve(const QwtText &title):
+    QwtPlotCurve(title),
+    d_decimated(true)
+{
+}
+
+
+QwtPlotDecimatedCurve::QwtPlotDecimatedCurve(const QString &title):
+    QwtPlotCurve(title),
+    d_decimated(true)
+{
+}
+
+
+QwtPlotDecimatedCurve::~QwtPlotDecimatedCurve()
+{
+}
+
+
+void QwtPlotDecimatedCurve::setDecimated(bool on)
+{
+    if (on != d_decimated) {
+        d_decimated = on;
+        itemChanged();
+    }
+}
+
+
+bool QwtPlotDecimatedCurve::isDecimated() const
+{
+    return d_decimated;
+}
+
+
+void QwtPlotDecimatedCurve::drawCurve(
+    QPainter *painter, int style,
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    int from, int to) const
+{
+    if (d_decimated && Lines == style && !testCurveAttribute(Fitted))
+        drawDecimatedLines(painter, xMap, yMap, from, to);
+    else
+        QwtPlotCurve::drawCurve(painter, style, xMap, yMap, from, to);
+}
+
+
+// Appends the samples first, min, max and last of a pixel column
+// to the polyline, in the order of the samples and without duplicates.
+static inline void appendColumn(
+    QwtPolygon &polyline, const QwtData &data,
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    int first, int min, int max, int last)
+{
+    int samples[4] = { first, qwtMin(min, max), qwtMax(min, max), last };
+
+    int previous = -1;
+    for (int i = 0; i < 4; i++) {
+        const int sample = samples[i];
+        if (sample != previous) {
+            polyline += QPoint(xMap.transform(data.x(sample)),
+                               yMap.transform(data.y(sample)));
+            previous = sample;
+        }
+    }
+}
+
+
+void QwtPlotDecimatedCurve::drawDecimatedLines(
+    QPainter *painter,
+    const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+    int from, int to) const
+{
+    if (to < from)
+        return;
+
+    const QwtData &samples = data();
+
+    // All samples left or right of the canvas end up in a single column
+    // on each side: lines between those samples are not visible, but the
+    // lines entering the canvas are.
+    const int left = qRound(qwtMin(xMap.p1(), xMap.p2())) - 1;
+    const int right = qRound(qwtMax(xMap.p1(), xMap.p2())) + 1;
+
+    QwtPolygon polyline;
+    polyline.reserve(qwtMin(to - from + 1, 4 * (right - left + 1)));
+
+    const QwtMinMaxPyramid *pyramid = 0;
+#ifdef HAS_NUMPY
+    // keeps other threads from invalidating the pyramid while drawing
+    const QwtNumPyData::PyramidLocker locker(
+        dynamic_cast<const QwtNumPyData *>(&samples));
+    pyramid = locker.pyramid();
+#endif
+
+    if (pyramid) {
+        // The x-values increase: find the last sample of each column by
+        // bisection and its extremes in the largest blocks of the pyramid
+        // fitting into the column.
+        for (int first = from; first <= to;) {
+            const int column =
+                qwtLim(xMap.transform(samples.x(first)), left, right);
+            int last = first;
+            int upper = to;
+            while (last < upper) {
+                const int middle = last + (upper - last + 1) / 2;
+                if (column == qwtLim(
+                        xMap.transform(samples.x(middle)), left, right))
+                    last = middle;
+                else
+                    upper = middle - 1;
+            }
+            int min, max;
+            pyramid->minMax(first, last, min, max);
+            appendColumn(polyline, samples, xMap, yMap, first, min, max, last);
+            first = last + 1;
+        }
+    } else {
+        int column = qwtLim(xMap.transform(samples.x(from)), left, right);
+        int first = from;
+        int min = from;
+        int max = from;
+        double yMin = samples.y(from);
+        double yMax = yMin;
+
+        for (int i = from + 1; i <= to; i++) {
+            const int c = qwtLim(xMap.transform(samples.x(i)), left, right);
+            const double y = samples.y(i);
+            if (c != column) {
+                appendColumn(
+                    polyline, samples, xMap, yMap, first, min, max, i - 1);
+                column = c;
+                first = min = max = i;
+                yMin = yMax = y;
+            } else if (y < yMin) {
+                min = i;
+                yMin = y;
+            } else if (y > yMax) {
+                max = i;
+                yMax = y;
+            }
+        }
+        appendColumn(polyline, samples, xMap, yMap, first, min, max, to);
+    }
+
+#if QWT_VERSION >= 0x050100
+    if (testPaintAttribute(ClipPolygons))
+        polyline = QwtClipper::clipPolygon(painter->window(), polyline);
+#endif
+
+    if (brush().style() != Qt::NoBrush)
+        fillCurve(painter, xMap, yMap, polyline);
+
+    QwtPainter::drawPolyline(painter, polyline);
+}
+
+#endif // QT_VERSION >= 0x040000
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
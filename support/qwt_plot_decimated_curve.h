@@ -0,0 +1,81 @@
+// The header for QwtPlotDecimatedCurve, a QwtPlotCurve drawing a decimated
+// polyline.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_PLOT_DECIMATED_CURVE_H
+#define QWT_PLOT_DECIMATED_CURVE_H
+
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <qwt_plot_curve.h>
+
+// QwtPlotDecimatedCurve draws curves with the Lines style by reducing the
+// samples falling into each pixel column to the first, the minimum, the
+// maximum and the last sample, before building the polyline.
+//
+// The samples are visited in order, so that the picture is the same as the
+// one of QwtPlotCurve, but the polyline holds at most 4 points per pixel
+// column whatever the number of samples.  Curves with another style or with
+// the Fitted attribute are drawn by QwtPlotCurve.
+class QwtPlotDecimatedCurve: public QwtPlotCurve
+{
+public:
+    explicit QwtPlotDecimatedCurve();
+    explicit QwtPlotDecimatedCurve(const QwtText &title);
+    explicit QwtPlotDecimatedCurve(const QString &title);
+    virtual ~QwtPlotDecimatedCurve();
+
+    void setDecimated(bool on);
+    bool isDecimated() const;
+
+protected:
+    virtual void drawCurve(QPainter *painter, int style,
+                           const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                           int from, int to) const;
+
+    void drawDecimatedLines(QPainter *painter,
+                            const QwtScaleMap &xMap, const QwtScaleMap &yMap,
+                            int from, int to) const;
+
+private:
+    bool d_decimated;
+};
+
+#endif // QT_VERSION >= 0x040000
+
+#endif // QWT_PLOT_DECIMATED_CURVE_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
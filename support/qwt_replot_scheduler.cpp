@@ -0,0 +1,244 @@
+// The code for QwtReplotScheduler, coalescing replot requests of a QwtPlot.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qglobal.h>
+
+#if QT_VERSION >= 0x040000
+
+#include <qcoreevent.h>
+#include <qwt_plot.h>
+#include <qwt_plot_item.h>
+#include <qwt_replot_scheduler.h>
+
+
+class QwtReplotScheduler::PrivateData
+{
+public:
+    PrivateData():
+        maxRate(0.0),
+        delay(0),
+        requests(0),
+        coalescedRequests(0),
+        replots(0),
+        droppedFrames(0)
+    {
+    }
+
+    // the period of a frame in milliseconds, 0 without a maximum rate
+    int interval() const
+    {
+        return maxRate > 0.0 ? qRound(1000.0 / maxRate) : 0;
+    }
+
+    QBasicTimer timer;
+    QTime scheduled;
+    QTime lastReplot;
+    QList<QwtPlotItem *> dirtyItems;
+    double maxRate;
+    int delay;
+    int requests;
+    int coalescedRequests;
+    int replots;
+    int droppedFrames;
+};
+
+
+QwtReplotScheduler::QwtReplotScheduler(QwtPlot *plot):
+    QObject(plot)
+{
+    d_data = new PrivateData;
+}
+
+
+QwtReplotScheduler::~QwtReplotScheduler()
+{
+    delete d_data;
+}
+
+
+QwtPlot *QwtReplotScheduler::plot()
+{
+    return static_cast<QwtPlot *>(parent());
+}
+
+
+const QwtPlot *QwtReplotScheduler::plot() const
+{
+    return static_cast<const QwtPlot *>(parent());
+}
+
+
+void QwtReplotScheduler::setMaxRate(double rate)
+{
+    d_data->maxRate = qMax(rate, 0.0);
+}
+
+
+double QwtReplotScheduler::maxRate() const
+{
+    return d_data->maxRate;
+}
+
+
+bool QwtReplotScheduler::isPending() const
+{
+    return d_data->timer.isActive();
+}
+
+
+QList<QwtPlotItem *> QwtReplotScheduler::dirtyItems() const
+{
+    // an item may have been detached or deleted after its request
+    const QwtPlotItemList &items = plot()->itemList();
+
+    QList<QwtPlotItem *> dirty;
+    for (int i = 0; i < d_data->dirtyItems.size(); ++i) {
+        if (items.contains(d_data->dirtyItems[i]))
+            dirty.append(d_data->dirtyItems[i]);
+    }
+
+    return dirty;
+}
+
+
+bool QwtReplotScheduler::isDirty(const QwtPlotItem *item) const
+{
+    return d_data->dirtyItems.contains(const_cast<QwtPlotItem *>(item));
+}
+
+
+int QwtReplotScheduler::requests() const
+{
+    return d_data->requests;
+}
+
+
+int QwtReplotScheduler::coalescedRequests() const
+{
+    return d_data->coalescedRequests;
+}
+
+
+int QwtReplotScheduler::replots() const
+{
+    return d_data->replots;
+}
+
+
+int QwtReplotScheduler::droppedFrames() const
+{
+    return d_data->droppedFrames;
+}
+
+
+void QwtReplotScheduler::resetCounters()
+{
+    d_data->requests = 0;
+    d_data->coalescedRequests = 0;
+    d_data->replots = 0;
+    d_data->droppedFrames = 0;
+}
+
+
+QwtReplotScheduler *QwtReplotScheduler::scheduler(QwtPlot *plot)
+{
+    const QObjectList &children = plot->children();
+    for (int i = 0; i < children.size(); ++i) {
+        QwtReplotScheduler *scheduler =
+            qobject_cast<QwtReplotScheduler *>(children[i]);
+        if (scheduler)
+            return scheduler;
+    }
+
+    return new QwtReplotScheduler(plot);
+}
+
+
+void QwtReplotScheduler::requestReplot(QwtPlotItem *item)
+{
+    ++d_data->requests;
+
+    if (item && !d_data->dirtyItems.contains(item))
+        d_data->dirtyItems.append(item);
+
+    if (d_data->timer.isActive()) {
+        ++d_data->coalescedRequests;
+        return;
+    }
+
+    // wait for the end of the current frame
+    const int interval = d_data->interval();
+    d_data->delay = 0;
+    if (interval > 0 && !d_data->lastReplot.isNull())
+        d_data->delay = qMax(0, interval - d_data->lastReplot.elapsed());
+
+    d_data->scheduled.start();
+    d_data->timer.start(d_data->delay, this);
+}
+
+
+void QwtReplotScheduler::replotNow()
+{
+    d_data->timer.stop();
+    d_data->dirtyItems.clear();
+    d_data->lastReplot.start();
+    ++d_data->replots;
+
+    plot()->replot();
+
+    emit replotted();
+}
+
+
+void QwtReplotScheduler::timerEvent(QTimerEvent *event)
+{
+    if (event->timerId() != d_data->timer.timerId()) {
+        QObject::timerEvent(event);
+        return;
+    }
+
+    // a busy event loop fires the timer late and skips frames
+    const int interval = d_data->interval();
+    if (interval > 0) {
+        const int late = d_data->scheduled.elapsed() - d_data->delay;
+        if (late > 0)
+            d_data->droppedFrames += late / interval;
+    }
+
+    replotNow();
+}
+
+#endif // QT_VERSION >= 0x040000
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
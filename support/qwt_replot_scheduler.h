@@ -0,0 +1,111 @@
+// The header for QwtReplotScheduler, coalescing replot requests of a QwtPlot.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_REPLOT_SCHEDULER_H
+#define QWT_REPLOT_SCHEDULER_H
+
+// Qt-4 only: configure.py runs moc on this header when PyQt wraps Qt-4 and
+// qwt_replot_scheduler.cpp is empty otherwise.  Do not guard Q_OBJECT with
+// QT_VERSION, because moc does not see the definition of QT_VERSION.
+
+#include <qbasictimer.h>
+#include <qdatetime.h>
+#include <qlist.h>
+#include <qobject.h>
+
+class QwtPlot;
+class QwtPlotItem;
+
+// QwtReplotScheduler coalesces any number of calls of requestReplot() into
+// a single QwtPlot::replot() within the next iteration of the event loop,
+// or at most maxRate() times per second when maxRate() is positive.
+//
+// The items passed to requestReplot() are remembered as dirty until the
+// replot, and the counters tell how many requests were coalesced and how
+// many frames were dropped, because the event loop was too busy to replot
+// in time.
+//
+// A scheduler is a child of its plot: use scheduler() to find or create it.
+// QwtPlot::autoReplot() must be off, otherwise every change of an item
+// triggers a replot of its own.
+class QwtReplotScheduler: public QObject
+{
+    Q_OBJECT
+
+public:
+    explicit QwtReplotScheduler(QwtPlot *plot);
+    virtual ~QwtReplotScheduler();
+
+    QwtPlot *plot();
+    const QwtPlot *plot() const;
+
+    // frames per second, 0.0 replots within the next iteration of the
+    // event loop
+    void setMaxRate(double rate);
+    double maxRate() const;
+
+    bool isPending() const;
+
+    // the items still attached to the plot, which requested a replot since
+    // the last replot
+    QList<QwtPlotItem *> dirtyItems() const;
+    bool isDirty(const QwtPlotItem *item) const;
+
+    int requests() const;
+    int coalescedRequests() const;
+    int replots() const;
+    int droppedFrames() const;
+    void resetCounters();
+
+    // returns the scheduler of plot and creates it when needed
+    static QwtReplotScheduler *scheduler(QwtPlot *plot);
+
+public slots:
+    void requestReplot(QwtPlotItem *item = 0);
+    void replotNow();
+
+signals:
+    void replotted();
+
+protected:
+    virtual void timerEvent(QTimerEvent *event);
+
+private:
+    class PrivateData;
+    PrivateData *d_data;
+};
+
+#endif // QWT_REPLOT_SCHEDULER_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
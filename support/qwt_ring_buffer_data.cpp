@@ -0,0 +1,417 @@
+// The code for QwtRingBufferData, a QwtData with a fixed capacity.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#include <qglobal.h>
+#if QT_VERSION >= 0x040400
+#include <qatomic.h>
+#endif
+#if QT_VERSION >= 0x040000
+#include <qmutex.h>
+#endif
+#include <qwt_array.h>
+#include <qwt_math.h>
+#include <qwt_ring_buffer_data.h>
+
+
+// The extremes of the samples in a block of the ring buffer.
+class Extremes
+{
+public:
+    Extremes():
+        xValid(false),
+        yValid(false)
+    {
+    }
+
+    inline void add(double x, double y)
+    {
+        addX(x, x);
+        addY(y, y);
+    }
+
+    inline void add(const Extremes &other)
+    {
+        if (other.xValid)
+            addX(other.xMin, other.xMax);
+        if (other.yValid)
+            addY(other.yMin, other.yMax);
+    }
+
+    double xMin, xMax, yMin, yMax;
+    bool xValid, yValid;
+
+private:
+    // NaN fails all comparisons and never becomes a minimum or maximum
+    inline void addX(double min, double max)
+    {
+        if (xValid) {
+            if (min < xMin)
+                xMin = min;
+            if (max > xMax)
+                xMax = max;
+        } else if (min == min) {
+            xMin = min;
+            xMax = max;
+            xValid = true;
+        }
+    }
+
+    inline void addY(double min, double max)
+    {
+        if (yValid) {
+            if (min < yMin)
+                yMin = min;
+            if (max > yMax)
+                yMax = max;
+        } else if (min == min) {
+            yMin = min;
+            yMax = max;
+            yValid = true;
+        }
+    }
+};
+
+
+// the number of samples per block of a buffer of capacity samples
+static size_t qwtBlockSize(size_t capacity)
+{
+    return qwtMax(size_t(64), size_t(sqrt(double(capacity))));
+}
+
+
+class QwtRingBufferData::PrivateData
+{
+public:
+    PrivateData(size_t capacity):
+        capacity(capacity),
+        blockSize(qwtBlockSize(capacity)),
+        count(0),
+        next(0),
+        rectValid(false),
+        ref(1)
+#if QT_VERSION >= 0x040000
+        , mutex(QMutex::Recursive)
+#endif
+    {
+        xBuffer.resize(int(capacity));
+        yBuffer.resize(int(capacity));
+        blocks.resize(int((capacity + blockSize - 1) / blockSize));
+        clearBlocks();
+    }
+
+    void lock()
+    {
+#if QT_VERSION >= 0x040000
+        mutex.lock();
+#endif
+    }
+
+    void unlock()
+    {
+#if QT_VERSION >= 0x040000
+        mutex.unlock();
+#endif
+    }
+
+    void clearBlocks()
+    {
+        for (int i = 0; i < blocks.size(); ++i)
+            blocks[i] = Extremes();
+    }
+
+    size_t size() const
+    {
+        return qwtMin(count, capacity);
+    }
+
+    // the buffer index of the first sample
+    size_t first() const
+    {
+        return count < capacity ? 0 : next;
+    }
+
+    void updateBlock(size_t block)
+    {
+        const size_t begin = block * blockSize;
+        const size_t end = qwtMin(qwtMin(begin + blockSize, capacity), size());
+
+        Extremes extremes;
+        for (size_t i = begin; i < end; ++i)
+            extremes.add(xBuffer[int(i)], yBuffer[int(i)]);
+        blocks[int(block)] = extremes;
+    }
+
+    // keeps the last samples fitting into newCapacity in a new buffer
+    void resize(size_t newCapacity)
+    {
+        const size_t n = qwtMin(size(), newCapacity);
+        const size_t begin = first() + size() - n;
+
+        QwtArray<double> x;
+        QwtArray<double> y;
+        x.resize(int(newCapacity));
+        y.resize(int(newCapacity));
+        for (size_t i = 0; i < n; ++i) {
+            x[int(i)] = xBuffer[int((begin + i) % capacity)];
+            y[int(i)] = yBuffer[int((begin + i) % capacity)];
+        }
+        xBuffer = x;
+        yBuffer = y;
+
+        capacity = newCapacity;
+        blockSize = qwtBlockSize(capacity);
+        count = n;
+        next = n % capacity;
+        blocks.resize(int((capacity + blockSize - 1) / blockSize));
+        clearBlocks();
+        for (size_t block = 0; block * blockSize < n; ++block)
+            updateBlock(block);
+        rectValid = false;
+    }
+
+    size_t capacity;
+    size_t blockSize;
+    // the number of samples appended since the last clear()
+    size_t count;
+    // the buffer index of the next sample
+    size_t next;
+    QwtArray<double> xBuffer;
+    QwtArray<double> yBuffer;
+    QwtArray<Extremes> blocks;
+    bool rectValid;
+    QwtDoubleRect rect;
+    // shared by all copies, which may be deleted on any thread
+#if QT_VERSION >= 0x040400
+    QAtomicInt ref;
+#else
+    int ref;
+#endif
+#if QT_VERSION >= 0x040000
+    // guards the samples, which are appended by a Python thread while
+    // curves are drawn without the GIL
+    QMutex mutex;
+#endif
+};
+
+
+QwtRingBufferData::QwtRingBufferData(size_t capacity):
+    QwtData()
+{
+    d_data = new PrivateData(qwtMax(capacity, size_t(1)));
+}
+
+
+QwtRingBufferData::QwtRingBufferData(PrivateData *data):
+    QwtData(),
+    d_data(data)
+{
+}
+
+
+QwtRingBufferData::~QwtRingBufferData()
+{
+#if QT_VERSION >= 0x040400
+    if (!d_data->ref.deref())
+        delete d_data;
+#else
+    if (0 == --d_data->ref)
+        delete d_data;
+#endif
+}
+
+
+QwtData *QwtRingBufferData::copy() const
+{
+#if QT_VERSION >= 0x040400
+    d_data->ref.ref();
+#else
+    ++d_data->ref;
+#endif
+
+    return new QwtRingBufferData(d_data);
+}
+
+
+size_t QwtRingBufferData::size() const
+{
+    d_data->lock();
+    const size_t size = d_data->size();
+    d_data->unlock();
+
+    return size;
+}
+
+
+double QwtRingBufferData::x(size_t i) const
+{
+    d_data->lock();
+    const double x =
+        d_data->xBuffer[int((d_data->first() + i) % d_data->capacity)];
+    d_data->unlock();
+
+    return x;
+}
+
+
+double QwtRingBufferData::y(size_t i) const
+{
+    d_data->lock();
+    const double y =
+        d_data->yBuffer[int((d_data->first() + i) % d_data->capacity)];
+    d_data->unlock();
+
+    return y;
+}
+
+
+QwtDoubleRect QwtRingBufferData::boundingRect() const
+{
+    d_data->lock();
+    if (!d_data->rectValid) {
+        Extremes extremes;
+        for (int i = 0; i < d_data->blocks.size(); ++i)
+            extremes.add(d_data->blocks[i]);
+
+        if (extremes.xValid && extremes.yValid)
+            d_data->rect = QwtDoubleRect(
+                extremes.xMin, extremes.yMin,
+                extremes.xMax - extremes.xMin, extremes.yMax - extremes.yMin);
+        else
+            d_data->rect = QwtDoubleRect(1.0, 1.0, -2.0, -2.0); // invalid
+        d_data->rectValid = true;
+    }
+    const QwtDoubleRect rect = d_data->rect;
+    d_data->unlock();
+
+    return rect;
+}
+
+
+size_t QwtRingBufferData::capacity() const
+{
+    d_data->lock();
+    const size_t capacity = d_data->capacity;
+    d_data->unlock();
+
+    return capacity;
+}
+
+
+void QwtRingBufferData::setCapacity(size_t capacity)
+{
+    d_data->lock();
+    d_data->resize(qwtMax(capacity, size_t(1)));
+    d_data->unlock();
+}
+
+
+size_t QwtRingBufferData::dropped() const
+{
+    d_data->lock();
+    const size_t dropped = d_data->count - d_data->size();
+    d_data->unlock();
+
+    return dropped;
+}
+
+
+// waits for curves drawing with a Locker on other threads
+size_t QwtRingBufferData::append(const double *x, const double *y, size_t size)
+{
+    d_data->lock();
+    const size_t capacity = d_data->capacity;
+
+    // only the last capacity samples survive
+    if (size > capacity) {
+        d_data->count += size - capacity;
+        d_data->next = (d_data->next + size - capacity) % capacity;
+        x += size - capacity;
+        y += size - capacity;
+        size = capacity;
+    }
+
+    const size_t begin = d_data->next;
+    for (size_t i = 0; i < size; ++i) {
+        d_data->xBuffer[int(d_data->next)] = x[i];
+        d_data->yBuffer[int(d_data->next)] = y[i];
+        d_data->next = (d_data->next + 1) % capacity;
+    }
+    d_data->count += size;
+
+    // update the blocks holding the appended samples
+    const size_t blockSize = d_data->blockSize;
+    size_t slot = begin;
+    for (size_t remaining = size; remaining > 0;) {
+        const size_t block = slot / blockSize;
+        const size_t done = qwtMin(
+            remaining, qwtMin((block + 1) * blockSize, capacity) - slot);
+        d_data->updateBlock(block);
+        remaining -= done;
+        slot = (slot + done) % capacity;
+    }
+    if (size > 0)
+        d_data->rectValid = false;
+    const size_t first = d_data->size() - size;
+    d_data->unlock();
+
+    return first;
+}
+
+
+void QwtRingBufferData::clear()
+{
+    d_data->lock();
+    d_data->count = 0;
+    d_data->next = 0;
+    d_data->clearBlocks();
+    d_data->rectValid = false;
+    d_data->unlock();
+}
+
+
+QwtRingBufferData::Locker::Locker(const QwtRingBufferData *data):
+    d_data(data ? data->d_data : 0)
+{
+    if (d_data)
+        d_data->lock();
+}
+
+
+QwtRingBufferData::Locker::~Locker()
+{
+    if (d_data)
+        d_data->unlock();
+}
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
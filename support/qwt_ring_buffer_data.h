@@ -0,0 +1,105 @@
+// The header for QwtRingBufferData, a QwtData with a fixed capacity.
+//
+// Copyright (C) 2001-2010 Gerard Vermeulen
+//
+// This file is part of PyQwt.
+//
+// PyQwt is free software; you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation; either version 2 of the License, or
+// (at your option) any later version.
+//
+// PyQwt is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License along
+// with PyQwt; if not, write to the Free Software Foundation, Inc.,
+// 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+//
+// In addition, as a special exception, Gerard Vermeulen gives permission
+// to link PyQwt dynamically with non-free versions of Qt and PyQt,
+// and to distribute PyQwt in this form, provided that equally powerful
+// versions of Qt and PyQt have been released under the terms of the GNU
+// General Public License.
+//
+// If PyQwt is dynamically linked with non-free versions of Qt and PyQt,
+// PyQwt becomes a free plug-in for a non-free program.
+
+
+#ifndef QWT_RING_BUFFER_DATA_H
+#define QWT_RING_BUFFER_DATA_H
+
+#include <qwt_data.h>
+
+// QwtRingBufferData holds the last capacity() samples appended to it.
+//
+// The samples are shared by all copies, so that samples appended to the
+// data held by Python are seen by the copy held by a QwtPlotCurve without
+// calling QwtPlotCurve::setData() again.  The bounding rectangle is kept
+// per block of samples and updated incrementally on each append().
+//
+// The samples are guarded by a mutex, since a curve may be drawn without
+// the GIL while a Python thread appends samples.  Every access takes the
+// mutex, and a Locker keeps all samples in place while it is in scope.
+class QwtRingBufferData: public QwtData
+{
+    class PrivateData;
+
+public:
+    QwtRingBufferData(size_t capacity);
+    virtual ~QwtRingBufferData();
+
+    virtual QwtData *copy() const;
+
+    virtual size_t size() const;
+    virtual double x(size_t i) const;
+    virtual double y(size_t i) const;
+    virtual QwtDoubleRect boundingRect() const;
+
+    size_t capacity() const;
+
+    // keeps the last capacity samples in a new buffer shared by all copies
+    // and resets dropped()
+    void setCapacity(size_t capacity);
+
+    // returns the index of the first appended sample
+    size_t append(const double *x, const double *y, size_t size);
+    void clear();
+
+    // the number of samples overwritten since the last clear(): once it is
+    // positive, each append() shifts the indices of all samples
+    size_t dropped() const;
+
+    // Locker locks the samples of data, so that append() and clear() on
+    // other threads wait, until the locker goes out of scope.  A locker of
+    // a null pointer does nothing.
+    class Locker
+    {
+    public:
+        explicit Locker(const QwtRingBufferData *data);
+        ~Locker();
+
+    private:
+        Locker(const Locker &);
+        Locker &operator=(const Locker &);
+
+        PrivateData *d_data;
+    };
+
+private:
+    QwtRingBufferData(PrivateData *data);
+    QwtRingBufferData(const QwtRingBufferData &);
+    QwtRingBufferData &operator=(const QwtRingBufferData &);
+
+    PrivateData *d_data;
+};
+
+#endif // QWT_RING_BUFFER_DATA_H
+
+// Local Variables:
+// mode: C++
+// c-file-style: "stroustrup"
+// indent-tabs-mode: nil
+// End:
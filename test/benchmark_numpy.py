@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the cost per element of converting Python objects to QwtArrayDouble.
+
+Run as: python benchmark_numpy.py [size ...]
+
+The default sizes are 1e3, 1e5, and 1e7 elements.
+"""
+
+import sys
+import timeit
+try:
+    xrange
+except NameError:
+    xrange = range
+import numpy as np
+from PyQt4.Qwt5 import QwtArrayDouble
+
+
+def inputs(size):
+    x = np.linspace(0.0, 1.0, size)
+    wide = np.linspace(0.0, 1.0, 2*size)
+    return [
+        ('float64', x),
+        ('float64 strided', wide[::2]),
+        ('float64 big-endian', x.astype('>f8')),
+        ('float32', x.astype(np.float32)),
+        ('int16', (np.arange(size) % 32768).astype(np.int16)),
+        ('int32', np.arange(size, dtype=np.int32)),
+        ('int64', np.arange(size, dtype=np.int64)),
+        ('list', x.tolist()),
+        ('tuple', tuple(x.tolist())),
+        ('iterable', xrange(size)),
+        ]
+
+# inputs()
+
+
+def benchmark(size, repeat=5):
+    number = max(1, 1000000 // size)
+    for name, data in inputs(size):
+        timer = timeit.Timer(lambda: QwtArrayDouble(data))
+        seconds = min(timer.repeat(repeat, number)) / number
+        print('%-20s %10d %10.2f ns/element' % (name, size, 1e9*seconds/size))
+
+# benchmark()
+
+
+def main(args):
+    sizes = [int(float(arg)) for arg in args] or [1000, 100000, 10000000]
+    print('%-20s %10s %10s' % ('input', 'size', 'cost'))
+    for size in sizes:
+        benchmark(size)
+
+# main()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
+
+# Local Variables: ***
+# mode: python ***
+# End: ***
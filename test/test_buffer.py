@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import array
+import sys
+import unittest
+from PyQt4.Qt import *
+from PyQt4.Qwt5 import *
+
+
+@unittest.skipIf(sys.version_info < (3, 3),
+                 'memoryview.cast() requires Python-3.3 or later')
+class TestBufferConversionFunctions(unittest.TestCase):
+
+    def testQwtArrayDouble(self):
+        for code in 'bBhHiIlLqQfd':
+            buffer = array.array(code, range(6))
+            result = QwtArrayDouble(buffer)
+            self.assertEqual([result[i] for i in range(len(result))],
+                             [float(i) for i in range(6)])
+
+    # testQwtArrayDouble()
+
+    def testQwtArrayInt(self):
+        buffer = memoryview(array.array('d', [0.5, 1.5, 2.5, 3.5]))[::2]
+        result = QwtArrayInt(buffer)
+        self.assertEqual([result[i] for i in range(len(result))], [0, 2])
+
+    # testQwtArrayInt()
+
+    def testQwtArrayData(self):
+        x = array.array('d', [0.0, 1.0, 2.0])
+        y = array.array('h', [4, -5, 6])
+        data = QwtArrayData(x, y)
+        self.assertEqual(data.size(), 3)
+        self.assertEqual(data.y(1), -5.0)
+        curve = QwtPlotCurve()
+        curve.setData(memoryview(x), memoryview(y))
+        self.assertEqual(curve.dataSize(), 3)
+        self.assertEqual(curve.x(2), 2.0)
+
+    # testQwtArrayData()
+
+    def testQImage(self):
+        buffer = memoryview(array.array('B', range(6))).cast('B', (2, 3))
+        image = toQImage(buffer)
+        self.assertEqual(image.format(), QImage.Format_Indexed8)
+        self.assertEqual(image.size(), QSize(3, 2))
+        self.assertEqual(image.pixelIndex(1, 1), 4)
+        buffer = memoryview(array.array('I', [0xff102030] * 6)).cast(
+            'B').cast('I', (3, 2))
+        image = toQImage(buffer)
+        self.assertEqual(image.format(), QImage.Format_ARGB32)
+        self.assertEqual(image.pixel(1, 2), 0xff102030)
+
+    # testQImage()
+
+    def testString(self):
+        self.assertRaises(TypeError, QwtArrayDouble, b'abc')
+
+    # testString()
+
+# class TestBufferConversionFunctions
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# Local Variables: ***
+# mode: python ***
+# End: ***
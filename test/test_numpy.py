@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import threading
+import time
 import unittest
 import numpy as np
 from PyQt4.Qt import *
@@ -94,10 +96,977 @@ class TestImageConversionFunctions(unittest.TestCase):
         self.assertEqual(image == toQImage(array), True)
 
     # testVerticalLinesIndexed8()
-    
+
+    def testSharedARGB32(self):
+        array = np.zeros((3, 5), dtype=np.uint32)
+        image = toQImage(array, False)
+        self.assertEqual(image.format(), QImage.Format_ARGB32)
+        array[1, 2] = 0xffff0000
+        self.assertEqual(image.pixel(2, 1), 0xffff0000)
+        image.setPixel(4, 2, 0xff00ff00)
+        self.assertEqual(array[2, 4], 0xff00ff00)
+        self.assertEqual(image == toQImage(array, True), True)
+
+    # testSharedARGB32()
+
+    def testSharedIndexed8(self):
+        array = np.zeros((3, 8), dtype=np.uint8)[:, 4:7]
+        image = toQImage(array, False)
+        self.assertEqual(image.bytesPerLine(), 8)
+        array[2, 1] = 7
+        self.assertEqual(image.pixelIndex(1, 2), 7)
+        self.assertRaises(RuntimeError, toQImage, array[:, 1:], False)
+        self.assertRaises(RuntimeError, toQImage, array[:, ::2], False)
+
+    # testSharedIndexed8()
+
+    def testNumpyView(self):
+        image = QImage(3, 2, QImage.Format_ARGB32)
+        image.fill(0xff000000)
+        array = toNumpy(image, False)
+        array[1, 2] = 0xffffffff
+        self.assertEqual(image.pixel(2, 1), 0xffffffff)
+        del image
+        self.assertEqual(array[1, 2], 0xffffffff)
+        self.assertEqual(array[0, 0], 0xff000000)
+
+    # testNumpyView()
+
+    def testScaledUInt16(self):
+        array = np.array([[100, 200], [300, 1120]], dtype=np.uint16)
+        image = toQImage(array)
+        self.assertEqual(image.format(), QImage.Format_Indexed8)
+        self.assertEqual(
+            np.all(toNumpy(image) == [[0, 25], [50, 255]]), True)
+        image = toQImage(array, 200.0, 300.0)
+        self.assertEqual(
+            np.all(toNumpy(image) == [[0, 0], [255, 255]]), True)
+
+    # testScaledUInt16()
+
+    def testScaledFloat(self):
+        for dtype in (np.float32, np.float64):
+            array = np.array([[0.0, 0.5, np.nan], [1.0, -1.0, 2.0]], dtype)
+            image = toQImage(array.T, 0.0, 1.0)
+            self.assertEqual(image.size(), QSize(2, 3))
+            self.assertEqual(
+                np.all(toNumpy(image) == [[0, 255], [128, 0], [0, 255]]),
+                True)
+
+    # testScaledFloat()
+
+    def testRGBA(self):
+        array = np.zeros((2, 3, 4), dtype=np.uint8)
+        array[0, 1] = (255, 128, 0, 64)
+        image = toQImage(array)
+        self.assertEqual(image.format(), QImage.Format_ARGB32)
+        self.assertEqual(image.pixel(1, 0), qRgba(255, 128, 0, 64))
+        image = toQImage(array[:, :, :3])
+        self.assertEqual(image.format(), QImage.Format_RGB32)
+        self.assertEqual(image.pixel(1, 0), qRgb(255, 128, 0))
+        self.assertRaises(RuntimeError, toQImage, array[:, :, :2])
+
+    # testRGBA()
+
+    def testStridedARGB32(self):
+        array = np.arange(12, dtype=np.uint32).reshape(3, 4) | 0xff000000
+        self.assertEqual(np.all(toNumpy(toQImage(array.T)) == array.T), True)
+
+    # testStridedARGB32()
+
 # class TestImageConversionFunctions
 
 
+class TestArrayConversion(unittest.TestCase):
+
+    def testQwtArrayDouble(self):
+        x = np.arange(6.0)
+        for array in (x, x[::2], x[::-1], x.astype('>f8'),
+                      x.astype(np.float32), x.astype(np.int16),
+                      x.astype(np.uint8), x.astype(np.int64),
+                      x.reshape(3, 2)[:, 0]):
+            result = QwtArrayDouble(array)
+            self.assertEqual(len(result), len(array))
+            self.assertEqual([result[i] for i in range(len(result))],
+                             array.tolist())
+
+    # testQwtArrayDouble()
+
+    def testQwtArrayInt(self):
+        x = np.arange(6)
+        for array in (x.astype(np.int32), x.astype(np.int64)[::3],
+                      x.astype(np.float64) + 0.5):
+            result = QwtArrayInt(array)
+            self.assertEqual([result[i] for i in range(len(result))],
+                             array.astype(np.int32).tolist())
+
+    # testQwtArrayInt()
+
+    def testSequences(self):
+        values = [0.0, 1, 2.5, np.float64(3.0), 2**40]
+        for sequence in (values, tuple(values), iter(values),
+                         (value for value in values)):
+            result = QwtArrayDouble(sequence)
+            self.assertEqual([result[i] for i in range(len(result))], values)
+        result = QwtArrayInt(range(100))
+        self.assertEqual([result[i] for i in range(len(result))],
+                         list(range(100)))
+        self.assertRaises(TypeError, QwtArrayDouble, [0.0, 'a'])
+        self.assertRaises(TypeError, QwtArrayDouble, iter([0.0, None]))
+        self.assertRaises(TypeError, QwtArrayDouble, 'abc')
+
+    # testSequences()
+
+# class TestArrayConversion
+
+
+class TestQwtNumPyData(unittest.TestCase):
+
+    def testSharedData(self):
+        x = np.arange(10, dtype=np.float64)
+        y = x**2
+        data = QwtNumPyData(x, y)
+        self.assertEqual(data.size(), len(x))
+        self.assertEqual(data.x(3), 3.0)
+        self.assertEqual(data.y(3), 9.0)
+        self.assertEqual(data.xData() is x, True)
+        self.assertEqual(data.yData() is y, True)
+        y[3] = -1.0
+        self.assertEqual(data.y(3), -1.0)
+
+    # testSharedData()
+
+    def testStridedData(self):
+        x = np.arange(20, dtype=np.float64)
+        y = np.arange(15, dtype=np.int32)
+        data = QwtNumPyData(x[::2], y)
+        self.assertEqual(data.size(), 10)
+        self.assertEqual(data.x(4), 8.0)
+        self.assertEqual(data.y(4), 4.0)
+
+    # testStridedData()
+
+    def testBoundingRect(self):
+        x = np.array([1.0, np.nan, 3.0, 2.0])
+        y = np.array([5.0, 4.0, np.nan, -1.0])
+        data = QwtNumPyData(x, y)
+        self.assertEqual(data.boundingRect(), QRectF(1.0, -1.0, 2.0, 6.0))
+        y[0] = 7.0
+        self.assertEqual(data.boundingRect(), QRectF(1.0, -1.0, 2.0, 6.0))
+        data.invalidate()
+        self.assertEqual(data.boundingRect(), QRectF(1.0, -1.0, 2.0, 8.0))
+        x[:] = np.nan
+        data.invalidate()
+        self.assertEqual(data.boundingRect().isValid(), False)
+
+    # testBoundingRect()
+
+    def testCurveSetData(self):
+        x = np.linspace(0.0, 1.0, 100)
+        y = np.sin(x)
+        curve = QwtPlotCurve()
+        curve.setData(x, y, False)
+        self.assertEqual(isinstance(curve.data(), QwtNumPyData), True)
+        self.assertEqual(curve.dataSize(), len(x))
+        self.assertEqual(curve.y(10), y[10])
+        curve.setData(x, y)
+        self.assertEqual(isinstance(curve.data(), QwtCachedArrayData), True)
+        curve.setData(list(x), list(y), False)
+        self.assertEqual(curve.dataSize(), len(x))
+
+    # testCurveSetData()
+
+# class TestQwtNumPyData
+
+
+class TestQwtCachedArrayData(unittest.TestCase):
+
+    def testBoundingRect(self):
+        x = np.array([np.nan, 1.0, 3.0, 2.0])
+        y = np.array([5.0, 4.0, np.nan, -1.0])
+        data = QwtCachedArrayData(x, y)
+        self.assertEqual(data.boundingRect(), QRectF(1.0, -1.0, 2.0, 6.0))
+        self.assertEqual(data.copy().boundingRect(), data.boundingRect())
+        curve = QwtPlotCurve()
+        curve.setData(list(x), list(y))
+        self.assertEqual(curve.boundingRect(), data.boundingRect())
+
+    # testBoundingRect()
+
+    def testUpdateData(self):
+        curve = QwtPlotCurve()
+        curve.setData(np.arange(4.0), np.zeros(4))
+        self.assertEqual(curve.boundingRect(), QRectF(0.0, 0.0, 3.0, 0.0))
+        curve.updateData(np.array([5.0, 6.0]), np.array([1.0, 2.0]), 2)
+        self.assertEqual([curve.x(i) for i in range(4)], [0.0, 1.0, 5.0, 6.0])
+        self.assertEqual([curve.y(i) for i in range(4)], [0.0, 0.0, 1.0, 2.0])
+        self.assertEqual(curve.boundingRect(), QRectF(0.0, 0.0, 6.0, 2.0))
+        self.assertRaises(
+            RuntimeError, curve.updateData, [0.0, 1.0], [0.0, 1.0], 3)
+        self.assertRaises(RuntimeError, curve.updateData, [0.0], [0.0, 1.0])
+
+    # testUpdateData()
+
+    def testUpdateSharedData(self):
+        x = np.arange(4.0)
+        y = np.zeros(4)
+        curve = QwtPlotCurve()
+        curve.setData(x, y, False)
+        curve.updateData([7.0], [8.0], 1)
+        self.assertEqual(list(x), [0.0, 7.0, 2.0, 3.0])
+        self.assertEqual(list(y), [0.0, 8.0, 0.0, 0.0])
+        self.assertEqual(curve.boundingRect(), QRectF(0.0, 0.0, 7.0, 8.0))
+        y.flags.writeable = False
+        self.assertRaises(RuntimeError, curve.updateData, [0.0], [0.0])
+
+    # testUpdateSharedData()
+
+# class TestQwtCachedArrayData
+
+
+class TestQwtScaleMap(unittest.TestCase):
+
+    def testLinearTransformArray(self):
+        map = QwtScaleMap(0, 400, -1.0, 3.0)
+        x = np.linspace(-2.0, 4.0, 17)
+        self.assertEqual(map.transformArray(x).dtype, np.int32)
+        self.assertEqual(
+            list(map.transformArray(x)), [map.transform(v) for v in x])
+        self.assertEqual(
+            list(map.xTransformArray(x)), [map.xTransform(v) for v in x])
+        self.assertEqual(
+            list(map.invTransformArray(x)), [map.invTransform(v) for v in x])
+
+    # testLinearTransformArray()
+
+    def testLog10TransformArray(self):
+        map = QwtScaleMap(0, 400, 1.0, 1000.0)
+        map.setTransformation(QwtScaleTransformation(QwtScaleTransformation.Log10))
+        x = np.logspace(-1.0, 4.0, 11)
+        self.assertEqual(
+            list(map.transformArray(x)), [map.transform(v) for v in x])
+        p = np.arange(0.0, 400.0, 25.0)
+        self.assertEqual(np.allclose(
+            map.invTransformArray(p), [map.invTransform(v) for v in p]), True)
+
+    # testLog10TransformArray()
+
+    def testTransformArrayShape(self):
+        map = QwtScaleMap(0, 100, 0.0, 1.0)
+        x = np.zeros((3, 4))
+        self.assertEqual(map.transformArray(x).shape, (3, 4))
+
+    # testTransformArrayShape()
+
+# class TestQwtScaleMap
+
+
+class TestPolygonConversionFunctions(unittest.TestCase):
+
+    def testToQwtPolygon(self):
+        x = np.array([0.0, 1.4, 2.6])
+        y = np.array([3.0, 4.0, 5.0])
+        polygon = toQwtPolygon(x, y)
+        self.assertEqual(polygon, QPolygon([QPoint(0, 3),
+                                            QPoint(1, 4),
+                                            QPoint(3, 5)]))
+        self.assertEqual(toQwtPolygon(np.column_stack((x, y))), polygon)
+
+    # testToQwtPolygon()
+
+    def testToQPolygonF(self):
+        x = np.array([0.0, 1.5, 2.5])
+        y = np.array([3.0, 4.0, 5.0])
+        polygon = toQPolygonF(x, y)
+        self.assertEqual(polygon, QPolygonF([QPointF(0.0, 3.0),
+                                             QPointF(1.5, 4.0),
+                                             QPointF(2.5, 5.0)]))
+        self.assertEqual(toQPolygonF(np.column_stack((x, y))), polygon)
+
+    # testToQPolygonF()
+
+    def testMappedPolygons(self):
+        xMap = QwtScaleMap(0, 200, 0.0, 10.0)
+        yMap = QwtScaleMap(100, 0, -1.0, 1.0)
+        x = np.linspace(0.0, 10.0, 101)
+        y = np.sin(x)
+        polygon = toQwtPolygon(xMap, yMap, x, y)
+        self.assertEqual(polygon.size(), len(x))
+        for i in range(len(x)):
+            self.assertEqual(polygon[i].x(), xMap.transform(x[i]))
+            self.assertEqual(polygon[i].y(), yMap.transform(y[i]))
+        polygon = toQPolygonF(xMap, yMap, np.column_stack((x, y)))
+        for i in range(len(x)):
+            self.assertEqual(polygon[i].x(), xMap.xTransform(x[i]))
+            self.assertEqual(polygon[i].y(), yMap.xTransform(y[i]))
+
+    # testMappedPolygons()
+
+# class TestPolygonConversionFunctions
+
+
+
+class TestQwtPlotDecimatedCurve(unittest.TestCase):
+
+    def render(self, curve, x, y=None):
+        image = QImage(200, 100, QImage.Format_ARGB32)
+        image.fill(0xffffffff)
+        if y is None:
+            curve.setData(x)
+            x, y = x.xData(), x.yData()
+        else:
+            curve.setData(x, y)
+        xMap = QwtScaleMap(0, image.width(), x.min(), x.max())
+        yMap = QwtScaleMap(image.height(), 0, y.min(), y.max())
+        painter = QPainter(image)
+        curve.draw(painter, xMap, yMap, image.rect())
+        del painter
+        return image
+
+    # render()
+
+    def testSamePicture(self):
+        x = np.linspace(0.0, 10.0, 100000)
+        y = np.sin(x) + np.random.uniform(-0.2, 0.2, len(x))
+        full = self.render(QwtPlotCurve(), x, y)
+        decimated = self.render(QwtPlotDecimatedCurve(), x, y)
+        self.assertEqual(full == decimated, True)
+
+    # testSamePicture()
+
+    def testLevelOfDetail(self):
+        x = np.linspace(0.0, 10.0, 100000)
+        y = np.cos(x) + np.random.uniform(-0.2, 0.2, len(x))
+        full = self.render(QwtPlotCurve(), x, y)
+        curve = QwtPlotDecimatedCurve()
+        data = QwtNumPyData(x, y)
+        self.assertEqual(data.levelOfDetail(), True)
+        curve.setData(data)
+        self.assertEqual(full == self.render(curve, data), True)
+        data.setLevelOfDetail(False)
+        self.assertEqual(full == self.render(curve, data), True)
+
+    # testLevelOfDetail()
+
+    def testDecimated(self):
+        curve = QwtPlotDecimatedCurve()
+        self.assertEqual(curve.isDecimated(), True)
+        curve.setDecimated(False)
+        self.assertEqual(curve.isDecimated(), False)
+        self.assertEqual(curve.rtti(), QwtPlotItem.Rtti_PlotCurve)
+
+    # testDecimated()
+
+    def testInvalidateWhileDrawing(self):
+        x = np.linspace(0.0, 10.0, 100000)
+        y = np.sin(x)
+        data = QwtNumPyData(x, y)
+        curve = QwtPlotDecimatedCurve()
+        curve.setData(data)
+        done = []
+
+        def write():
+            while not done:
+                curve.updateData(x[:100], y[:100])
+                data.invalidate()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for i in range(20):
+                self.render(curve, data)
+        finally:
+            done.append(True)
+            writer.join()
+        data.invalidate()
+        full = self.render(QwtPlotCurve(), x, y)
+        self.assertEqual(full == self.render(curve, data), True)
+
+    # testInvalidateWhileDrawing()
+
+# class TestQwtPlotDecimatedCurve
+
+
+class TestQwtRingBufferData(unittest.TestCase):
+
+    def testAppend(self):
+        data = QwtRingBufferData(1000)
+        self.assertEqual(data.capacity(), 1000)
+        self.assertEqual(data.size(), 0)
+        self.assertEqual(data.boundingRect().isValid(), False)
+        x = np.arange(600, dtype=np.float64)
+        self.assertEqual(data.append(x, -x), 0)
+        self.assertEqual(data.append(x + 600, -x - 600), 400)
+        self.assertEqual(data.size(), 1000)
+        self.assertEqual(data.x(0), 200.0)
+        self.assertEqual(data.y(999), -1199.0)
+        self.assertEqual(data.boundingRect(),
+                         QRectF(200.0, -1199.0, 999.0, 999.0))
+        data.clear()
+        self.assertEqual(data.size(), 0)
+
+    # testAppend()
+
+    def testAppendMoreThanCapacity(self):
+        data = QwtRingBufferData(100)
+        x = np.arange(250, dtype=np.float64)
+        self.assertEqual(data.append(x, x), 0)
+        self.assertEqual(data.size(), 100)
+        self.assertEqual([data.x(i) for i in range(100)], list(x[150:]))
+        self.assertEqual(data.boundingRect(),
+                         QRectF(150.0, 150.0, 99.0, 99.0))
+
+    # testAppendMoreThanCapacity()
+
+    def testSharedWithCurve(self):
+        data = QwtRingBufferData(100)
+        curve = QwtPlotCurve()
+        curve.setData(data)
+        data.append([1.0, 2.0], [3.0, np.nan])
+        self.assertEqual(curve.dataSize(), 2)
+        self.assertEqual(curve.boundingRect(), QRectF(1.0, 3.0, 1.0, 0.0))
+
+    # testSharedWithCurve()
+
+    def testDropped(self):
+        data = QwtRingBufferData(10)
+        data.append(np.arange(8.0), np.arange(8.0))
+        self.assertEqual(data.dropped(), 0)
+        data.append(np.arange(5.0), np.arange(5.0))
+        self.assertEqual(data.dropped(), 3)
+        data.clear()
+        self.assertEqual(data.dropped(), 0)
+
+    # testDropped()
+
+    def testSetCapacity(self):
+        data = QwtRingBufferData(10)
+        curve = QwtPlotCurve()
+        curve.setData(data)
+        data.append(np.arange(12.0), -np.arange(12.0))
+        data.setCapacity(20)
+        self.assertEqual(data.capacity(), 20)
+        self.assertEqual(data.dropped(), 0)
+        self.assertEqual(curve.dataSize(), 10)
+        self.assertEqual(curve.x(0), 2.0)
+        self.assertEqual(data.append(np.arange(5.0), np.arange(5.0)), 10)
+        self.assertEqual(curve.dataSize(), 15)
+        self.assertEqual(curve.boundingRect(),
+                         QRectF(0.0, -11.0, 11.0, 15.0))
+        data.setCapacity(4)
+        self.assertEqual([data.x(i) for i in range(4)], [1.0, 2.0, 3.0, 4.0])
+
+    # testSetCapacity()
+
+    def testAppendWhileDrawing(self):
+        application = QApplication.instance() or QApplication([])
+        plot = QwtPlot()
+        plot.setAxisScale(QwtPlot.xBottom, 0.0, 1000.0)
+        plot.setAxisScale(QwtPlot.yLeft, 0.0, 1000.0)
+        data = QwtRingBufferData(500)
+        curve = QwtPlotCurve()
+        curve.setData(data)
+        curve.attach(plot)
+        plot.replot()
+        x = np.arange(1000.0)
+        done = []
+
+        def write():
+            while not done:
+                data.append(x[:100], x[:100])
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for i in range(20):
+                plot.replot()
+                curve.drawAppended(0)
+        finally:
+            done.append(True)
+            writer.join()
+        self.assertEqual(data.size(), 500)
+        self.assertEqual([data.x(i) for i in range(100)], list(x[:100]))
+
+    # testAppendWhileDrawing()
+
+    def testDrawAppendedWrapped(self):
+        application = QApplication.instance() or QApplication([])
+        plot = QwtPlot()
+        plot.setAxisScale(QwtPlot.xBottom, 0.0, 100.0)
+        plot.setAxisScale(QwtPlot.yLeft, 0.0, 100.0)
+        data = QwtRingBufferData(10)
+        curve = QwtPlotCurve()
+        curve.setData(data)
+        curve.attach(plot)
+        plot.replot()
+        start = data.append(np.arange(8.0), np.arange(8.0))
+        self.assertEqual(curve.drawAppended(start), True)
+        # the indices of all samples have moved
+        start = data.append(np.arange(8.0, 12.0), np.arange(8.0, 12.0))
+        self.assertEqual(curve.drawAppended(start), False)
+
+    # testDrawAppendedWrapped()
+
+# class TestQwtRingBufferData
+
+
+class TestReleaseGIL(unittest.TestCase):
+
+    def tearDown(self):
+        setReleaseGIL(True)
+
+    # tearDown()
+
+    def testSwitch(self):
+        self.assertEqual(testReleaseGIL(), True)
+        setReleaseGIL(False)
+        self.assertEqual(testReleaseGIL(), False)
+
+    # testSwitch()
+
+    def testPythonReimplementation(self):
+
+        class Curve(QwtPlotCurve):
+            calls = 0
+
+            def drawCurve(self, *args):
+                Curve.calls += 1
+                QwtPlotCurve.drawCurve(self, *args)
+
+        image = QImage(100, 100, QImage.Format_ARGB32)
+        curve = Curve()
+        curve.setData(np.arange(10.0), np.arange(10.0))
+        painter = QPainter(image)
+        for on in (True, False):
+            setReleaseGIL(on)
+            curve.draw(painter, QwtScaleMap(0, 100, 0.0, 10.0),
+                       QwtScaleMap(100, 0, 0.0, 10.0), image.rect())
+        del painter
+        self.assertEqual(Curve.calls, 2)
+
+    # testPythonReimplementation()
+
+# class TestReleaseGIL
+
+
+class TestQwtArrayRasterData(unittest.TestCase):
+
+    def testNearestNeighbour(self):
+        array = np.array([[0.0, 1.0, 2.0], [3.0, np.nan, 5.0]])
+        data = QwtArrayRasterData(array, QRectF(0.0, 0.0, 3.0, 2.0))
+        self.assertEqual(data.resampleMode(),
+                         QwtArrayRasterData.NearestNeighbour)
+        self.assertEqual(data.value(0.5, 0.5), 0.0)
+        self.assertEqual(data.value(2.9, 0.1), 2.0)
+        self.assertEqual(data.value(0.2, 1.9), 3.0)
+        self.assertEqual(data.value(-1.0, 5.0), 3.0)
+        self.assertEqual(data.range().minValue(), 0.0)
+        self.assertEqual(data.range().maxValue(), 5.0)
+        self.assertEqual(data.rasterHint(QRectF(0.0, 0.0, 1.5, 1.0)),
+                         QSize(2, 1))
+
+    # testNearestNeighbour()
+
+    def testBilinearInterpolation(self):
+        array = np.array([[0.0, 1.0], [2.0, 3.0]])
+        data = QwtArrayRasterData(array, QRectF(0.0, 0.0, 2.0, 2.0))
+        data.setResampleMode(QwtArrayRasterData.BilinearInterpolation)
+        self.assertEqual(data.value(0.5, 0.5), 0.0)
+        self.assertEqual(data.value(1.0, 0.5), 0.5)
+        self.assertEqual(data.value(1.0, 1.0), 1.5)
+        self.assertEqual(data.value(1.5, 1.5), 3.0)
+        self.assertEqual(data.copy().value(1.0, 1.0), 1.5)
+
+    # testBilinearInterpolation()
+
+    def testSharedArray(self):
+        array = np.zeros((4, 4))
+        data = QwtArrayRasterData(array, QRectF(0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(data.array() is array, True)
+        self.assertEqual(data.range().maxValue(), 0.0)
+        array[0, 0] = 1.0
+        self.assertEqual(data.range().maxValue(), 0.0)
+        data.invalidate()
+        self.assertEqual(data.range().maxValue(), 1.0)
+
+    # testSharedArray()
+
+    def testEmptyRect(self):
+        data = QwtArrayRasterData(np.ones((2, 2)), QRectF(0.0, 0.0, 0.0, 1.0))
+        self.assertEqual(np.isnan(data.value(0.0, 0.5)), True)
+        self.assertEqual(data.rasterHint(QRectF(0.0, 0.0, 1.0, 1.0)).isValid(),
+                         False)
+        data.setBoundingRect(QRectF(0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(data.value(0.5, 0.5), 1.0)
+        self.assertEqual(np.isnan(data.value(np.nan, 0.5)), True)
+        self.assertEqual(data.value(np.inf, 0.5), 1.0)
+
+    # testEmptyRect()
+
+# class TestQwtArrayRasterData
+
+
+class TestQwtGridRasterData(unittest.TestCase):
+
+    def testValueGrid(self):
+
+        class Data(QwtGridRasterData):
+            calls = 0
+
+            def copy(self):
+                return self
+
+            def range(self):
+                return QwtDoubleInterval(0.0, 10.0)
+
+            def valueGrid(self, rect, size):
+                Data.calls += 1
+                return np.arange(size.width() * size.height(),
+                                 dtype=np.float64).reshape(
+                    size.height(), size.width())
+
+        data = Data(QRectF(0.0, 0.0, 4.0, 2.0))
+        data.initRaster(QRectF(0.0, 0.0, 4.0, 2.0), QSize(4, 2))
+        self.assertEqual(data.value(0.5, 0.5), 0.0)
+        self.assertEqual(data.value(3.5, 0.5), 3.0)
+        self.assertEqual(data.value(1.5, 1.5), 5.0)
+        data.discardRaster()
+        self.assertEqual(Data.calls, 1)
+
+    # testValueGrid()
+
+    def testValues(self):
+
+        class Data(QwtGridRasterData):
+
+            def copy(self):
+                return self
+
+            def range(self):
+                return QwtDoubleInterval(0.0, 10.0)
+
+            def values(self, x, y):
+                return x + 10 * y
+
+        data = Data(QRectF(0.0, 0.0, 4.0, 2.0))
+        self.assertEqual(np.isnan(data.value(0.5, 0.5)), True)
+        data.initRaster(QRectF(0.0, 0.0, 4.0, 2.0), QSize(4, 2))
+        self.assertEqual(data.value(0.6, 0.4), 5.5)
+        self.assertEqual(data.value(2.4, 1.6), 17.5)
+
+    # testValues()
+
+    def testPixelPositions(self):
+
+        class Data(QwtGridRasterData):
+
+            def copy(self):
+                return self
+
+            def valueGrid(self, rect, size):
+                return np.arange(size.width() * size.height(),
+                                 dtype=np.float64).reshape(
+                    size.height(), size.width())
+
+        # QwtPlotSpectrogram samples the raster at the pixel edges
+        rect = QRectF(0.1, 0.3, 0.7, 0.9)
+        nx, ny = 37, 29
+        xMap = QwtScaleMap(0, nx, rect.left(), rect.right())
+        yMap = QwtScaleMap(0, ny, rect.top(), rect.bottom())
+        data = Data(rect)
+        data.initRaster(rect, QSize(nx, ny))
+        for i in range(ny):
+            for j in range(nx):
+                self.assertEqual(
+                    data.value(xMap.invTransform(j), yMap.invTransform(i)),
+                    i * nx + j)
+        data.discardRaster()
+
+    # testPixelPositions()
+
+    def testContourLines(self):
+
+        class Values(QwtGridRasterData):
+
+            def copy(self):
+                return self
+
+            def range(self):
+                return QwtDoubleInterval(0.0, 3.0)
+
+            def values(self, x, y):
+                return x + 2 * y
+
+        class ValueGrid(Values):
+
+            def valueGrid(self, rect, size):
+                nx, ny = size.width(), size.height()
+                x = rect.left() + (np.arange(nx) + 0.5) * rect.width() / nx
+                y = rect.top() + (np.arange(ny) + 0.5) * rect.height() / ny
+                return x[np.newaxis, :] + 2 * y[:, np.newaxis]
+
+        # the contour lines of x + 2*y lie exactly on x + 2*y == level
+        rect = QRectF(0.0, 0.0, 1.0, 1.0)
+        levels = [0.35, 1.5, 2.75]
+        for Data in (Values, ValueGrid):
+            data = Data(rect)
+            lines = data.contourLines(rect, QSize(11, 11), levels, 0)
+            self.assertEqual(sorted(lines.keys()), levels)
+            for level in levels:
+                self.assertEqual(len(lines[level]) > 0, True)
+                for point in lines[level]:
+                    self.assertEqual(
+                        abs(point.x() + 2 * point.y() - level) < 1e-9, True)
+            # initRaster() outside contourLines() looks up cells again
+            data.initRaster(rect, QSize(2, 2))
+            self.assertEqual(data.value(0.1, 0.1), 0.75)
+            data.discardRaster()
+
+    # testContourLines()
+
+# class TestQwtGridRasterData
+
+
+class TestQwtColorMap(unittest.TestCase):
+
+    def testMapArray(self):
+        interval = QwtDoubleInterval(0.0, 255.0)
+        for colorMap in (QwtLinearColorMap(Qt.black, Qt.white),
+                         QwtAlphaColorMap(Qt.red)):
+            array = np.array([[0.0, 100.0, 255.0], [np.nan, -1.0, 256.0]])
+            result = colorMap.mapArray(interval, array, QColor(Qt.green))
+            self.assertEqual(result.dtype, np.uint32)
+            self.assertEqual(result.shape, (2, 3))
+            for i, value in enumerate(array[0]):
+                self.assertEqual(result[0, i], colorMap.rgb(interval, value))
+            for i in range(3):
+                self.assertEqual(result[1, i], QColor(Qt.green).rgba())
+
+    # testMapArray()
+
+    def testMapImage(self):
+        interval = QwtDoubleInterval(0.0, 1.0)
+        colorMap = QwtLinearColorMap(Qt.black, Qt.white)
+        array = np.array([[0.0, 1.0], [np.nan, 0.5]])
+        image = colorMap.mapImage(interval, array)
+        self.assertEqual(image.format(), QImage.Format_ARGB32)
+        self.assertEqual(image.size(), QSize(2, 2))
+        self.assertEqual(image.pixel(0, 0), colorMap.rgb(interval, 0.0))
+        self.assertEqual(image.pixel(1, 0), colorMap.rgb(interval, 1.0))
+        self.assertEqual(image.pixel(0, 1), 0)
+        self.assertEqual(
+            np.all(toNumpy(image) == colorMap.mapArray(interval, array)), True)
+
+    # testMapImage()
+
+# class TestQwtColorMap
+
+
+class TestContourLines(unittest.TestCase):
+
+    def setUp(self):
+        x = np.linspace(-1.0, 1.0, 21)
+        array = np.add.outer(x**2, x**2)
+        self.rect = QRectF(-1.0, -1.0, 2.0, 2.0)
+        self.data = QwtArrayRasterData(array, self.rect)
+        self.data.setResampleMode(QwtArrayRasterData.BilinearInterpolation)
+
+    # setUp()
+
+    def testContourArrays(self):
+        lines = self.data.contourLines(self.rect, QSize(21, 21), [0.5], 0)
+        arrays = self.data.contourArrays(self.rect, QSize(21, 21), [0.5])
+        self.assertEqual(list(arrays.keys()), [0.5])
+        segments = arrays[0.5]
+        self.assertEqual(segments.dtype, np.float64)
+        self.assertEqual(segments.shape, (lines[0.5].size(), 2))
+        self.assertEqual(segments.shape[0] % 2, 0)
+        self.assertEqual(segments[0, 0], lines[0.5][0].x())
+        radius = np.hypot(segments[:, 0], segments[:, 1])
+        self.assertEqual(np.all(abs(radius - np.sqrt(0.5)) < 0.05), True)
+
+    # testContourArrays()
+
+    def testContourCache(self):
+        spectrogram = QwtPlotCachedSpectrogram()
+        spectrogram.setData(self.data)
+        spectrogram.setContourLevels([0.25, 0.5])
+        size = QSize(21, 21)
+        first = spectrogram.contourArrays(self.rect, size)
+        spectrogram.contourArrays(self.rect, size)
+        self.assertEqual(spectrogram.contourRenders(), 1)
+        self.assertEqual(sorted(first.keys()), [0.25, 0.5])
+        spectrogram.setContourLevels([0.5])
+        spectrogram.contourLines(self.rect, size)
+        self.assertEqual(spectrogram.contourRenders(), 2)
+        spectrogram.contourLines(self.rect, QSize(11, 11))
+        self.assertEqual(spectrogram.contourRenders(), 3)
+        spectrogram.setData(self.data)
+        spectrogram.contourLines(self.rect, QSize(11, 11))
+        self.assertEqual(spectrogram.contourRenders(), 4)
+
+    # testContourCache()
+
+# class TestContourLines
+
+
+class TestQwtPlotCachedSpectrogram(unittest.TestCase):
+
+    def setUp(self):
+        x = np.linspace(-1.0, 1.0, 21)
+        array = np.add.outer(x**2, x**2)
+        self.rect = QRectF(-1.0, -1.0, 2.0, 2.0)
+        self.data = QwtArrayRasterData(array, self.rect)
+        self.data.setResampleMode(QwtArrayRasterData.BilinearInterpolation)
+        self.xMap, self.yMap = QwtScaleMap(), QwtScaleMap()
+        self.xMap.setPaintInterval(0, 200)
+        self.xMap.setScaleInterval(-1.0, 1.0)
+        self.yMap.setPaintInterval(150, 0)
+        self.yMap.setScaleInterval(-1.0, 1.0)
+        self.spectrogram = QwtPlotCachedSpectrogram()
+        self.spectrogram.setData(self.data)
+
+    # setUp()
+
+    def render(self, area=None):
+        if area is None:
+            area = self.rect
+        return self.spectrogram.renderImage(self.xMap, self.yMap, area)
+
+    # render()
+
+    def testThreadedRendering(self):
+        self.assertEqual(self.spectrogram.isReentrantData(), True)
+        self.assertEqual(self.spectrogram.isReentrantColorMap(), True)
+        self.assertEqual(self.spectrogram.renderThreadCount(), 1)
+        serial = toNumpy(self.render())
+        self.spectrogram.setRenderThreadCount(4)
+        threaded = toNumpy(self.render())
+        self.assertEqual(threaded.shape, serial.shape)
+        self.assertEqual(np.all(threaded == serial), True)
+
+        class Data(QwtRasterData):
+            def copy(self):
+                return Data(self.boundingRect())
+            def value(self, x, y):
+                return x
+            def range(self):
+                return QwtDoubleInterval(-1.0, 1.0)
+
+        self.spectrogram.setData(Data(self.rect))
+        self.assertEqual(self.spectrogram.isReentrantData(), False)
+        self.assertEqual(self.render().isNull(), False)
+
+    # testThreadedRendering()
+
+    def testTileCache(self):
+        rect = self.spectrogram.transform(self.xMap, self.yMap, self.rect)
+        self.spectrogram.setTileCacheSize(16384)
+        self.assertEqual(self.spectrogram.tileCacheSize(), 16384)
+        first = toNumpy(self.render())
+        self.assertEqual(first.shape, (rect.height(), rect.width()))
+        self.assertEqual(self.spectrogram.tileRenders(), 4)
+        self.xMap.setScaleInterval(-0.9, 1.1)
+        area = QRectF(-0.9, -1.0, 2.0, 2.0)
+        second = toNumpy(self.render(area))
+        self.assertEqual(self.spectrogram.tileRenders(), 4)
+        self.assertEqual(np.all(second[:, :-10] == first[:, 10:]), True)
+        self.spectrogram.invalidateTiles()
+        self.render(area)
+        self.assertEqual(self.spectrogram.tileRenders(), 8)
+        self.spectrogram.setRenderThreadCount(4)
+        self.spectrogram.invalidateTiles()
+        threaded = toNumpy(self.render(area))
+        self.assertEqual(self.spectrogram.tileRenders(), 12)
+        self.assertEqual(np.all(threaded == second), True)
+
+    # testTileCache()
+
+    def testTileScaleLevels(self):
+        self.spectrogram.setTileCacheSize(65536)
+        for zoom in range(1, 10):
+            self.xMap.setScaleInterval(-1.0 / zoom, 1.0 / zoom)
+            self.render()
+        renders = self.spectrogram.tileRenders()
+        self.render()
+        self.assertEqual(self.spectrogram.tileRenders(), renders)
+        # the tiles of the first of 9 scale levels have been dropped
+        self.xMap.setScaleInterval(-1.0, 1.0)
+        self.render()
+        self.assertEqual(self.spectrogram.tileRenders() > renders, True)
+
+    # testTileScaleLevels()
+
+    def testProgressiveRendering(self):
+        full = toNumpy(self.render())
+        self.spectrogram.setProgressive(True)
+        self.assertEqual(self.spectrogram.isProgressive(), True)
+        self.assertEqual(self.spectrogram.previewFraction(), 0.25)
+        preview = toNumpy(self.render())
+        self.assertEqual(preview.shape[0] < full.shape[0], True)
+        self.assertEqual(preview.shape[1] < full.shape[1], True)
+        while self.spectrogram.isRefining():
+            time.sleep(0.01)
+        refined = toNumpy(self.render())
+        self.assertEqual(refined.shape, full.shape)
+        self.assertEqual(np.all(refined == full), True)
+        self.xMap.setScaleInterval(-0.5, 0.5)
+        self.render(QRectF(-0.5, -1.0, 1.0, 2.0))
+        self.spectrogram.cancelRefinement()
+        self.assertEqual(self.spectrogram.isRefining(), False)
+
+    # testProgressiveRendering()
+
+    def testProgressivePaintCache(self):
+        application = QApplication.instance() or QApplication([])
+        plot = QwtPlot()
+        canvas = plot.canvas()
+        self.assertEqual(
+            canvas.testPaintAttribute(QwtPlotCanvas.PaintCached), True)
+        self.spectrogram.attach(plot)
+        self.spectrogram.setProgressive(True)
+        plot.resize(400, 300)
+        plot.show()
+        plot.replot()
+        while self.spectrogram.isRefining():
+            time.sleep(0.01)
+        # the refinement replots the plot by a queued call
+        application.processEvents()
+        refined = canvas.paintCache().toImage()
+        self.spectrogram.setProgressive(False)
+        plot.replot()
+        self.assertEqual(canvas.paintCache().toImage() == refined, True)
+        self.spectrogram.detach()
+
+    # testProgressivePaintCache()
+
+    def testProgressiveGridData(self):
+
+        class Data(QwtGridRasterData):
+            def copy(self):
+                return self
+            def range(self):
+                return QwtDoubleInterval(-1.0, 1.0)
+            def valueGrid(self, rect, size):
+                return np.zeros((size.height(), size.width()))
+
+        self.assertEqual(self.spectrogram.isRefinableData(), True)
+        data = Data(self.rect)
+        self.spectrogram.setData(data)
+        self.assertEqual(self.spectrogram.isReentrantData(), True)
+        self.assertEqual(self.spectrogram.isRefinableData(), False)
+        self.spectrogram.setProgressive(True)
+        rect = self.spectrogram.transform(self.xMap, self.yMap, self.rect)
+        self.assertEqual(self.render().size(), rect.size())
+        self.assertEqual(self.spectrogram.isRefining(), False)
+        self.spectrogram.setProgressive(False)
+        self.spectrogram.setData(self.data)
+
+    # testProgressiveGridData()
+
+# class TestQwtPlotCachedSpectrogram
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from PyQt4.Qt import *
+from PyQt4.Qwt5 import *
+
+
+class TestDrawAppended(unittest.TestCase):
+
+    def setUp(self):
+        self.application = QApplication.instance() or QApplication([])
+
+    # setUp()
+
+    def testDrawAppended(self):
+        plot = QwtPlot()
+        curve = QwtPlotCurve()
+        # nothing to replot
+        self.assertEqual(curve.drawAppended(0), True)
+        curve.attach(plot)
+        x, y = [0.0, 1.0, 2.0], [0.0, 1.0, 2.0]
+        curve.setData(x, y)
+        plot.replot()
+        x.append(3.0)
+        y.append(1.0)
+        curve.setData(x, y)
+        self.assertEqual(curve.drawAppended(3), False)
+        x.append(2.5)
+        y.append(1.5)
+        curve.setData(x, y)
+        self.assertEqual(curve.drawAppended(4), True)
+        self.assertEqual(curve.drawAppended(5), True)
+        plot.setAxisScale(QwtPlot.xBottom, 0.0, 1.0)
+        x.append(7.0)
+        y.append(1.0)
+        curve.setData(x, y)
+        self.assertEqual(curve.drawAppended(5), True)
+
+    # testDrawAppended()
+
+    def testPaintCache(self):
+        plot = QwtPlot()
+        plot.setAxisScale(QwtPlot.xBottom, 0.0, 10.0)
+        plot.setAxisScale(QwtPlot.yLeft, 0.0, 10.0)
+        curve = QwtPlotCurve()
+        curve.setPen(QPen(Qt.red, 3))
+        curve.attach(plot)
+        curve.setData([1.0, 2.0], [1.0, 2.0])
+        plot.resize(400, 300)
+        plot.show()
+        plot.replot()
+        self.application.processEvents()
+        canvas = plot.canvas()
+        self.assertEqual(
+            canvas.testPaintAttribute(QwtPlotCanvas.PaintCached), True)
+        before = canvas.paintCache().toImage()
+        curve.setData([1.0, 2.0, 8.0], [1.0, 2.0, 8.0])
+        self.assertEqual(curve.drawAppended(2), True)
+        after = canvas.paintCache().toImage()
+        self.assertEqual(before == after, False)
+        # the cache covers the contents rectangle of the canvas
+        origin = canvas.contentsRect().topLeft()
+        x = plot.canvasMap(QwtPlot.xBottom).transform(5.0) - origin.x()
+        y = plot.canvasMap(QwtPlot.yLeft).transform(5.0) - origin.y()
+        self.assertEqual(QColor(after.pixel(x, y)), QColor(Qt.red))
+
+    # testPaintCache()
+
+    def testQpltAppend(self):
+        from PyQt4.Qwt5.qplt import Curve, Plot
+        plot = Plot()
+        curve = Curve([0.0, 1.0], [0.0, 1.0])
+        self.assertRaises(ValueError, plot.append, curve, [2.0], [2.0])
+        plot.plot(curve)
+        plot.append(curve, [2.0], [2.0])
+        data = curve.data
+        self.assertEqual(isinstance(curve.item.data(), QwtRingBufferData),
+                         True)
+        for i in range(3, 100):
+            plot.append(curve, [float(i)], [float(i)])
+        self.assertEqual(curve.data is data, True)
+        self.assertEqual(curve.item.dataSize(), 100)
+        self.assertEqual(curve.item.x(99), 99.0)
+        self.assertRaises(ValueError, plot.append, curve, [1.0], [])
+        samples = [float(i) for i in range(100, 2000)]
+        plot.append(curve, samples, samples)
+        self.assertEqual(curve.data is data, True)
+        self.assertEqual(data.capacity() >= 2000, True)
+        self.assertEqual(curve.item.dataSize(), 2000)
+        self.assertEqual(curve.item.x(1), 1.0)
+        self.assertEqual(curve.item.y(1999), 1999.0)
+
+    # testQpltAppend()
+
+# class TestDrawAppended
+
+
+class TestQwtReplotScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.application = QApplication.instance() or QApplication([])
+
+    # setUp()
+
+    def testCoalescing(self):
+        plot = QwtPlot()
+        curve = QwtPlotCurve()
+        curve.attach(plot)
+        scheduler = plot.replotScheduler()
+        self.assertEqual(scheduler is plot.replotScheduler(), True)
+        self.assertEqual(scheduler.isPending(), False)
+        for i in range(10):
+            plot.requestReplot(curve)
+        plot.requestReplot()
+        self.assertEqual(scheduler.isPending(), True)
+        self.assertEqual(scheduler.dirtyItems(), [curve])
+        self.assertEqual(scheduler.requests(), 11)
+        self.assertEqual(scheduler.coalescedRequests(), 10)
+        self.assertEqual(scheduler.replots(), 0)
+        self.application.processEvents()
+        self.assertEqual(scheduler.isPending(), False)
+        self.assertEqual(scheduler.dirtyItems(), [])
+        self.assertEqual(scheduler.replots(), 1)
+        scheduler.resetCounters()
+        self.assertEqual(scheduler.requests(), 0)
+
+    # testCoalescing()
+
+    def testMaxRate(self):
+        plot = QwtPlot()
+        scheduler = plot.replotScheduler()
+        scheduler.setMaxRate(1.0)
+        self.assertEqual(scheduler.maxRate(), 1.0)
+        scheduler.replotNow()
+        plot.requestReplot()
+        self.application.processEvents()
+        self.assertEqual(scheduler.isPending(), True)
+        self.assertEqual(scheduler.replots(), 1)
+        scheduler.replotNow()
+        self.assertEqual(scheduler.isPending(), False)
+        self.assertEqual(scheduler.replots(), 2)
+
+    # testMaxRate()
+
+    def testUpdateData(self):
+        plot = QwtPlot()
+        curve = QwtPlotCurve()
+        curve.attach(plot)
+        curve.setData([0.0, 1.0], [0.0, 1.0])
+        scheduler = plot.replotScheduler()
+        curve.updateData([2.0], [3.0], 1)
+        self.assertEqual(scheduler.isPending(), True)
+        self.assertEqual(scheduler.dirtyItems(), [curve])
+        self.application.processEvents()
+        self.assertEqual(scheduler.replots(), 1)
+
+    # testUpdateData()
+
+# class TestQwtReplotScheduler
+
+
+class TestQwtPlotCacheLayer(unittest.TestCase):
+
+    def setUp(self):
+        self.application = QApplication.instance() or QApplication([])
+
+    # setUp()
+
+    def testCacheLayer(self):
+        plot = QwtPlot()
+        grid = QwtPlotGrid()
+        grid.attach(plot)
+        layer = QwtPlotCacheLayer()
+        layer.addItem(grid)
+        self.assertEqual(grid.plot() is plot, False)
+        self.assertEqual(layer.items(), [grid])
+        layer.attach(plot)
+        curve = QwtPlotCurve()
+        curve.setZ(layer.z() + 1)
+        curve.attach(plot)
+        plot.setAxisScale(QwtPlot.xBottom, 0.0, 1.0)
+        plot.setAxisScale(QwtPlot.yLeft, 0.0, 1.0)
+        plot.resize(400, 300)
+        plot.show()
+        self.application.processEvents()
+        renders = layer.renders()
+        self.assertEqual(layer.isValid(), True)
+        curve.setData([0.0, 1.0], [0.0, 1.0])
+        plot.replot()
+        self.application.processEvents()
+        self.assertEqual(layer.renders(), renders)
+        layer.itemChanged()
+        self.assertEqual(layer.isValid(), False)
+        plot.replot()
+        self.application.processEvents()
+        self.assertEqual(layer.renders(), renders + 1)
+        # a change of a contained item reaches the layer
+        grid.setPen(QPen(Qt.red))
+        self.assertEqual(layer.isValid(), False)
+        plot.replot()
+        self.application.processEvents()
+        self.assertEqual(layer.renders(), renders + 2)
+        self.assertEqual(layer.removeItem(grid), True)
+        self.assertEqual(grid.plot(), None)
+        self.assertEqual(layer.removeItem(grid), False)
+        self.assertEqual(layer.items(), [])
+
+    # testCacheLayer()
+
+    def testAutoScale(self):
+        plot = QwtPlot()
+        legend = QwtLegend()
+        plot.insertLegend(legend)
+        curve = QwtPlotCurve('reference')
+        curve.setData([0.0, 10.0], [0.0, 5.0])
+        layer = QwtPlotCacheLayer()
+        layer.addItem(curve)
+        layer.attach(plot)
+        self.assertEqual(layer.testItemAttribute(QwtPlotItem.AutoScale), True)
+        self.assertEqual(layer.testItemAttribute(QwtPlotItem.Legend), False)
+        self.assertEqual(legend.itemCount(), 0)
+        self.assertEqual(layer.boundingRect(), QRectF(0.0, 0.0, 10.0, 5.0))
+        plot.replot()
+        self.assertEqual(
+            plot.axisScaleDiv(QwtPlot.xBottom).upperBound() >= 10.0, True)
+        self.assertEqual(
+            plot.axisScaleDiv(QwtPlot.yLeft).upperBound() >= 5.0, True)
+
+    # testAutoScale()
+
+# class TestQwtPlotCacheLayer
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# Local Variables: ***
+# mode: python ***
+# End: ***
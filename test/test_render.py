@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from PyQt4.Qt import *
+from PyQt4.Qwt5 import *
+
+
+class TestRender(unittest.TestCase):
+
+    def setUp(self):
+        self.application = QApplication.instance() or QApplication([])
+        self.directory = tempfile.mkdtemp()
+
+    # setUp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # tearDown()
+
+    def writeSpecs(self):
+        x = np.linspace(0.0, 10.0, 101)
+        np.save(os.path.join(self.directory, 'x.npy'), x)
+        np.save(os.path.join(self.directory, 'y.npy'), np.sin(x))
+        specs = [
+            {'output': 'sin.%s' % extension,
+             'size': [400, 300],
+             'title': 'sin(x)',
+             'axes': {'yLeft': {'range': [-1.0, 1.0]}},
+             'curves': [{'x': 'x.npy', 'y': 'y.npy', 'color': 'red'}]}
+            for extension in ('svg', 'pdf', 'png')]
+        specs.append({'output': 'sin.txt', 'curves': []})
+        fileName = os.path.join(self.directory, 'specs.json')
+        json.dump(specs, open(fileName, 'w'))
+        return fileName
+
+    # writeSpecs()
+
+    def checkResults(self, results):
+        self.assertEqual(len(results), 4)
+        for output, seconds, error in results[:3]:
+            self.assertEqual(error, None)
+            self.assertEqual(seconds >= 0.0, True)
+            self.assertEqual(os.path.getsize(output) > 0, True)
+        self.assertEqual(results[3][2] is None, False)
+        image = QImage(os.path.join(self.directory, 'sin.png'))
+        self.assertEqual((image.width(), image.height()), (400, 300))
+
+    # checkResults()
+
+    def testRenderPlots(self):
+        from PyQt4.Qwt5.render import loadSpecs, renderPlots
+        jobs = loadSpecs(self.writeSpecs())
+        self.checkResults(list(renderPlots(jobs, 1)))
+
+    # testRenderPlots()
+
+    def testRenderPool(self):
+        from PyQt4.Qwt5.render import loadSpecs, renderPlots
+        jobs = loadSpecs(self.writeSpecs())
+        if (hasattr(multiprocessing, 'get_context')
+            or sys.platform == 'win32'):
+            self.checkResults(list(renderPlots(jobs, 2)))
+        else:
+            # refuses to fork this process, which has a QApplication
+            self.assertRaises(RuntimeError, list, renderPlots(jobs, 2))
+
+    # testRenderPool()
+
+    def testRenderMain(self):
+        # a clean interpreter may fork the processes on any Python
+        fileName = self.writeSpecs()
+        status = subprocess.call(
+            [sys.executable, '-m', 'PyQt4.Qwt5.render', '-j', '2', fileName],
+            stdout=open(os.devnull, 'w'))
+        self.assertEqual(status, 1)
+        for extension in ('svg', 'pdf', 'png'):
+            output = os.path.join(self.directory, 'sin.%s' % extension)
+            self.assertEqual(os.path.getsize(output) > 0, True)
+
+    # testRenderMain()
+
+# class TestRender
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# Local Variables: ***
+# mode: python ***
+# End: ***